@@ -0,0 +1,216 @@
+"""
+Client throughput, latency and memory benchmarks against the local stand-in.
+
+Run from the repository root::
+
+    python benchmarks/bench_client.py             # compare with baseline.json
+    python benchmarks/bench_client.py --save      # record a new baseline
+
+Timings depend on the machine, so each run first times plain ``requests.get``
+calls to the same server as a reference, and scenarios are compared by their
+requests per second and p99 latency relative to it. The comparison fails, with
+exit status 1, when a scenario's relative requests per second or p99 latency is
+more than ``--tolerance`` worse than the baseline, or its peak memory more than
+``--tolerance`` higher.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import requests as http
+
+from trinity_connect_client.testing import StandInServer
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _timed(func):
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def reference(server, n):
+    """Plain requests.get calls of a device, without the client."""
+    headers = {"Authorization": f"Bearer {server.token or 'standin-token'}"}
+    urls = [
+        f"{server.base_url}{server.api_prefix}devices/uid/{server.uid(i % 10 + 1)}/"
+        for i in range(n)
+    ]
+    return [_timed(lambda url=url: http.get(url, headers=headers)) for url in urls]
+
+
+def scenario_sync(server, client, n):
+    """Sequential get_by_uid calls."""
+    uids = [server.uid(i % server.devices + 1) for i in range(n)]
+    return [_timed(lambda uid=uid: client.devices.get_by_uid(uid)) for uid in uids]
+
+
+def scenario_bulk(server, client, n, workers=16):
+    """Concurrent get_latest_data_by_uid calls."""
+    uids = [server.uid(i % server.devices + 1) for i in range(n)]
+
+    def fetch(uid):
+        return _timed(lambda: client.devices.get_latest_data_by_uid(uid))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fetch, uids))
+
+
+def scenario_paginated(server, client, n):
+    """list_by_folder followed through every page, timed per page."""
+    latencies = []
+    folder_id = 1
+    while len(latencies) < n:
+        started = time.perf_counter()
+        response = client.devices.list_by_folder(folder_id)
+        for _ in client.devices.iter_pages(response):
+            latencies.append(time.perf_counter() - started)
+            started = time.perf_counter()
+        folder_id = folder_id % server.folders + 1
+    return latencies
+
+
+SCENARIOS = {
+    "sync": scenario_sync,
+    "bulk": scenario_bulk,
+    "paginated": scenario_paginated,
+}
+
+
+def run(requests, latency, page_size):
+    results = {}
+    with StandInServer(
+        devices=1000, folders=10, page_size=page_size, latency=latency
+    ) as server:
+        client = server.client()
+        reference(server, 10)
+        started = time.perf_counter()
+        latencies = reference(server, requests)
+        reference_rps = len(latencies) / (time.perf_counter() - started)
+        reference_p99 = _percentile(latencies, 99)
+
+        for name, scenario in SCENARIOS.items():
+            # Warm up connections and caches outside of the measurement
+            scenario(server, client, 10)
+
+            started = time.perf_counter()
+            latencies = scenario(server, client, requests)
+            elapsed = time.perf_counter() - started
+
+            tracemalloc.start()
+            scenario(server, client, requests)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            rps = len(latencies) / elapsed
+            p99 = _percentile(latencies, 99)
+            results[name] = {
+                "requests": len(latencies),
+                "rps": round(rps, 1),
+                "p50_ms": round(statistics.median(latencies) * 1000, 3),
+                "p99_ms": round(p99 * 1000, 3),
+                "peak_kib": round(peak / 1024, 1),
+                # Relative to the reference, comparable across machines
+                "rps_ratio": round(rps / reference_rps, 3),
+                "p99_ratio": round(p99 / reference_p99, 3),
+            }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current["rps_ratio"] < previous["rps_ratio"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: relative rps {previous['rps_ratio']}"
+                f" -> {current['rps_ratio']}"
+            )
+        if current["p99_ratio"] > previous["p99_ratio"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: relative p99 {previous['p99_ratio']}"
+                f" -> {current['p99_ratio']}"
+            )
+        if current["peak_kib"] > previous["peak_kib"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak {previous['peak_kib']}KiB -> {current['peak_kib']}KiB"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="Write a new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.requests, args.latency, args.page_size)
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['rps']:>9.1f} req/s  p50 {result['p50_ms']:.2f}ms"
+            f"  p99 {result['p99_ms']:.2f}ms  peak {result['peak_kib']:.0f}KiB"
+            f"  (x{result['rps_ratio']:.2f} req/s, x{result['p99_ratio']:.2f} p99"
+            " of the reference)"
+        )
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "settings": {
+                        "requests": args.requests,
+                        "latency": args.latency,
+                        "page_size": args.page_size,
+                    },
+                    "scenarios": results,
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found, run with --save to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    settings = {
+        "requests": args.requests,
+        "latency": args.latency,
+        "page_size": args.page_size,
+    }
+    if baseline.get("settings") != settings:
+        print("Baseline recorded with other settings, run with --save to replace it")
+        return 0
+    regressions = compare(results, baseline["scenarios"], args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
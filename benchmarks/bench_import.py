@@ -0,0 +1,91 @@
+"""
+Import-time benchmark for the package, with a regression budget.
+
+Each run imports the package in a fresh interpreter and times the import
+statement alone, excluding interpreter start-up. The best of the runs is
+compared with the budget, and the command exits with status 1 when it is
+exceeded, so it can gate CI.
+
+Run from the repository root::
+
+    python benchmarks/bench_import.py --budget-ms 40
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+STATEMENT = "from trinity_connect_client import ConnectClient"
+
+# Modules a bare import must not load
+HEAVY_MODULES = (
+    "asyncio",
+    "concurrent.futures",
+    "numpy",
+    "pyarrow",
+    "requests",
+    "sqlite3",
+    "urllib3",
+)
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(statement=STATEMENT, runs=10):
+    """
+    Time an import statement in fresh interpreters.
+
+    :param statement: Import statement to time
+    :param runs: Number of interpreters to start
+    :return: Sorted import times in seconds and the heavy modules loaded
+    """
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    timings, loaded = [], set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output)
+        timings.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return sorted(timings), sorted(loaded)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--statement", default=STATEMENT)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=40.0,
+        help="Fail when the best import time exceeds this (default 40)",
+    )
+    args = parser.parse_args(argv)
+
+    timings, loaded = measure(args.statement, args.runs)
+    best_ms, median_ms = timings[0] * 1000, timings[len(timings) // 2] * 1000
+    print(f"{args.statement}")
+    print(f"  best {best_ms:.1f} ms, median {median_ms:.1f} ms over {args.runs} runs")
+    if loaded:
+        print(f"  heavy modules loaded: {', '.join(loaded)}")
+
+    if best_ms > args.budget_ms:
+        print(f"FAIL: {best_ms:.1f} ms exceeds the {args.budget_ms:g} ms budget")
+        return 1
+    print(f"OK: within the {args.budget_ms:g} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Micro-benchmarks of the client's own per-call overhead.
+
+The HTTP layer is replaced by a transport returning a prebuilt response, so
+the timings cover only the client code path: validation, URL and header
+construction, request coalescing, identity learning and error mapping.
+
+Run from the repository root::
+
+    python benchmarks/bench_overhead.py
+"""
+
+import argparse
+import sys
+import timeit
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.transports import Response, Transport
+
+COMMAND = {"rpc": "ping", "args": [], "pid": 1, "ttl": 60, "qos": 0}
+DEVICE = {"id": 1, "uid": "dev-000001", "name": "Device 1"}
+
+
+class _StubTransport(Transport):
+    def __init__(self, payload):
+        self.response = Response(200, payload)
+
+    def send(self, method, url, headers=None, params=None, json=None, data=None):
+        return self.response
+
+
+CALLS = {
+    "devices.get": lambda c: c.devices.get(1),
+    "devices.get_by_uid": lambda c: c.devices.get_by_uid("dev-000001"),
+    "devices.get_latest_data_by_uid": (
+        lambda c: c.devices.get_latest_data_by_uid("dev-000001")
+    ),
+    "devices.list_by_folder": lambda c: c.devices.list_by_folder(1),
+    "devices.issue_command": lambda c: c.devices.issue_command(1, COMMAND),
+    "orgs.get_folder": lambda c: c.orgs.get_folder(1),
+}
+
+
+def run(number, repeat):
+    client = ConnectClient(
+        base_url="https://api.example.com",
+        token="bench-token",
+        transport=_StubTransport(DEVICE),
+    )
+    results = {}
+    for name, call in CALLS.items():
+        timings = timeit.repeat(
+            lambda call=call: call(client), number=number, repeat=repeat
+        )
+        results[name] = min(timings) / number * 1e9
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for name, ns in run(args.number, args.repeat).items():
+        print(f"{name:<32} {ns / 1000:8.2f} us/call")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,40 @@
-from .main import ConnectClient
-from .models import Company, Device, DeviceCommand, DeviceData, DeviceEvent, Folder
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .async_client import AsyncConnectClient
+    from .main import ConnectClient
+    from .models import Company, Device, DeviceCommand, DeviceData, DeviceEvent, Folder
+
+# Public names -> submodule defining them, imported on first access so that
+# importing the package stays cheap
+_LAZY = {
+    "AsyncConnectClient": ".async_client",
+    "ConnectClient": ".main",
+    "Company": ".models",
+    "Device": ".models",
+    "DeviceCommand": ".models",
+    "DeviceData": ".models",
+    "DeviceEvent": ".models",
+    "Folder": ".models",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY])
+
 
 __all__ = [
+    "AsyncConnectClient",
     "ConnectClient",
     "Company",
     "Device",
@@ -0,0 +1,149 @@
+"""
+asyncio interface to the Connect API.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .main import ConnectClient
+from .transports import AsyncTransport, Transport
+
+
+class _LoopTransport(Transport):
+    """
+    Sends the requests of worker threads through an async transport on the
+    event loop of the AsyncConnectClient.
+    """
+
+    def __init__(self, transport: AsyncTransport):
+        self.transport = transport
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def send(self, method, url, headers=None, params=None, json=None, data=None):
+        loop = self.loop
+        if loop is None:
+            raise RuntimeError("AsyncConnectClient has not been used from a loop")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            # Waiting here would block the loop that has to send the request
+            raise RuntimeError(
+                "Blocking client calls cannot be made on the event loop, "
+                "await the AsyncConnectClient methods instead"
+            )
+        # Only transports supporting encoded bodies are passed one
+        body = {"json": json} if data is None else {"data": data}
+        future = asyncio.run_coroutine_threadsafe(
+            self.transport.send(method, url, headers=headers, params=params, **body),
+            loop,
+        )
+        return future.result()
+
+
+class _AsyncResource:
+    """Exposes the public methods of a resource API as coroutines."""
+
+    def __init__(self, client: "AsyncConnectClient", api):
+        self._client = client
+        self._api = api
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._api, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def method(*args, **kwargs):
+            return await self._client.run(attribute, *args, **kwargs)
+
+        setattr(self, name, method)
+        return method
+
+
+class AsyncConnectClient:
+    """
+    asyncio interface to the Connect API.
+
+    The methods of ``devices`` and ``orgs`` are coroutines taking the same
+    arguments, and raising the same exceptions, as on ConnectClient::
+
+        async with AsyncConnectClient(
+            base_url=url, token=token, transport=AsyncHTTPXTransport()
+        ) as client:
+            device = await client.devices.get_by_uid("dev-1")
+
+    The client logic, including caching and request coalescing, runs on a
+    pool of ``max_workers`` threads. With an AsyncTransport requests are sent
+    on the event loop, so requests in flight share the transport's
+    connections; with a Transport, or none, each is sent from its worker
+    thread. Requests are not awaited natively either way: the worker thread
+    blocks until the response arrives, so every call ties up a thread, at
+    most ``max_workers`` calls are in flight and further ones queue; raise it
+    for more concurrency. Methods returning iterators, such
+    as iter_pages, are best consumed through run(). Other configuration is as
+    for ConnectClient.
+
+    A client must only be used from one event loop.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[Any] = None,
+        max_workers: int = 32,
+        **config,
+    ):
+        self._loop_transport = None
+        if isinstance(transport, AsyncTransport):
+            self._loop_transport = _LoopTransport(transport)
+            transport = self._loop_transport
+        self.sync_client = ConnectClient(transport=transport, **config)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="connect-async"
+        )
+        self.devices = _AsyncResource(self, self.sync_client.devices)
+        self.orgs = _AsyncResource(self, self.sync_client.orgs)
+
+    @property
+    def stats(self):
+        return self.sync_client.stats
+
+    @property
+    def transport(self):
+        if self._loop_transport is not None:
+            return self._loop_transport.transport
+        return self.sync_client.transport
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking function on the client's thread pool, e.g. one using
+        ``sync_client`` to iterate over pages.
+
+        :param func: Function to call
+        :param args: Positional arguments for func
+        :param kwargs: Keyword arguments for func
+        :return: The function's return value
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop_transport is not None:
+            self._loop_transport.loop = loop
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def aclose(self):
+        """Wait for running calls to finish and close the transport."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        if self._loop_transport is not None:
+            await self._loop_transport.transport.aclose()
+        else:
+            self.sync_client.close()
@@ -0,0 +1,238 @@
+"""
+Response cache with stale-while-revalidate and probabilistic early expiry.
+"""
+
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from trinity_connect_client.cache.backends import (
+    CacheBackend,
+    CacheEntry,
+    KeyValueBackend,
+    MemoryBackend,
+    SQLiteBackend,
+)
+from trinity_connect_client.stats import ClientStats
+
+__all__ = [
+    "CacheBackend",
+    "CacheEntry",
+    "KeyValueBackend",
+    "MemoryBackend",
+    "NegativeCache",
+    "ResponseCache",
+    "SQLiteBackend",
+]
+
+
+class ResponseCache:
+    """
+    TTL cache for GET responses.
+
+    Fresh entries are served from the cache. Entries past their TTL but within
+    ``stale_ttl`` seconds of it are served immediately while a single
+    background refresh per key fetches a new value. To keep keys that were
+    cached together from expiring together, every read may treat a fresh entry
+    as expiring early, with a probability that grows as expiry approaches and
+    with the time the value took to fetch ("XFetch"); such entries are also
+    refreshed in the background while the current value is served.
+
+    Entries are kept in ``backend``, an in-process MemoryBackend by default;
+    pass a SQLiteBackend or KeyValueBackend to share them between processes.
+    Timestamps are wall-clock times so that they are valid across processes.
+
+    Statistics are recorded in ``stats``: cache_hits, cache_misses,
+    cache_stale_serves, cache_early_refreshes, cache_refreshes,
+    cache_refresh_errors and the cache_refresh_latency observation.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float = 0,
+        beta: float = 1.0,
+        max_entries: int = 1024,
+        stats: Optional[ClientStats] = None,
+        backend: Optional[CacheBackend] = None,
+        clock: Callable[[], float] = time.time,
+        rand: Callable[[], float] = random.random,
+    ):
+        if ttl <= 0:
+            raise ValueError("Cache TTL must be a positive number")
+        if stale_ttl < 0:
+            raise ValueError("Cache stale TTL must be a non-negative number")
+
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.beta = beta
+        self.stats = stats if stats is not None else ClientStats()
+        self.backend = backend if backend is not None else MemoryBackend(max_entries)
+        self._clock = clock
+        self._rand = rand
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    def __len__(self):
+        return len(self.backend)
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return key if isinstance(key, str) else repr(key)
+
+    def _get_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        return self.backend.get(self._key(key))
+
+    def _set_entry(self, key: Hashable, entry: CacheEntry):
+        self.backend.set(self._key(key), entry)
+
+    def invalidate(self, key: Hashable):
+        self.backend.delete(self._key(key))
+
+    def clear(self):
+        self.backend.clear()
+
+    def _after_fork(self):
+        # Background refreshes in flight belong to the parent's threads
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.backend.after_fork()
+
+    def _expires_early(self, entry: CacheEntry, now: float) -> bool:
+        if self.beta <= 0 or entry.delta <= 0:
+            return False
+        # 1 - random() lies in (0, 1], keeping the logarithm finite
+        jitter = -entry.delta * self.beta * math.log(1.0 - self._rand())
+        return now + jitter >= entry.expires
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for a key, fetching it if needed.
+
+        :param key: The cache key
+        :param fetch: Fetches a fresh value for the key
+        :return: The cached or fetched value
+        """
+        entry = self._get_entry(key)
+        now = self._clock()
+
+        if entry is not None and now < entry.expires:
+            if self._expires_early(entry, now):
+                self.stats.increment("cache_early_refreshes")
+                self._refresh_in_background(key, fetch)
+            self.stats.increment("cache_hits")
+            return entry.value
+
+        if entry is not None and now < entry.stale_until:
+            self.stats.increment("cache_stale_serves")
+            self._refresh_in_background(key, fetch)
+            return entry.value
+
+        self.stats.increment("cache_misses")
+        return self._fetch(key, fetch)
+
+    def _fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        started = self._clock()
+        value = fetch()
+        finished = self._clock()
+        self._set_entry(
+            key,
+            CacheEntry(
+                value=value,
+                expires=finished + self.ttl,
+                stale_until=finished + self.ttl + self.stale_ttl,
+                delta=finished - started,
+            ),
+        )
+        return value
+
+    def _refresh_in_background(self, key: Hashable, fetch: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Any]):
+        started = self._clock()
+        try:
+            self._fetch(key, fetch)
+            self.stats.increment("cache_refreshes")
+        except Exception:
+            # Keep serving the stale value; the next read past it fetches again
+            self.stats.increment("cache_refresh_errors")
+        finally:
+            self.stats.observe("cache_refresh_latency", self._clock() - started)
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+class NegativeCache:
+    """
+    Bounded cache of recent "not found" responses.
+
+    Misses are recorded per key and kind of lookup, e.g. ("device", uid) and
+    ("latest_data", uid), and expire after ``ttl`` seconds. Discarding a key
+    forgets all of its kinds at once. The least recently recorded keys are
+    evicted beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 30,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if ttl <= 0:
+            raise ValueError("Negative cache TTL must be a positive number")
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Key -> kind -> expiry time
+        self._entries: "OrderedDict[Hashable, dict]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, kind: str, key: Hashable):
+        with self._lock:
+            self._entries.setdefault(key, {})[kind] = self._clock() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def contains(self, kind: str, key: Hashable) -> bool:
+        """
+        Whether a recent miss is recorded for a key and kind of lookup.
+
+        :param kind: The kind of lookup, e.g. "device"
+        :param key: The looked up key, e.g. a device UID
+        :return: True if the lookup is known to miss
+        """
+        with self._lock:
+            kinds = self._entries.get(key)
+            if not kinds or kind not in kinds:
+                return False
+            if kinds[kind] > self._clock():
+                return True
+            del kinds[kind]
+            if not kinds:
+                del self._entries[key]
+            return False
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
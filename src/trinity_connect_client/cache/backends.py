@@ -0,0 +1,267 @@
+"""
+Storage backends for the response cache.
+
+MemoryBackend keeps entries in the current process. SQLiteBackend shares them
+between processes on the same host through a local database file, and
+KeyValueBackend adapts a networked key-value store such as Redis. The shared
+backends store entries as compressed JSON, see encode_entry.
+"""
+
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    # Wall-clock time until which the value is fresh
+    expires: float
+    # Wall-clock time until which the value may be served stale
+    stale_until: float
+    # Seconds it took to fetch the value, used for early expiry
+    delta: float
+
+
+# Format version, flags, expires, stale_until and delta
+_HEADER = struct.Struct("<BBddd")
+_FORMAT_VERSION = 2
+_FLAG_COMPRESSED = 1
+_COMPRESS_THRESHOLD = 512
+
+
+def encode_entry(entry: CacheEntry) -> bytes:
+    """
+    Encode a cache entry as bytes.
+
+    The value, which must consist of JSON-compatible types, is encoded as
+    JSON and compressed with zlib when larger than a few hundred bytes, behind
+    a fixed-size header holding the entry timestamps. Entries written by
+    another format version decode as misses.
+
+    :param entry: The entry to encode
+    :return: Encoded entry
+    """
+    payload = json.dumps(entry.value, separators=(",", ":")).encode()
+    flags = 0
+    if len(payload) > _COMPRESS_THRESHOLD:
+        payload = zlib.compress(payload, 1)
+        flags |= _FLAG_COMPRESSED
+    header = _HEADER.pack(
+        _FORMAT_VERSION, flags, entry.expires, entry.stale_until, entry.delta
+    )
+    return header + payload
+
+
+def decode_entry(data: bytes) -> Optional[CacheEntry]:
+    """
+    Decode bytes produced by encode_entry. The data is read back from shared
+    storage and is not trusted: anything that does not decode as an entry of
+    the current format is treated as a miss.
+
+    :param data: Encoded entry
+    :return: The entry, or None if it was written in another format or is invalid
+    """
+    try:
+        version, flags, expires, stale_until, delta = _HEADER.unpack_from(data)
+        if version != _FORMAT_VERSION:
+            return None
+        payload = data[_HEADER.size :]
+        if flags & _FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        return CacheEntry(json.loads(payload), expires, stale_until, delta)
+    except (struct.error, zlib.error, ValueError, TypeError, RecursionError):
+        return None
+
+
+class CacheBackend:
+    """Base class for response cache storage backends."""
+
+    def __len__(self):
+        """
+        Number of entries stored. Backends that cannot count their entries
+        report 0.
+        """
+        return 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError("Subclasses must implement get")
+
+    def set(self, key: str, entry: CacheEntry):
+        """
+        Store an entry. Backends may drop it once ``entry.stale_until`` passes.
+
+        :param key: The cache key
+        :param entry: The entry to store
+        """
+        raise NotImplementedError("Subclasses must implement set")
+
+    def delete(self, key: str):
+        raise NotImplementedError("Subclasses must implement delete")
+
+    def clear(self):
+        raise NotImplementedError("Subclasses must implement clear")
+
+    def after_fork(self):
+        """
+        Called in a forked child before the backend is used there. Replace
+        locks and connections inherited from the parent, without closing them.
+        """
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU backend. Values are stored as is, without encoding."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Backend storing encoded entries in a SQLite database file, shared by all
+    processes on the host that use the same path.
+
+    Each thread uses its own connection, and connections are reopened after a
+    fork. Entries past their stale time are purged every ``purge_interval``
+    writes.
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0, purge_interval: int = 1000):
+        self.path = path
+        self.timeout = timeout
+        self.purge_interval = purge_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, stale_until REAL NOT NULL, data BLOB NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def __len__(self):
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = (
+            self._connection()
+            .execute("SELECT data FROM entries WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return decode_entry(row[0]) if row else None
+
+    def set(self, key: str, entry: CacheEntry):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, stale_until, data) "
+                "VALUES (?, ?, ?)",
+                (key, entry.stale_until, encode_entry(entry)),
+            )
+            with self._lock:
+                self._writes += 1
+                purge = self._writes % self.purge_interval == 0
+            if purge:
+                conn.execute(
+                    "DELETE FROM entries WHERE stale_until < ?", (time.time(),)
+                )
+
+    def delete(self, key: str):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def after_fork(self):
+        # Connections are reopened by PID, the lock may have been held
+        self._lock = threading.Lock()
+
+
+class KeyValueBackend(CacheBackend):
+    """
+    Adapter for a networked key-value store.
+
+    ``store`` must provide ``get(key) -> bytes | None``,
+    ``set(key, value, ex=seconds)`` and ``delete(key)``, which redis-py clients
+    do; wrap other clients to match. Entries are stored encoded and given an
+    expiry matching their stale time. clear() requires ``scan_iter(match=...)``,
+    without which len() reports 0; counting scans every key under the prefix.
+    """
+
+    def __init__(self, store, prefix: str = "connect:"):
+        self.store = store
+        self.prefix = prefix
+
+    def __len__(self):
+        scan_iter = getattr(self.store, "scan_iter", None)
+        if scan_iter is None:
+            return 0
+        return sum(1 for _ in scan_iter(match=f"{self.prefix}*"))
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        data = self.store.get(self.prefix + key)
+        return decode_entry(data) if data is not None else None
+
+    def set(self, key: str, entry: CacheEntry):
+        ttl = max(1, int(entry.stale_until - time.time() + 1))
+        self.store.set(self.prefix + key, encode_entry(entry), ex=ttl)
+
+    def delete(self, key: str):
+        self.store.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self.store.scan_iter(match=f"{self.prefix}*"):
+            self.store.delete(key)
@@ -0,0 +1,197 @@
+"""
+Command line interface, installed as ``connect-client``.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from trinity_connect_client.loadgen import (
+    DEFAULT_COMMAND,
+    OPERATIONS,
+    LoadGenerator,
+    Targets,
+    parse_mix,
+)
+
+
+def _numbers(value: str, kind=float) -> List:
+    return [kind(part) for part in value.split(",") if part.strip()]
+
+
+def _list(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    if value.startswith("@"):
+        with open(value[1:]) as f:
+            return [line.strip() for line in f if line.strip()]
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _print_table(summaries):
+    print(
+        f"{'mode':<12}{'target':>8}{'requests':>10}{'req/s':>9}"
+        f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'errors':>9}"
+    )
+    for s in summaries:
+        print(
+            f"{s['mode']:<12}{s['target']:>8g}{s['requests']:>10}"
+            f"{s['throughput']:>9.1f}{s['p50_ms']:>9.2f}{s['p90_ms']:>9.2f}"
+            f"{s['p99_ms']:>9.2f}{s['error_rate']:>8.1%}"
+        )
+    errors = {}
+    for s in summaries:
+        for kind, count in s["errors"].items():
+            errors[kind] = errors.get(kind, 0) + count
+    if errors:
+        print("\nErrors:")
+        for kind, count in sorted(errors.items(), key=lambda e: -e[1]):
+            print(f"  {kind:<28}{count:>8}")
+
+
+def bench(args) -> int:
+    from trinity_connect_client import ConnectClient
+    from trinity_connect_client.testing import StandInServer
+    from trinity_connect_client.transports import InMemoryTransport
+
+    server = None
+    if args.standin:
+        server = StandInServer(
+            devices=args.standin_devices,
+            latency=args.standin_latency,
+            error_rate=args.standin_error_rate,
+        )
+        server.start()
+        base_url, token = server.base_url, server.token
+        device_ids = list(range(1, server.devices + 1))
+        folder_ids = list(range(1, server.folders + 1))
+        uids = [server.uid(i) for i in device_ids]
+    else:
+        base_url, token = args.base_url, args.token
+        if not base_url or not token:
+            print(
+                "A base URL and token are required, via --base-url and --token, "
+                "CONNECT_API_BASE_URL and CONNECT_API_TOKEN, or use --standin",
+                file=sys.stderr,
+            )
+            return 2
+        uids, device_ids, folder_ids = [], [], []
+
+    uids = _list(args.uids) or uids
+    if args.device_ids:
+        device_ids = _numbers(args.device_ids, int)
+    if args.folder_ids:
+        folder_ids = _numbers(args.folder_ids, int)
+
+    try:
+        command = json.loads(args.command) if args.command else dict(DEFAULT_COMMAND)
+        mix = parse_mix(args.mix)
+        transport = args.transport
+        if transport == "memory":
+            if server is None:
+                raise ValueError("The memory transport needs --standin")
+            transport = InMemoryTransport(server.handle)
+        client = ConnectClient(
+            base_url=base_url,
+            token=token,
+            api_version=args.api_version,
+            coalesce_requests=False,
+            transport=transport,
+        )
+        generator = LoadGenerator(
+            client,
+            mix,
+            Targets(uids, device_ids, folder_ids, command),
+            seed=args.seed,
+        )
+
+        summaries = []
+        if args.rate:
+            for rate in _numbers(args.rate):
+                step = generator.run_rate(rate, args.duration, args.max_workers)
+                summaries.append(step.summary())
+        else:
+            for concurrency in _numbers(args.concurrency, int):
+                step = generator.run_concurrency(concurrency, args.duration)
+                summaries.append(step.summary())
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+    else:
+        _print_table(summaries)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="connect-client")
+    commands = parser.add_subparsers(dest="subcommand", required=True)
+
+    bench_parser = commands.add_parser(
+        "bench",
+        help="Measure throughput and latency of a mix of API calls",
+        description=(
+            "Drive a weighted mix of client API calls at each of a series of "
+            "target rates or concurrencies and report the throughput/latency "
+            "curve and errors by kind. "
+            f"Operations: {', '.join(OPERATIONS)}."
+        ),
+    )
+    target = bench_parser.add_argument_group("target")
+    target.add_argument("--base-url", default=os.getenv("CONNECT_API_BASE_URL"))
+    target.add_argument("--token", default=os.getenv("CONNECT_API_TOKEN"))
+    target.add_argument("--api-version", default="v4")
+    target.add_argument(
+        "--standin",
+        action="store_true",
+        help="Run against a local stand-in server instead",
+    )
+    target.add_argument(
+        "--transport",
+        choices=["requests", "urllib3", "httpx", "http2", "memory"],
+        default="requests",
+        help="HTTP transport; memory calls the stand-in server in process",
+    )
+    target.add_argument("--standin-devices", type=int, default=1000)
+    target.add_argument("--standin-latency", type=float, default=0.0)
+    target.add_argument("--standin-error-rate", type=float, default=0.0)
+
+    load = bench_parser.add_argument_group("load")
+    load.add_argument(
+        "--mix",
+        default="get_latest_data_by_uid",
+        help="Operations with weights, e.g. get_latest_data_by_uid=9,issue_command=1",
+    )
+    load.add_argument("--uids", help="Comma separated device UIDs, or @file")
+    load.add_argument("--device-ids", help="Comma separated device IDs")
+    load.add_argument("--folder-ids", help="Comma separated folder IDs")
+    load.add_argument("--command", help="Command JSON for the issue_command calls")
+    steps = load.add_mutually_exclusive_group()
+    steps.add_argument("--rate", help="Target requests per second, e.g. 10,50,100")
+    steps.add_argument(
+        "--concurrency",
+        default="1,4,16",
+        help="Requests in flight, e.g. 1,4,16 (default)",
+    )
+    load.add_argument("--duration", type=float, default=10.0, help="Seconds per step")
+    load.add_argument("--max-workers", type=int, default=64)
+    load.add_argument("--seed", type=int)
+    bench_parser.add_argument("--json", action="store_true", help="Print JSON")
+    bench_parser.set_defaults(func=bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
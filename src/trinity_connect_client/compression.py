@@ -0,0 +1,123 @@
+"""
+Response compression negotiation and request body compression.
+"""
+
+import functools
+import gzip
+import json as jsonlib
+import zlib
+from typing import Any, Iterable, Optional, Tuple, Union
+
+DEFAULT_COMPRESS_MIN_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=None)
+def available_encodings() -> Tuple[str, ...]:
+    """
+    Content codings the HTTP stack can decode: gzip and deflate, plus br and
+    zstd when brotli and zstandard are installed.
+
+    :return: Tuple of coding names
+    """
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    return tuple(coding.strip() for coding in ACCEPT_ENCODING.split(","))
+
+
+def accept_encoding(encodings: Union[None, str, Iterable[str]] = None) -> str:
+    """
+    Build an Accept-Encoding header value.
+
+    :param encodings: Content codings in order of preference, as a sequence or
+        a comma separated string, optionally with q-values. None advertises
+        every available coding and an empty value only identity.
+    :return: Header value
+    """
+    available = available_encodings()
+    if encodings is None:
+        return ", ".join(available)
+    if isinstance(encodings, str):
+        encodings = encodings.split(",")
+    encodings = [coding.strip() for coding in encodings if coding.strip()]
+    if not encodings:
+        return "identity"
+    for coding in encodings:
+        name = coding.partition(";")[0].strip().lower()
+        if name not in available and name not in ("identity", "*"):
+            raise ValueError(
+                f"Responses encoded with {name!r} cannot be decoded, "
+                f"choose from {', '.join(available)}"
+            )
+    return ", ".join(encodings)
+
+
+def compress_json(
+    json: Any, min_size: int = DEFAULT_COMPRESS_MIN_SIZE, stats=None
+) -> Optional[bytes]:
+    """
+    Gzip a JSON request body if it is at least ``min_size`` bytes encoded.
+
+    :param json: Request body to encode
+    :param min_size: Smallest encoded size worth compressing
+    :param stats: Optional ClientStats recording the bytes saved
+    :return: The compressed body, or None if it is too small
+    """
+    body = jsonlib.dumps(json).encode()
+    if len(body) < min_size:
+        return None
+    compressed = gzip.compress(body, compresslevel=6, mtime=0)
+    if stats is not None:
+        stats.increment("compressed_requests")
+        stats.increment("request_compression_bytes_saved", len(body) - len(compressed))
+    return compressed
+
+
+def decode_json_body(data: Optional[bytes], encoding: Optional[str] = None) -> Any:
+    """
+    Decode a possibly gzip or deflate compressed JSON request body.
+
+    :param data: Raw request body
+    :param encoding: Content-Encoding of the body
+    :return: Decoded body, or None when empty
+    """
+    if not data:
+        return None
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        data = gzip.decompress(data)
+    elif encoding == "deflate":
+        data = zlib.decompress(data)
+    return jsonlib.loads(data)
+
+
+def record_response_size(stats, response, wire_bytes: Optional[int]) -> None:
+    """
+    Record the bytes saved by a compressed response, if its size on the wire
+    is known. The body is only read when a size is recorded.
+
+    :param stats: ClientStats to record to
+    :param response: Response with ``headers`` and a decoded ``content``
+    :param wire_bytes: Size of the body as received, or None if unknown
+    """
+    if not isinstance(wire_bytes, int):
+        return
+    headers = getattr(response, "headers", None)
+    encoding = headers.get("Content-Encoding") if headers is not None else None
+    if not isinstance(encoding, str) or not encoding:
+        return
+    stats.increment("compressed_responses")
+    stats.increment("compression_bytes_saved", len(response.content) - wire_bytes)
+
+
+def wire_bytes(raw) -> Optional[int]:
+    """
+    Size of a urllib3 response body as read from the socket, before decoding.
+
+    :param raw: urllib3 response, after its body has been read
+    :return: Number of bytes, or None if unknown
+    """
+    tell = getattr(raw, "tell", None)
+    try:
+        return tell() if tell is not None else None
+    except (OSError, ValueError):
+        return None
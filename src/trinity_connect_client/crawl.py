@@ -0,0 +1,104 @@
+"""
+Concurrent crawl of every device in a company across its folder tree.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+# Fields returned by the lightweight device listing
+LITE_DEVICE_FIELDS = frozenset(
+    {"id", "url", "name", "uid", "imei", "serial_number", "state", "folder"}
+)
+
+
+@dataclass
+class CrawlProgress:
+    """Progress of a company device crawl, reported once per folder."""
+
+    folder_id: int
+    devices: int
+    completed: int
+    total: int
+
+
+def iter_company_devices(
+    orgs_api,
+    devices_api,
+    company_id: int,
+    fields: Optional[Iterable[str]] = None,
+    lite: Optional[bool] = None,
+    max_workers: int = 8,
+    progress: Optional[Callable[[CrawlProgress], None]] = None,
+    **filters: str,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Crawl every folder of a company and yield its devices as they arrive.
+
+    Folders are listed with at most ``max_workers`` requests in flight and a
+    bounded number of completed folders buffered, so a slow consumer does not
+    cause the whole company to be held in memory. Devices that appear in more
+    than one listing are only yielded once.
+
+    :param orgs_api: An OrgsAPI instance
+    :param devices_api: A DevicesAPI instance
+    :param company_id: The ID of the company to crawl
+    :param fields: Only include these fields in every yielded device
+    :param lite: Use the lightweight listing; by default it is used when every
+        requested field is in LITE_DEVICE_FIELDS
+    :param max_workers: Maximum number of concurrent folder listings
+    :param progress: Called with a CrawlProgress after every folder
+    :param filters: Filters passed to every folder listing
+    :return: Generator of device dictionaries
+    """
+    fields = list(fields) if fields is not None else None
+    if lite is None:
+        lite = fields is not None and set(fields) <= LITE_DEVICE_FIELDS
+    if lite:
+        list_devices = devices_api.list_by_folder_lite
+    else:
+        list_devices = devices_api.list_by_folder
+
+    response = orgs_api.get_folders(company_id)
+    folder_ids = [f["id"] for page in orgs_api.iter_pages(response) for f in page]
+
+    def fetch(folder_id):
+        response = list_devices(folder_id, **filters)
+        pages = devices_api.iter_pages(response)
+        return folder_id, [device for page in pages for device in page]
+
+    seen = set()
+    completed = 0
+    remaining = iter(folder_ids)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        try:
+            while True:
+                for folder_id in remaining:
+                    pending.add(executor.submit(fetch, folder_id))
+                    if len(pending) >= max_workers:
+                        break
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder_id, devices = future.result()
+                    completed += 1
+                    if progress is not None:
+                        progress(
+                            CrawlProgress(
+                                folder_id, len(devices), completed, len(folder_ids)
+                            )
+                        )
+                    for device in devices:
+                        key = device.get("id", device.get("uid"))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        if fields is not None:
+                            device = {name: device.get(name) for name in fields}
+                        yield device
+        finally:
+            for future in pending:
+                future.cancel()
@@ -1,19 +1,9 @@
-from trinity_connect_client.exceptions import UnauthorisedError, ResourceNotFoundError
-
-
 def handle_exceptions(func):
-    def wrapper(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except ValueError:
-            raise
-        except UnauthorisedError:
-            raise
-        except PermissionError:
-            raise
-        except ResourceNotFoundError:
-            raise
-        except Exception:
-            raise
+    """
+    Mark an API method whose exceptions propagate to the caller unchanged.
 
-    return wrapper
+    API methods only raise ValueError for invalid arguments and the library's
+    own exceptions, which callers handle directly, so the method is returned
+    as is rather than wrapped; decorated methods cost no extra call frame.
+    """
+    return func
@@ -0,0 +1,262 @@
+"""
+Streaming Arrow export of devices, events and commands to Parquet or Feather.
+
+Paginated API results are consumed one page at a time and written out in record
+batches of a fixed size, so memory use is bounded by the page and batch size
+rather than by the length of the history being exported.
+
+PyArrow is an optional dependency, install it with the ``arrow`` extra:
+``pip install trinity-connect-client[arrow]``.
+"""
+
+import dataclasses
+import json
+import types
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from trinity_connect_client.models import Device, DeviceCommand, DeviceEvent
+
+FORMATS = ("parquet", "feather")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "PyArrow is required for Arrow exports. "
+            "Install it with: pip install trinity-connect-client[arrow]"
+        ) from e
+    return pyarrow
+
+
+def _arrow_type(annotation):
+    pa = _require_pyarrow()
+
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        # Optional[X] maps to a nullable X column
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        return _arrow_type(args[0]) if len(args) == 1 else pa.string()
+    if annotation is bool:
+        return pa.bool_()
+    if annotation is int:
+        return pa.int64()
+    if annotation is float:
+        return pa.float64()
+    # Strings, nested structures and anything unknown are stored as text, the
+    # latter JSON encoded
+    return pa.string()
+
+
+def schema_for_model(model):
+    """
+    Derive an Arrow schema from a response model.
+
+    Models with typed fields, such as Device, map each field to a column. Models
+    that wrap a list of free-form records, such as DeviceEvent and
+    DeviceCommand, map to a ``device_uid`` column and a JSON ``record`` column.
+
+    :param model: A response model class
+    :return: pyarrow.Schema instance
+    """
+    pa = _require_pyarrow()
+
+    hints = get_type_hints(model)
+    fields = dataclasses.fields(model)
+    if len(fields) == 1 and get_origin(hints[fields[0].name]) is list:
+        return pa.schema(
+            [
+                pa.field("device_uid", pa.string()),
+                pa.field("record", pa.string()),
+            ]
+        )
+    return pa.schema([pa.field(f.name, _arrow_type(hints[f.name])) for f in fields])
+
+
+def _to_row(record: Dict[str, Any], schema) -> Dict[str, Any]:
+    pa = _require_pyarrow()
+
+    row = {}
+    for field in schema:
+        value = record.get(field.name)
+        if field.type == pa.string() and isinstance(value, (dict, list)):
+            value = json.dumps(value, separators=(",", ":"))
+        row[field.name] = value
+    return row
+
+
+def iter_record_batches(
+    records: Iterable[Dict[str, Any]], schema, batch_size: int = 10_000
+) -> Iterator[Any]:
+    """
+    Group records into Arrow record batches of at most ``batch_size`` rows.
+
+    :param records: Iterable of record dictionaries
+    :param schema: The pyarrow.Schema of the batches
+    :param batch_size: Maximum number of rows per batch
+    :return: Generator of pyarrow.RecordBatch instances
+    """
+    pa = _require_pyarrow()
+
+    rows: List[Dict[str, Any]] = []
+    for record in records:
+        rows.append(_to_row(record, schema))
+        if len(rows) >= batch_size:
+            yield pa.RecordBatch.from_pylist(rows, schema=schema)
+            rows = []
+    if rows:
+        yield pa.RecordBatch.from_pylist(rows, schema=schema)
+
+
+class ArrowExporter:
+    """
+    Incrementally writes record batches to a Parquet or Feather file.
+
+    Use as a context manager; the file is finalised when the context exits.
+    """
+
+    def __init__(self, path, schema, format: str = "parquet", batch_size=10_000):
+        if format not in FORMATS:
+            raise ValueError(f"Format must be one of {FORMATS}")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer")
+
+        self.path = path
+        self.schema = schema
+        self.format = format
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._writer = None
+
+    def __enter__(self):
+        pa = _require_pyarrow()
+
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        else:
+            self._writer = pa.ipc.new_file(self.path, self.schema)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._writer.close()
+        self._writer = None
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write records, batching them as they are consumed.
+
+        :param records: Iterable of record dictionaries
+        :return: Number of rows written by this call
+        """
+        written = 0
+        for batch in iter_record_batches(records, self.schema, self.batch_size):
+            if self.format == "parquet":
+                self._writer.write_batch(batch)
+            else:
+                self._writer.write(batch)
+            written += batch.num_rows
+        self.rows_written += written
+        return written
+
+
+def _iter_history(fetch, devices_api, device_uids, filters):
+    for uid in device_uids:
+        response = fetch(uid, **filters)
+        for page in devices_api.iter_pages(response):
+            for record in page:
+                yield {"device_uid": uid, "record": record}
+
+
+def export_devices(
+    devices_api, folder_ids: Iterable[int], path, format="parquet", batch_size=10_000
+) -> int:
+    """
+    Export a snapshot of the devices in the given folders.
+
+    :param devices_api: A DevicesAPI instance
+    :param folder_ids: IDs of the folders whose devices to export
+    :param path: Destination file path
+    :param format: Either "parquet" or "feather"
+    :param batch_size: Maximum number of rows per record batch
+    :return: Number of rows written
+    """
+
+    def records():
+        for folder_id in folder_ids:
+            response = devices_api.list_by_folder(folder_id)
+            for page in devices_api.iter_pages(response):
+                yield from page
+
+    schema = schema_for_model(Device)
+    with ArrowExporter(path, schema, format, batch_size) as exporter:
+        exporter.write(records())
+    return exporter.rows_written
+
+
+def export_events(
+    devices_api,
+    device_uids: Iterable[str],
+    path,
+    format="parquet",
+    batch_size=10_000,
+    **filters: str,
+) -> int:
+    """
+    Export the event history of the given devices.
+
+    :param devices_api: A DevicesAPI instance
+    :param device_uids: UIDs of the devices whose events to export
+    :param path: Destination file path
+    :param format: Either "parquet" or "feather"
+    :param batch_size: Maximum number of rows per record batch
+    :param filters: Filters passed to every events request
+    :return: Number of rows written
+    """
+    records = _iter_history(
+        devices_api.get_events_by_uid, devices_api, device_uids, filters
+    )
+    schema = schema_for_model(DeviceEvent)
+    with ArrowExporter(path, schema, format, batch_size) as exporter:
+        exporter.write(records)
+    return exporter.rows_written
+
+
+def export_commands(
+    devices_api,
+    device_uids: Iterable[str],
+    path,
+    format="parquet",
+    batch_size=10_000,
+    **filters: str,
+) -> int:
+    """
+    Export the command history of the given devices.
+
+    :param devices_api: A DevicesAPI instance
+    :param device_uids: UIDs of the devices whose commands to export
+    :param path: Destination file path
+    :param format: Either "parquet" or "feather"
+    :param batch_size: Maximum number of rows per record batch
+    :param filters: Filters passed to every commands request
+    :return: Number of rows written
+    """
+    records = _iter_history(
+        devices_api.get_commands_by_uid, devices_api, device_uids, filters
+    )
+    schema = schema_for_model(DeviceCommand)
+    with ArrowExporter(path, schema, format, batch_size) as exporter:
+        exporter.write(records)
+    return exporter.rows_written
@@ -0,0 +1,186 @@
+"""
+Persistent fleet snapshot with incremental delta sync.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class DeviceChange:
+    """Field-level changes of a device between two syncs."""
+
+    device_id: int
+    device: Dict[str, Any]
+    # Field name -> (old value, new value)
+    fields: Dict[str, Tuple[Any, Any]]
+
+
+@dataclass
+class FleetDelta:
+    """Devices added, removed and changed by a FleetSnapshot refresh."""
+
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+    changed: List[DeviceChange] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_devices(
+    old: Dict[str, Any], new: Dict[str, Any], fields: Optional[Iterable[str]] = None
+) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Compare two versions of a device field by field.
+
+    :param old: The previous device
+    :param new: The current device
+    :param fields: Only compare these fields, defaults to every field of either
+    :return: Mapping of changed field name to (old value, new value)
+    """
+    names = fields if fields is not None else dict.fromkeys([*old, *new])
+    return {
+        name: (old.get(name), new.get(name))
+        for name in names
+        if old.get(name) != new.get(name)
+    }
+
+
+class FleetSnapshot:
+    """
+    Local copy of the devices in a set of folders, refreshed incrementally.
+
+    The first refresh downloads every device with list_by_folder. When
+    ``changed_since_filter`` names a server-side filter that selects devices
+    changed since a timestamp, later refreshes only download those, and use
+    the lightweight listing to detect added and removed devices; otherwise
+    every refresh is a full download. Either way only the differences are
+    reported, and with ``path`` the snapshot is persisted after every refresh
+    so it survives restarts.
+    """
+
+    def __init__(
+        self,
+        devices_api,
+        folder_ids: Iterable[int],
+        path: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        changed_since_filter: Optional[str] = None,
+        **filters: str,
+    ):
+        self.devices_api = devices_api
+        self.folder_ids = list(folder_ids)
+        self.path = path
+        self.fields = list(fields) if fields is not None else None
+        self.changed_since_filter = changed_since_filter
+        self.filters = filters
+        self.devices: Dict[int, Dict[str, Any]] = {}
+        self.synced_at: Optional[str] = None
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.devices)
+
+    def _list(self, lite: bool = False, **filters: str) -> List[Dict[str, Any]]:
+        if lite:
+            list_devices = self.devices_api.list_by_folder_lite
+        else:
+            list_devices = self.devices_api.list_by_folder
+
+        devices = []
+        for folder_id in self.folder_ids:
+            response = list_devices(folder_id, **self.filters, **filters)
+            for page in self.devices_api.iter_pages(response):
+                devices.extend(page)
+        return devices
+
+    def refresh(self) -> FleetDelta:
+        """
+        Sync with the API and return the devices that differ from the last sync.
+
+        :return: FleetDelta with the added, removed and changed devices
+        """
+        started = datetime.now(timezone.utc).isoformat()
+
+        if self.synced_at is None or not self.changed_since_filter:
+            current = {d["id"]: d for d in self._list()}
+            candidates = current
+        else:
+            current_ids = {d["id"] for d in self._list(lite=True)}
+            candidates = {
+                d["id"]: d
+                for d in self._list(**{self.changed_since_filter: self.synced_at})
+                if d["id"] in current_ids
+            }
+            # New devices missed by the filter still need their full record
+            for device_id in current_ids - set(self.devices) - set(candidates):
+                candidates[device_id] = self.devices_api.get(device_id)
+            current = {
+                device_id: candidates.get(device_id, self.devices.get(device_id))
+                for device_id in current_ids
+            }
+
+        delta = FleetDelta()
+        for device_id, device in candidates.items():
+            previous = self.devices.get(device_id)
+            if previous is None:
+                delta.added.append(device)
+                continue
+            changes = diff_devices(previous, device, self.fields)
+            if changes:
+                delta.changed.append(DeviceChange(device_id, device, changes))
+        delta.removed = [
+            device
+            for device_id, device in self.devices.items()
+            if device_id not in current
+        ]
+
+        self.devices = current
+        self.synced_at = started
+        if self.path:
+            self.save()
+        return delta
+
+    def save(self, path: Optional[str] = None):
+        """
+        Persist the snapshot to a JSON file, replacing it atomically.
+
+        :param path: Destination file path, defaults to the snapshot path
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("A path is required to save the fleet snapshot")
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "synced_at": self.synced_at,
+                    "folder_ids": self.folder_ids,
+                    "devices": list(self.devices.values()),
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, path)
+
+    def load(self, path: Optional[str] = None):
+        """
+        Restore the snapshot from a JSON file written by save.
+
+        :param path: Source file path, defaults to the snapshot path
+        """
+        with open(path or self.path) as f:
+            data = json.load(f)
+
+        if sorted(data.get("folder_ids", [])) != sorted(self.folder_ids):
+            # A snapshot of other folders cannot be refreshed incrementally
+            return
+        self.synced_at = data.get("synced_at")
+        self.devices = {d["id"]: d for d in data.get("devices", [])}
@@ -0,0 +1,206 @@
+"""
+In-memory folder tree index built from OrgsAPI.get_folders.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+
+def _normalise_path(path: str) -> str:
+    return "/".join(part.strip() for part in path.strip("/").split("/"))
+
+
+@dataclass
+class FolderTreeChanges:
+    """Folder IDs added, removed and changed by a FolderTree refresh."""
+
+    added: Set[int] = field(default_factory=set)
+    removed: Set[int] = field(default_factory=set)
+    changed: Set[int] = field(default_factory=set)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+class FolderTree:
+    """
+    Index over the folders of a company.
+
+    Folders are looked up by ID in O(1), by human readable path (for example
+    ``"Region/Site/Rack"``) or by materialised ``path``, and the tree can be
+    walked for children, subtrees and ancestors without further API calls.
+    Folders are kept as the dictionaries returned by the API.
+    """
+
+    def __init__(
+        self,
+        folders: Iterable[Dict[str, Any]] = (),
+        orgs_api=None,
+        company_id: Optional[int] = None,
+        **filters,
+    ):
+        self.orgs_api = orgs_api
+        self.company_id = company_id
+        self.filters = filters
+        self._lock = threading.RLock()
+        self._folders: Dict[int, Dict[str, Any]] = {}
+        self._children: Dict[Optional[int], Set[int]] = {}
+        self._by_human_path: Dict[str, int] = {}
+        self._by_path: Dict[str, int] = {}
+        self.update(folders)
+
+    @classmethod
+    def from_api(cls, orgs_api, company_id: int, **filters) -> "FolderTree":
+        """
+        Build a tree from a single sweep of a company's folders.
+
+        :param orgs_api: An OrgsAPI instance
+        :param company_id: The ID of the company whose folders to index
+        :param filters: Filters passed to get_folders
+        :return: FolderTree instance
+        """
+        tree = cls(orgs_api=orgs_api, company_id=company_id, **filters)
+        tree.update(tree._fetch())
+        return tree
+
+    def _fetch(self) -> List[Dict[str, Any]]:
+        response = self.orgs_api.get_folders(self.company_id, **self.filters)
+        return [f for page in self.orgs_api.iter_pages(response) for f in page]
+
+    def __len__(self):
+        return len(self._folders)
+
+    def __contains__(self, folder_id):
+        return folder_id in self._folders
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._folders.values()))
+
+    def get(self, folder_id: int) -> Optional[Dict[str, Any]]:
+        return self._folders.get(folder_id)
+
+    def by_path(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a folder by human readable path, falling back to its
+        materialised path.
+
+        :param path: A path such as "Region/Site/Rack"
+        :return: The folder, or None if no folder has that path
+        """
+        folder_id = self._by_human_path.get(_normalise_path(path))
+        if folder_id is None:
+            folder_id = self._by_path.get(path)
+        return self._folders.get(folder_id)
+
+    def roots(self) -> List[Dict[str, Any]]:
+        """Folders whose parent is not part of the tree."""
+        return [
+            f for f in self._folders.values() if f.get("parent") not in self._folders
+        ]
+
+    def children(self, folder_id: int) -> List[Dict[str, Any]]:
+        return [self._folders[i] for i in sorted(self._children.get(folder_id, ()))]
+
+    def descendants(
+        self, folder_id: int, include_self: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Enumerate the subtree below a folder, breadth first.
+
+        :param folder_id: The ID of the subtree root
+        :param include_self: Whether to include the root folder itself
+        :return: List of folders
+        """
+        with self._lock:
+            result = [self._folders[folder_id]] if include_self else []
+            queue = deque([folder_id])
+            while queue:
+                for child_id in sorted(self._children.get(queue.popleft(), ())):
+                    result.append(self._folders[child_id])
+                    queue.append(child_id)
+            return result
+
+    def ancestors(self, folder_id: int) -> List[Dict[str, Any]]:
+        """
+        List the ancestors of a folder, nearest first.
+
+        :param folder_id: The ID of the folder
+        :return: List of folders from the parent up to the root
+        """
+        result = []
+        seen = {folder_id}
+        parent_id = self._folders[folder_id].get("parent")
+        while parent_id in self._folders and parent_id not in seen:
+            seen.add(parent_id)
+            result.append(self._folders[parent_id])
+            parent_id = self._folders[parent_id].get("parent")
+        return result
+
+    def update(self, folders: Iterable[Dict[str, Any]]) -> FolderTreeChanges:
+        """
+        Add or replace folders, re-indexing only those that changed.
+
+        :param folders: Folder dictionaries
+        :return: The IDs of the folders added and changed
+        """
+        changes = FolderTreeChanges()
+        with self._lock:
+            for folder in folders:
+                folder_id = folder["id"]
+                previous = self._folders.get(folder_id)
+                if previous == folder:
+                    continue
+                if previous is None:
+                    changes.added.add(folder_id)
+                else:
+                    changes.changed.add(folder_id)
+                    self._unindex(previous)
+                self._index(folder)
+        return changes
+
+    def remove(self, folder_id: int):
+        with self._lock:
+            folder = self._folders.get(folder_id)
+            if folder is not None:
+                self._unindex(folder)
+
+    def refresh(self) -> FolderTreeChanges:
+        """
+        Re-fetch the company's folders and apply only the differences.
+
+        :return: The IDs of the folders added, removed and changed
+        """
+        if self.orgs_api is None:
+            raise ValueError("Only trees built with from_api can be refreshed")
+
+        folders = self._fetch()
+        with self._lock:
+            changes = self.update(folders)
+            changes.removed = set(self._folders) - {f["id"] for f in folders}
+            for folder_id in changes.removed:
+                self.remove(folder_id)
+        return changes
+
+    def _index(self, folder: Dict[str, Any]):
+        folder_id = folder["id"]
+        self._folders[folder_id] = folder
+        self._children.setdefault(folder.get("parent"), set()).add(folder_id)
+        if folder.get("human_path"):
+            self._by_human_path[_normalise_path(folder["human_path"])] = folder_id
+        if folder.get("path"):
+            self._by_path[folder["path"]] = folder_id
+
+    def _unindex(self, folder: Dict[str, Any]):
+        folder_id = folder["id"]
+        del self._folders[folder_id]
+        siblings = self._children.get(folder.get("parent"))
+        if siblings is not None:
+            siblings.discard(folder_id)
+        if folder.get("human_path"):
+            key = _normalise_path(folder["human_path"])
+            if self._by_human_path.get(key) == folder_id:
+                del self._by_human_path[key]
+        if folder.get("path") and self._by_path.get(folder["path"]) == folder_id:
+            del self._by_path[folder["path"]]
@@ -0,0 +1,32 @@
+"""
+Fork handling for clients created before a pre-fork server forks its workers.
+"""
+
+import os
+import weakref
+
+# Objects with an _after_fork method, called in the child after every fork
+_instances: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _after_fork_in_child():
+    for instance in list(_instances):
+        instance._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def register(instance):
+    """
+    Call ``instance._after_fork()`` in the child process after every fork made
+    through os.fork, for as long as the instance is alive.
+
+    Servers forking without running Python's at-fork hooks, such as uWSGI
+    without ``py-call-osafterfork``, are not seen here; compare ``os.getpid()``
+    with the PID recorded at creation to catch those as well.
+
+    :param instance: The object to notify
+    """
+    _instances.add(instance)
@@ -0,0 +1,160 @@
+"""
+Time-windowed, concurrent retrieval of device event history.
+"""
+
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def split_range(
+    start: datetime, end: datetime, window: timedelta
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Split a time range into consecutive windows of at most ``window`` length.
+
+    :param start: Start of the range
+    :param end: End of the range
+    :param window: Maximum length of every window
+    :return: List of (start, end) tuples covering the range
+    """
+    if end <= start:
+        raise ValueError("End must be after start")
+    if window <= timedelta(0):
+        raise ValueError("Window must be a positive timedelta")
+
+    windows = []
+    cursor = start
+    while cursor < end:
+        upper = min(cursor + window, end)
+        windows.append((cursor, upper))
+        cursor = upper
+    return windows
+
+
+def _timestamp_key(event: Dict[str, Any], timestamp_field: str):
+    value = event.get(timestamp_field)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    # Events without a comparable timestamp sort last
+    if not isinstance(value, (int, float)):
+        return (1, 0.0)
+    return (0, float(value))
+
+
+def _identity(event: Dict[str, Any], id_field: str):
+    if event.get(id_field) is not None:
+        return event[id_field]
+    return json.dumps(event, sort_keys=True, default=str)
+
+
+def merge_events(
+    windows: List[List[Dict[str, Any]]],
+    timestamp_field: str = "timestamp",
+    id_field: str = "id",
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-window event lists into one list in timestamp order.
+
+    Events present in more than one window, which happens when a window
+    boundary is inclusive on both sides, are only kept once. Events are
+    identified by ``id_field`` or, when absent, by their full content.
+
+    :param windows: Lists of events, one per window
+    :param timestamp_field: Name of the event timestamp field
+    :param id_field: Name of the event identifier field
+    :return: Deduplicated list of events sorted by timestamp
+    """
+    seen = set()
+    merged = []
+    for events in windows:
+        for event in events:
+            identity = _identity(event, id_field)
+            if identity in seen:
+                continue
+            seen.add(identity)
+            merged.append(event)
+    merged.sort(key=lambda e: _timestamp_key(e, timestamp_field))
+    return merged
+
+
+def get_events_windowed(
+    devices_api,
+    device_uid: str,
+    start: datetime,
+    end: datetime,
+    window: timedelta = timedelta(days=7),
+    max_workers: int = 8,
+    max_events_per_window: Optional[int] = None,
+    min_window: timedelta = timedelta(minutes=1),
+    start_filter: str = "start",
+    end_filter: str = "end",
+    timestamp_field: str = "timestamp",
+    id_field: str = "id",
+    **filters: str,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch the events of a device over a time range using concurrent windows.
+
+    The range is split into windows of ``window`` length that are fetched
+    concurrently, each following its own pagination chain. When
+    ``max_events_per_window`` is given, windows are sized adaptively: a window
+    whose first page reports more events than that (through the paginated
+    ``count``, or the number of events for unpaginated responses) is split in
+    half and its halves fetched instead, down to ``min_window``.
+
+    :param devices_api: A DevicesAPI instance
+    :param device_uid: The UID of the device
+    :param start: Start of the time range
+    :param end: End of the time range
+    :param window: Initial window length
+    :param max_workers: Maximum number of concurrent requests
+    :param max_events_per_window: Split windows reporting more events than this
+    :param min_window: Windows are never split below this length
+    :param start_filter: Name of the filter that bounds the window start
+    :param end_filter: Name of the filter that bounds the window end
+    :param timestamp_field: Name of the event timestamp field
+    :param id_field: Name of the event identifier field used for deduplication
+    :param filters: Additional filters passed to every events request
+    :return: Deduplicated list of events sorted by timestamp
+    """
+
+    def fetch(bounds):
+        lower, upper = bounds
+        response = devices_api.get_events_by_uid(
+            device_uid,
+            **{start_filter: lower.isoformat(), end_filter: upper.isoformat()},
+            **filters,
+        )
+        if max_events_per_window is not None and upper - lower > min_window:
+            if isinstance(response, list):
+                total = len(response)
+            else:
+                total = response.get("count", len(response.get("results", [])))
+            if total > max_events_per_window:
+                middle = lower + (upper - lower) / 2
+                return None, [(lower, middle), (middle, upper)]
+
+        events = []
+        for page in devices_api.iter_pages(response):
+            events.extend(page)
+        return events, []
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {
+            executor.submit(fetch, bounds) for bounds in split_range(start, end, window)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                events, halves = future.result()
+                if events is not None:
+                    results.append(events)
+                pending.update(executor.submit(fetch, bounds) for bounds in halves)
+
+    return merge_events(results, timestamp_field=timestamp_field, id_field=id_field)
@@ -0,0 +1,186 @@
+"""
+Identity index mapping device IDs to UIDs, IMEIs and serial numbers.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+IDENTITY_KEYS = ("uid", "imei", "serial_number")
+
+
+class IdentityIndex:
+    """
+    Bidirectional map between device IDs and their UID, IMEI and serial number.
+
+    The index is filled as a side effect of device responses handled by
+    DevicesAPI, can be bulk loaded with DevicesAPI.index_folder, and can be
+    persisted to and loaded from a JSON file. All operations are thread-safe.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        # Device ID -> (uid, imei, serial_number)
+        self._by_id: Dict[int, tuple] = {}
+        # Identity key -> value -> device ID
+        self._ids: Dict[str, Dict[str, int]] = {key: {} for key in IDENTITY_KEYS}
+        self._listeners: List[Callable[[str], None]] = []
+
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, device_id):
+        return device_id in self._by_id
+
+    def subscribe(self, listener: Callable[[str], None]):
+        """
+        Register a function called with the UID of every device learned.
+
+        :param listener: Callable taking a device UID
+        """
+        self._listeners.append(listener)
+
+    def learn(self, record: Any) -> int:
+        """
+        Record the identities of the devices in an API response.
+
+        Accepts a single device dictionary, a list of them or a paginated page
+        holding them under ``results``. Records without an ``id`` and ``uid``
+        are ignored.
+
+        :param record: A device response
+        :return: Number of devices learned
+        """
+        if isinstance(record, dict) and "results" in record:
+            record = record["results"]
+        records = record if isinstance(record, list) else [record]
+
+        learned = []
+        with self._lock:
+            for item in records:
+                if not isinstance(item, dict):
+                    continue
+                device_id, uid = item.get("id"), item.get("uid")
+                if not isinstance(device_id, int) or not uid:
+                    continue
+                # In IDENTITY_KEYS order
+                identities = (
+                    uid,
+                    item.get("imei") or None,
+                    item.get("serial_number") or None,
+                )
+                self._set(device_id, identities)
+                learned.append(uid)
+
+        for listener in self._listeners:
+            for uid in learned:
+                listener(uid)
+        return len(learned)
+
+    def _set(self, device_id: int, identities: tuple):
+        previous = self._by_id.get(device_id)
+        if previous == identities:
+            return
+        if previous:
+            for key, value in zip(IDENTITY_KEYS, previous):
+                if value is not None and self._ids[key].get(value) == device_id:
+                    del self._ids[key][value]
+        self._by_id[device_id] = identities
+        for key, value in zip(IDENTITY_KEYS, identities):
+            if value is not None:
+                self._ids[key][value] = device_id
+
+    def forget(self, device_id: int):
+        """
+        Remove a device from the index.
+
+        :param device_id: The ID of the device to remove
+        """
+        with self._lock:
+            identities = self._by_id.pop(device_id, None)
+            if identities:
+                for key, value in zip(IDENTITY_KEYS, identities):
+                    if value is not None and self._ids[key].get(value) == device_id:
+                        del self._ids[key][value]
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            for ids in self._ids.values():
+                ids.clear()
+
+    def _after_fork(self):
+        # Entries are kept, the lock may have been held while forking
+        self._lock = threading.Lock()
+
+    def id_for(self, key: str, value: str) -> Optional[int]:
+        """
+        Look up a device ID by one of its identities.
+
+        :param key: One of "uid", "imei" or "serial_number"
+        :param value: The identity value
+        :return: The device ID, or None if unknown
+        """
+        if key not in self._ids:
+            raise ValueError(f"Identity key must be one of {IDENTITY_KEYS}")
+        return self._ids[key].get(value)
+
+    def id_for_uid(self, uid: str) -> Optional[int]:
+        return self._ids["uid"].get(uid)
+
+    def uid_for_id(self, device_id: int) -> Optional[str]:
+        identities = self._by_id.get(device_id)
+        return identities[0] if identities else None
+
+    def identities(self, device_id: int) -> Optional[Dict[str, str]]:
+        """
+        Return all known identities of a device.
+
+        :param device_id: The ID of the device
+        :return: Dictionary of id, uid, imei and serial_number, or None if unknown
+        """
+        identities = self._by_id.get(device_id)
+        if identities is None:
+            return None
+        return {"id": device_id, **dict(zip(IDENTITY_KEYS, identities))}
+
+    def save(self, path: Optional[str] = None):
+        """
+        Persist the index to a JSON file, replacing it atomically.
+
+        :param path: Destination file path, defaults to the path of the index
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("A path is required to save the identity index")
+
+        with self._lock:
+            rows = [[device_id, *ids] for device_id, ids in self._by_id.items()]
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"keys": list(IDENTITY_KEYS), "devices": rows}, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        Merge the contents of a JSON file written by save into the index.
+
+        :param path: Source file path, defaults to the path of the index
+        :return: Number of devices loaded
+        """
+        path = path or self.path
+        with open(path) as f:
+            data = json.load(f)
+
+        rows = data.get("devices", [])
+        count = 0
+        with self._lock:
+            for device_id, *identities in rows:
+                self._set(device_id, tuple(identities))
+                count += 1
+        return count
@@ -0,0 +1,95 @@
+"""
+Background keep-alive probing of a client's pooled connections.
+"""
+
+import threading
+from typing import Callable, Optional
+
+
+class KeepAliveProber:
+    """
+    Keeps a client's pooled connections to the API host fresh while it is
+    idle, so that calls after a quiet period do not pay for new connections.
+
+    Every ``interval`` seconds the prober takes up to ``connections`` idle
+    connections from the transport's pool: connections the server has closed
+    are evicted and replaced by new ones and, with ``probe``, open ones are
+    sent a HEAD request for the API root to reset the server's idle timeout.
+    Pick an interval shorter than the server's keep-alive timeout. Reopened
+    connections are counted in the client stats as
+    ``keepalive_connections_opened`` and failed rounds as ``keepalive_errors``,
+    also passed to ``on_error``.
+
+    Connections are briefly taken out of the pool during a round, so calls
+    made meanwhile may open extra connections.
+    """
+
+    def __init__(
+        self,
+        client,
+        interval: float = 30.0,
+        connections: int = 4,
+        probe: bool = True,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        if connections < 1:
+            raise ValueError("Connections must be a positive integer")
+        self.client = client
+        self.interval = interval
+        self.connections = connections
+        self.probe = probe
+        self.on_error = on_error
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self) -> int:
+        """
+        Check, replace and probe the pooled connections once.
+
+        :return: Number of connections reopened
+        """
+        _, opened = self.client.transport.warmup(
+            f"{self.client.api_url}/", self.connections, probe=self.probe
+        )
+        self.client.stats.increment("keepalive_rounds")
+        self.client.stats.increment("keepalive_connections_opened", opened)
+        return opened
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                self.client.stats.increment("keepalive_errors")
+                if self.on_error is not None:
+                    self.on_error(e)
+
+    def start(self):
+        """Start probing on a background daemon thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="connect-keepalive", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop probing and wait for the current round to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,239 @@
+"""
+Load generation against the Connect API for capacity testing.
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+DEFAULT_COMMAND = {"rpc": "ping", "args": [], "pid": 1, "ttl": 60, "qos": 0}
+
+
+@dataclass
+class Targets:
+    """Devices and folders the operations of a load test are sent to."""
+
+    uids: Sequence[str]
+    device_ids: Sequence[int] = ()
+    folder_ids: Sequence[int] = ()
+    command: Dict[str, Any] = field(default_factory=lambda: dict(DEFAULT_COMMAND))
+
+
+# Operation name -> function(client, targets, rand) sending one request
+OPERATIONS: Dict[str, Callable[[Any, "Targets", random.Random], Any]] = {
+    "get_latest_data_by_uid": lambda c, t, r: c.devices.get_latest_data_by_uid(
+        r.choice(t.uids)
+    ),
+    "get_by_uid": lambda c, t, r: c.devices.get_by_uid(r.choice(t.uids)),
+    "get_events_by_uid": lambda c, t, r: c.devices.get_events_by_uid(r.choice(t.uids)),
+    "get": lambda c, t, r: c.devices.get(r.choice(t.device_ids)),
+    "list_by_folder": lambda c, t, r: c.devices.list_by_folder(r.choice(t.folder_ids)),
+    "issue_command": lambda c, t, r: c.devices.issue_command(
+        r.choice(t.device_ids), t.command
+    ),
+    "issue_command_by_uid": lambda c, t, r: c.devices.issue_command_by_uid(
+        r.choice(t.uids), t.command
+    ),
+}
+
+# Operation name -> Targets attribute it picks from
+OPERATION_TARGETS = {
+    "get_latest_data_by_uid": "uids",
+    "get_by_uid": "uids",
+    "get_events_by_uid": "uids",
+    "get": "device_ids",
+    "list_by_folder": "folder_ids",
+    "issue_command": "device_ids",
+    "issue_command_by_uid": "uids",
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse an operation mix such as ``"get_latest_data_by_uid=9,issue_command=1"``.
+
+    A name without a weight has weight 1.
+
+    :param mix: Comma separated operation names with optional weights
+    :return: Mapping of operation name to weight
+    """
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(
+                f"Unknown operation {name!r}, choose from {', '.join(OPERATIONS)}"
+            )
+        weights[name] = float(weight) if weight else 1.0
+        if weights[name] <= 0:
+            raise ValueError("Operation weights must be positive")
+    return weights
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return float("nan")
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class LoadStep:
+    """Results of running a load test at one rate or concurrency."""
+
+    mode: str
+    target: float
+    duration: float
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.requests if self.requests else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarise the step.
+
+        :return: Dictionary of throughput, latency percentiles in milliseconds
+            and errors by kind
+        """
+        ordered = sorted(self.latencies)
+        return {
+            "mode": self.mode,
+            "target": self.target,
+            "requests": self.requests,
+            "throughput": round(self.throughput, 1),
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+            "p90_ms": round(_percentile(ordered, 90) * 1000, 2),
+            "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else float("nan"),
+            "error_rate": round(self.error_rate, 4),
+            "errors": dict(self.errors),
+        }
+
+
+class LoadGenerator:
+    """
+    Sends a weighted mix of API operations through a client and measures
+    throughput, latency and errors.
+
+    Closed-loop steps keep a fixed number of requests in flight; open-loop
+    steps start requests at a fixed rate, measuring latency from the time each
+    request was due so that a saturated client or server shows up as latency
+    rather than as a lower request rate. Errors are counted by exception type,
+    and command sends that return a non-2xx status as ``HTTP <status>``.
+    """
+
+    def __init__(
+        self,
+        client,
+        mix: Dict[str, float],
+        targets: Targets,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        for name in mix:
+            attribute = OPERATION_TARGETS[name]
+            if not getattr(targets, attribute):
+                raise ValueError(f"{name} needs at least one target in {attribute}")
+
+        self.client = client
+        self.targets = targets
+        self._names = list(mix)
+        self._weights = [mix[name] for name in self._names]
+        self._seed = seed
+        self._clock = clock
+        self._local = threading.local()
+
+    def _rand(self) -> random.Random:
+        rand = getattr(self._local, "rand", None)
+        if rand is None:
+            seed = None if self._seed is None else self._seed + threading.get_ident()
+            rand = self._local.rand = random.Random(seed)
+        return rand
+
+    def _call(self, step: LoadStep, lock: threading.Lock, due: float):
+        rand = self._rand()
+        name = rand.choices(self._names, self._weights)[0]
+        error = None
+        try:
+            result = OPERATIONS[name](self.client, self.targets, rand)
+            if isinstance(result, tuple) and not 200 <= result[0] < 300:
+                error = f"HTTP {result[0]}"
+        except Exception as e:
+            error = type(e).__name__
+        latency = self._clock() - due
+        with lock:
+            step.latencies.append(latency)
+            if error:
+                step.errors[error] += 1
+
+    def run_concurrency(self, concurrency: int, duration: float) -> LoadStep:
+        """
+        Keep ``concurrency`` requests in flight for ``duration`` seconds.
+
+        :param concurrency: Number of concurrent workers
+        :param duration: Seconds to run for
+        :return: LoadStep results
+        """
+        step = LoadStep("concurrency", concurrency, duration)
+        lock = threading.Lock()
+        started = self._clock()
+        deadline = started + duration
+
+        def worker():
+            while self._clock() < deadline:
+                self._call(step, lock, self._clock())
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        step.duration = self._clock() - started
+        return step
+
+    def run_rate(
+        self,
+        rate: float,
+        duration: float,
+        max_workers: int = 64,
+        sleep: Callable[[float], Any] = time.sleep,
+    ) -> LoadStep:
+        """
+        Start ``rate`` requests per second for ``duration`` seconds.
+
+        :param rate: Target requests per second
+        :param duration: Seconds to run for
+        :param max_workers: Maximum number of requests in flight
+        :param sleep: Function used to wait between requests
+        :return: LoadStep results
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        step = LoadStep("rate", rate, duration)
+        lock = threading.Lock()
+        interval = 1.0 / rate
+        started = self._clock()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for n in range(int(rate * duration)):
+                due = started + n * interval
+                delay = due - self._clock()
+                if delay > 0:
+                    sleep(delay)
+                executor.submit(self._call, step, lock, due)
+        step.duration = self._clock() - started
+        return step
@@ -1,5 +1,21 @@
+import os
+import threading
+from typing import TYPE_CHECKING, Optional, Union
+
+from .compression import DEFAULT_COMPRESS_MIN_SIZE, accept_encoding
+from .exceptions import ConnectAPIError
+from .forking import register
+from .identity import IdentityIndex
 from .modules.devices import DevicesAPI
 from .modules.orgs import OrgsAPI
+from .singleflight import SingleFlight
+from .stats import ClientStats
+from .transports import Transport, create_transport
+
+if TYPE_CHECKING:
+    from .keepalive import KeepAliveProber
+
+DEFAULT_CACHE_TTL = 60
 
 
 class ConnectClient:
@@ -13,6 +29,160 @@ class ConnectClient:
 
         self.token = token.strip()
 
+        self.stats = ClientStats()
+
+        # Content codings advertised for responses, every decodable one when
+        # None, and optional gzip compression of large request bodies
+        encodings = config.get("accept_encoding")
+        self.accept_encoding = None if encodings is None else accept_encoding(encodings)
+        self.compress_requests = config.get("compress_requests", False)
+        self.compress_requests_min_size = config.get(
+            "compress_requests_min_size", DEFAULT_COMPRESS_MIN_SIZE
+        )
+
+        # Transport sending the requests, e.g. urllib3 or one recording or
+        # replaying traffic, given as a Transport or by name. Without one, a
+        # RequestsTransport over a pooled session is created on first use
+        self._transport_lock = threading.Lock()
+        self.transport = config.get("transport")
+
+        # Optional TTL cache for company, folder and device lookups, kept in the
+        # given cache backend or in process
+        cache_backend = config.get("cache")
+        cache_ttl = config.get("cache_ttl")
+        if cache_backend is not None and not cache_ttl:
+            cache_ttl = DEFAULT_CACHE_TTL
+        if cache_ttl:
+            from .cache import ResponseCache
+
+            self.cache = ResponseCache(
+                ttl=cache_ttl,
+                stale_ttl=config.get("cache_stale_ttl", 0),
+                beta=config.get("cache_beta", 1.0),
+                max_entries=config.get("cache_max_entries", 1024),
+                stats=self.stats,
+                backend=cache_backend,
+            )
+        else:
+            self.cache = None
+
+        # Coalesce identical concurrent GET requests unless disabled
+        if config.get("coalesce_requests", True):
+            self.single_flight = SingleFlight()
+        else:
+            self.single_flight = None
+
+        # Device identity index, optionally persisted to disk
+        self.identity = IdentityIndex(path=config.get("identity_index_path"))
+
+        # Optional cache of recent 404s for by-UID lookups, invalidated as soon
+        # as the identity index learns the UID
+        not_found_ttl = config.get("not_found_ttl")
+        if not_found_ttl:
+            from .cache import NegativeCache
+
+            self.not_found_cache = NegativeCache(
+                ttl=not_found_ttl,
+                max_entries=config.get("not_found_max_entries", 10_000),
+            )
+            self.identity.subscribe(self.not_found_cache.discard)
+        else:
+            self.not_found_cache = None
+
         # Resource Classes
         self.devices = DevicesAPI(self)
         self.orgs = OrgsAPI(self)
+
+        # Locks, in-flight calls and pooled connections belong to the process
+        # that created them, and are rebuilt in forked children
+        self._pid = os.getpid()
+        register(self)
+
+    @property
+    def transport(self) -> Transport:
+        """The transport requests are sent through."""
+        transport = self._transport
+        if transport is None:
+            with self._transport_lock:
+                if self._transport is None:
+                    import requests
+
+                    from .transports import RequestsTransport
+
+                    self._transport = RequestsTransport(requests.Session())
+                transport = self._transport
+        return transport
+
+    @transport.setter
+    def transport(self, transport: Optional[Union[Transport, str]]):
+        if isinstance(transport, str):
+            transport = create_transport(transport)
+        self._transport = transport
+
+    def _check_fork(self):
+        """
+        Rebuild process-local state when the client is used in a forked child
+        whose fork did not run the at-fork hooks.
+        """
+        if self._pid != os.getpid():
+            self._after_fork()
+
+    def _after_fork(self):
+        """
+        Reset state inherited from the parent process: locks that another
+        thread may have held while forking, calls in flight in the parent,
+        statistics, and the transport's pooled connections, which would share
+        sockets with the parent. New connections are opened on first use.
+        """
+        self._pid = os.getpid()
+        self.stats._after_fork()
+        if self.single_flight is not None:
+            self.single_flight = SingleFlight()
+        if self.cache is not None:
+            self.cache._after_fork()
+        if self.not_found_cache is not None:
+            self.not_found_cache._after_fork()
+        self.identity._after_fork()
+        self._transport_lock = threading.Lock()
+        if self._transport is not None:
+            self._transport.after_fork()
+
+    def warmup(self, connections: int = 1, probe: bool = False) -> int:
+        """
+        Open and verify pooled connections to the API host ahead of the first
+        calls, so that they do not pay for DNS, TCP and TLS set-up. Transports
+        without a connection pool have none to warm.
+
+        :param connections: Number of connections to have ready
+        :param probe: Also send a HEAD request over connections already open
+        :return: Number of connections ready
+        """
+        if connections < 1:
+            raise ValueError("Connections must be a positive integer")
+        self._check_fork()
+        try:
+            ready, opened = self.transport.warmup(
+                f"{self.api_url}/", connections, probe=probe
+            )
+        except Exception as e:
+            raise ConnectAPIError("Failed to connect to Connect API") from e
+        self.stats.increment("connections_warmed", opened)
+        return ready
+
+    def keep_alive(self, **options) -> "KeepAliveProber":
+        """
+        Start a background KeepAliveProber refreshing the pooled connections.
+
+        :param options: KeepAliveProber options
+        :return: The running KeepAliveProber; call stop() to end it
+        """
+        from .keepalive import KeepAliveProber
+
+        prober = KeepAliveProber(self, **options)
+        prober.start()
+        return prober
+
+    def close(self):
+        """Close the client's transport, if one has been created."""
+        if self._transport is not None:
+            self._transport.close()
@@ -1,15 +1,36 @@
-import requests
-
+from trinity_connect_client.compression import (
+    accept_encoding,
+    compress_json,
+    record_response_size,
+)
 from trinity_connect_client.exceptions import (
     ConnectAPIError,
     ResourceNotFoundError,
     UnauthorisedError,
 )
+from trinity_connect_client.singleflight import request_key
 
 
 class ResourceMixin:
+    """
+    Request helpers shared by the API resources of a client.
+
+    A client and its resources may be shared between threads. The URL prefix
+    and auth headers memoised here are immutable tuples, replaced as a whole
+    when the client's API URL or token changes, so a thread never sees a
+    header set built for another token. The client's stats, response caches,
+    request coalescing and identity index are guarded by their own locks, and
+    are rebuilt, along with the transport's pooled connections, when the
+    client is first used in a forked child.
+    """
+
     def __init__(self, client):
         self.client = client
+        # (api_url, prefix), (token, headers) and (token, cache namespace),
+        # rebuilt when the API URL or token changes
+        self._url_prefix = (None, "")
+        self._auth_headers = (None, {})
+        self._cache_namespace = (None, "")
 
     def _url(self, path: str) -> str:
         """
@@ -18,9 +39,15 @@ class ResourceMixin:
         :param path: The URL path (e.g., "devices/123" or "devices/uid/abc-123")
         :return: Full URL including base API URL
         """
+        api_url, prefix = self._url_prefix
+        if api_url is not self.client.api_url:
+            api_url = self.client.api_url
+            prefix = f"{api_url}/"
+            self._url_prefix = (api_url, prefix)
         # Remove leading slash if present for consistency
-        path = path.lstrip("/")
-        return f"{self.client.api_url}/{path}"
+        if path[:1] == "/":
+            path = path.lstrip("/")
+        return prefix + path
 
     @staticmethod
     def _get_default_headers():
@@ -32,35 +59,115 @@ class ResourceMixin:
         return {"Content-Type": "application/json", "Accept": "application/json"}
 
     def _get_auth_headers(self):
-        default_headers = self._get_default_headers()
-        return {
-            **default_headers,
-            "Authorization": f"Bearer {self.client.token}",
-        }
+        """
+        Default headers with the Authorization header. The dictionary is built
+        once per token and shared between requests, so it must not be mutated.
+        """
+        token, headers = self._auth_headers
+        if token is not self.client.token:
+            token = self.client.token
+            headers = {
+                **self._get_default_headers(),
+                "Accept-Encoding": self.client.accept_encoding or accept_encoding(),
+                "Authorization": f"Bearer {token}",
+            }
+            self._auth_headers = (token, headers)
+        return headers
+
+    def _get_cache_namespace(self):
+        """
+        Digest of the client's token prefixed to response cache keys, so that
+        clients sharing a cache backend are only served responses fetched with
+        their own token.
+        """
+        token, namespace = self._cache_namespace
+        if token is not self.client.token:
+            import hashlib
+
+            token = self.client.token
+            namespace = hashlib.sha256(token.encode()).hexdigest()[:32]
+            self._cache_namespace = (token, namespace)
+        return namespace
+
+    def _send(self, method, url, headers, params=None, json=None):
+        """
+        Send a request through the client's transport and return the response.
+        JSON bodies are gzipped when request compression is enabled and they
+        are large enough.
+        """
+        client = self.client
+        body = {"json": json}
+        if json is not None and client.compress_requests:
+            data = compress_json(json, client.compress_requests_min_size, client.stats)
+            if data is not None:
+                headers = {**headers, "Content-Encoding": "gzip"}
+                body = {"data": data}
+
+        response = client.transport.send(
+            method, url, headers=headers, params=params, **body
+        )
+        record_response_size(
+            client.stats, response, getattr(response, "wire_bytes", None)
+        )
+        return response
 
     def make_post_request(self, url, headers=None, json=None):
+        self.client._check_fork()
         request_headers = self._get_auth_headers() if not headers else headers
 
         try:
-            response = requests.post(url, headers=request_headers, json=json)
+            response = self._send("POST", url, request_headers, json=json)
             return response.status_code, response.json()
         except Exception:
             raise ConnectAPIError("Failed to make request to Connect API")
 
     def make_patch_request(self, url, headers=None, json=None):
+        self.client._check_fork()
         request_headers = self._get_auth_headers() if not headers else headers
 
         try:
-            response = requests.patch(url, headers=request_headers, json=json)
+            response = self._send("PATCH", url, request_headers, json=json)
             return response.status_code, response.json()
         except Exception:
             raise ConnectAPIError("Failed to make request to Connect API")
 
     def make_get_request(self, url, headers=None, params=None):
+        # Before the coalescing lock is taken, which may be the parent's
+        self.client._check_fork()
+        single_flight = self.client.single_flight
+        if single_flight is None or headers:
+            return self._send_get_request(url, headers=headers, params=params)
+
+        # Identical concurrent GETs share one request and one decoded result
+        return single_flight.do(
+            request_key(url, params),
+            lambda: self._send_get_request(url, params=params),
+        )
+
+    def make_cached_get_request(self, url, params=None):
+        """
+        Make a GET request through the client's response cache, if one is
+        configured. Cached responses are shared between callers using the same
+        token and must not be mutated.
+
+        :param url: The request URL
+        :param params: The query parameters
+        :return: The decoded response
+        """
+        self.client._check_fork()
+        cache = self.client.cache
+        if cache is None:
+            return self.make_get_request(url, params=params)
+        return cache.get_or_fetch(
+            (self._get_cache_namespace(), request_key(url, params)),
+            lambda: self.make_get_request(url, params=params),
+        )
+
+    def _send_get_request(self, url, headers=None, params=None):
         request_headers = self._get_auth_headers() if not headers else headers
 
         try:
-            response = requests.get(url, headers=request_headers, params=params)
+            response = self._send("GET", url, request_headers, params=params)
         except Exception:
             raise ConnectAPIError("Failed to make request to Connect API")
 
@@ -85,3 +192,92 @@ class ResourceMixin:
         :return:
         """
         return self.make_get_request(url)
+
+    def iter_pages(self, response, key="results"):
+        """
+        Iterate over the records of a possibly paginated response, one page at a
+        time. Paginated responses are dictionaries holding the page records under
+        ``key`` and the URL of the following page under ``next``; plain list
+        responses are treated as a single page.
+
+        :param response: The first response, as returned by a make_get_request call
+        :param key: The key holding the records of a paginated page
+        :return: Generator of lists of records
+        """
+        while True:
+            if isinstance(response, list):
+                yield response
+                return
+
+            yield response.get(key, [])
+
+            next_url = response.get("next")
+            if not next_url:
+                return
+            response = self.get_linked_resource(next_url)
+
+    def expand_links(self, response, expand, max_workers=8):
+        """
+        Fetch the linked resources named in ``expand`` for every record of a
+        response concurrently, and return copies of the records with them
+        attached under ``expanded``. A URL shared by several records is only
+        fetched once, and links to resources that no longer exist are attached
+        as None.
+
+        :param response: A record, a list of records or a paginated page
+        :param expand: Names of the link fields to follow, e.g. ["events_url"]
+        :param max_workers: Maximum number of concurrent requests
+        :return: A copy of the response, with the linked resources attached
+        """
+        if not expand:
+            return response
+        if isinstance(expand, str) or not all(isinstance(n, str) for n in expand):
+            raise ValueError("Expand must be a list of link field names")
+
+        if isinstance(response, dict) and "results" in response:
+            records = response["results"]
+        elif isinstance(response, list):
+            records = response
+        else:
+            records = [response]
+
+        urls = list(
+            dict.fromkeys(
+                r[name]
+                for r in records
+                if isinstance(r, dict)
+                for name in expand
+                if r.get(name)
+            )
+        )
+
+        def fetch(url):
+            try:
+                return self.get_linked_resource(url)
+            except ResourceNotFoundError:
+                return None
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            resources = dict(zip(urls, executor.map(fetch, urls)))
+
+        # Annotate copies, responses may be shared through the cache
+        expanded = [
+            {
+                **record,
+                "expanded": {
+                    **record.get("expanded", {}),
+                    **{name: resources.get(record.get(name)) for name in expand},
+                },
+            }
+            if isinstance(record, dict)
+            else record
+            for record in records
+        ]
+
+        if isinstance(response, dict) and "results" in response:
+            return {**response, "results": expanded}
+        if isinstance(response, list):
+            return expanded
+        return expanded[0]
@@ -1,36 +1,150 @@
-from typing import Dict, Any
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
 from trinity_connect_client.decorators import handle_exceptions
+from trinity_connect_client.exceptions import ResourceNotFoundError
 from trinity_connect_client.mixins import ResourceMixin
 from trinity_connect_client.validators import validate_id, validate_uid, validate_command
 
+if TYPE_CHECKING:
+    # Feature modules are imported when used, keeping the package import cheap
+    from trinity_connect_client.polling import TelemetryPoller
+    from trinity_connect_client.telemetry import TelemetryBatch
+    from trinity_connect_client.watch import Watcher
+
 
 class DevicesAPI(ResourceMixin):
+    def _learn(self, response):
+        """
+        Record the identities of the devices in a response in the client's
+        identity index and return the response unchanged.
+        """
+        self.client.identity.learn(response)
+        return response
+
+    def get_linked_resource(self, url):
+        # Following pages and linked devices reach the identity index too
+        return self._learn(super().get_linked_resource(url))
+
+    def _get_remembering_misses(self, kind, device_uid, get, url, **kwargs):
+        """
+        GET a by-UID resource with the given request method, answering recently
+        missed lookups from the client's negative cache and recording new
+        misses in it.
+        """
+        not_found_cache = self.client.not_found_cache
+        if not_found_cache is not None and not_found_cache.contains(kind, device_uid):
+            self.client.stats.increment("not_found_cache_hits")
+            raise ResourceNotFoundError("Requested resource not found")
+        try:
+            return get(url, **kwargs)
+        except ResourceNotFoundError:
+            if not_found_cache is not None:
+                not_found_cache.add(kind, device_uid)
+            raise
+
+    def resolve_id(self, device_uid: str) -> int:
+        """
+        Resolve a device UID to its ID, using the identity index when possible.
+
+        :param device_uid: The UID of the device
+        :return: The device ID
+        """
+        validate_uid(device_uid)
+        device_id = self.client.identity.id_for_uid(device_uid)
+        if device_id is None:
+            device_id = self.get_by_uid(device_uid)["id"]
+        return device_id
+
+    def resolve_uid(self, device_id: int) -> str:
+        """
+        Resolve a device ID to its UID, using the identity index when possible.
+
+        :param device_id: The ID of the device
+        :return: The device UID
+        """
+        validate_id(device_id)
+        device_uid = self.client.identity.uid_for_id(device_id)
+        if device_uid is None:
+            device_uid = self.get(device_id)["uid"]
+        return device_uid
+
+    def index_folder(self, folder_id: int, **filters: str) -> int:
+        """
+        Bulk load the identity index from a lightweight listing of a folder.
+        Every page is learned once, as it is fetched.
+
+        :param folder_id: The ID of the folder to index
+        :param filters: Filters passed to the listing request
+        :return: Number of devices listed
+        """
+        response = self.list_by_folder_lite(folder_id, **filters)
+        return sum(len(page) for page in self.iter_pages(response))
+
+    def poll_latest_data(
+        self, devices: Iterable[Dict[str, Any]], **options: Any
+    ) -> "TelemetryPoller":
+        """
+        Create a poller for the latest data of devices, scheduled by their
+        contracted communication intervals.
+
+        :param devices: Device dictionaries, e.g. from list_by_folder
+        :param options: TelemetryPoller options and latest data filters
+        :return: A TelemetryPoller; call run(), stream() or step() to poll
+        """
+        from trinity_connect_client.polling import TelemetryPoller
+
+        return TelemetryPoller(self, devices, **options)
+
+    def watch(self, devices: Iterable[Dict[str, Any]], **options: Any) -> "Watcher":
+        """
+        Watch devices for changes to their latest data, comm_state and state.
+
+        Iterate the returned Watcher, with ``for`` or ``async for``, to receive
+        a ChangeEvent for every field that changed between two polls.
+
+        :param devices: Device dictionaries, e.g. from list_by_folder
+        :param options: Watcher and TelemetryPoller options, and latest data filters
+        :return: A Watcher
+        """
+        from trinity_connect_client.watch import Watcher
+
+        return Watcher(self, devices, **options)
+
     @handle_exceptions
-    def get(self, device_id: int) -> Dict[str, Any]:
+    def get(
+        self, device_id: int, expand: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         GET a device by ID.
 
         :param device_id: The ID of the device to retrieve
+        :param expand: Link fields to fetch concurrently and attach under
+            "expanded", e.g. ["latest_data_url", "meta_url"]
         :return: A Device object as dictionary or error response
         :raises ValueError: If device_id is not a positive integer
         """
         validate_id(device_id)
         url = self._url(f"devices/{device_id}/")
-        return self.make_get_request(url)
+        response = self._learn(self.make_cached_get_request(url))
+        return self.expand_links(response, expand)
 
     @handle_exceptions
-    def get_by_uid(self, device_uid: str) -> Dict[str, Any]:
+    def get_by_uid(self, device_uid: str, cached: bool = True) -> Dict[str, Any]:
         """
         GET a device by UID.
 
         :param device_uid: The UID of the device to retrieve
+        :param cached: Serve the device from the client's response cache, if one
+            is configured; pass False to always request it
         :return: A Device object as dictionary or error response
         :raises ValueError: If device_uid is not a valid string
         """
         validate_uid(device_uid)
         url = self._url(f"devices/uid/{device_uid}/")
-        return self.make_get_request(url)
+        get = self.make_cached_get_request if cached else self.make_get_request
+        response = self._get_remembering_misses("device", device_uid, get, url)
+        return self._learn(response)
 
     @handle_exceptions
     def get_latest_data_by_uid(self, device_uid: str, **filters: str) -> dict[str, Any]:
@@ -42,7 +156,28 @@ class DevicesAPI(ResourceMixin):
         """
         validate_uid(device_uid)
         url = self._url(f"devices/uid/{device_uid}/data/latest/")
-        return self.make_get_request(url, params=filters)
+        return self._get_remembering_misses(
+            "latest_data", device_uid, self.make_get_request, url, params=filters
+        )
+
+    def collect_latest_data(
+        self, device_uids: Iterable[str], max_workers: int = 8, **filters: str
+    ) -> "TelemetryBatch":
+        """
+        GET latest data for many devices concurrently as a metric-by-device matrix.
+
+        Requires the optional ``numpy`` extra.
+
+        :param device_uids: The UIDs of the devices to retrieve
+        :param max_workers: Maximum number of concurrent requests
+        :param filters: Filters passed to every latest data request
+        :return: A TelemetryBatch with vectorised aggregation helpers
+        """
+        from trinity_connect_client.telemetry import collect_latest_data
+
+        return collect_latest_data(
+            self, device_uids, max_workers=max_workers, **filters
+        )
 
     @handle_exceptions
     def get_events_by_uid(
@@ -58,6 +193,45 @@ class DevicesAPI(ResourceMixin):
         url = self._url(f"devices/uid/{device_uid}/events/")
         return self.make_get_request(url, params=filters)
 
+    def get_events_by_uid_windowed(
+        self,
+        device_uid: str,
+        start: datetime,
+        end: datetime,
+        window: timedelta = timedelta(days=7),
+        max_workers: int = 8,
+        max_events_per_window: Optional[int] = None,
+        **filters: str,
+    ) -> list[dict[str, Any]]:
+        """
+        GET events for a device by UID over a time range, fetching time windows
+        concurrently and merging them in timestamp order without duplicates.
+
+        See trinity_connect_client.history.get_events_windowed for the filter,
+        timestamp and identifier field options accepted in filters.
+
+        :param device_uid: The UID of the device to retrieve
+        :param start: Start of the time range
+        :param end: End of the time range
+        :param window: Initial window length
+        :param max_workers: Maximum number of concurrent requests
+        :param max_events_per_window: Split windows reporting more events than this
+        :return: List of events sorted by timestamp
+        """
+        validate_uid(device_uid)
+        from trinity_connect_client.history import get_events_windowed
+
+        return get_events_windowed(
+            self,
+            device_uid,
+            start,
+            end,
+            window=window,
+            max_workers=max_workers,
+            max_events_per_window=max_events_per_window,
+            **filters,
+        )
+
     @handle_exceptions
     def get_commands_by_uid(
         self, device_uid: str, **filters: str
@@ -73,17 +247,22 @@ class DevicesAPI(ResourceMixin):
         return self.make_get_request(url, params=filters)
 
     @handle_exceptions
-    def list_by_folder(self, folder_id: int, **filters: str) -> list[dict[str, Any]]:
+    def list_by_folder(
+        self, folder_id: int, expand: Optional[List[str]] = None, **filters: str
+    ) -> list[dict[str, Any]]:
         """
         GET list of devices by folder ID.
 
         :param folder_id:
+        :param expand: Link fields to fetch concurrently for every device and
+            attach under "expanded"; URLs shared by devices are fetched once
         :param filters:
         :return:
         """
         validate_id(folder_id)
         url = self._url(f"devices/folder/{folder_id}/")
-        return self.make_get_request(url, params=filters)
+        response = self._learn(self.make_get_request(url, params=filters))
+        return self.expand_links(response, expand)
 
     @handle_exceptions
     def list_by_folder_lite(
@@ -98,7 +277,7 @@ class DevicesAPI(ResourceMixin):
         """
         validate_id(folder_id)
         url = self._url(f"devices/folder/{folder_id}/lite/")
-        return self.make_get_request(url, params=filters)
+        return self._learn(self.make_get_request(url, params=filters))
 
     @handle_exceptions
     def move_to_folder(self, device_id: int, folder_id: int) -> dict[str, Any]:
@@ -1,22 +1,41 @@
-from typing import Dict, List, Any, Union
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Any,
+    Optional,
+    Union,
+)
 
 from trinity_connect_client.decorators import handle_exceptions
 from trinity_connect_client.mixins import ResourceMixin
 from trinity_connect_client.validators import validate_id
 
+if TYPE_CHECKING:
+    # Feature modules are imported when used, keeping the package import cheap
+    from trinity_connect_client.crawl import CrawlProgress
+    from trinity_connect_client.folders import FolderTree
+
 
 class OrgsAPI(ResourceMixin):
     @handle_exceptions
-    def get(self, company_id: int) -> Dict[str, Any]:
+    def get(
+        self, company_id: int, expand: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         GET a company by ID.
 
         :param company_id: The ID of the company to retrieve
+        :param expand: Link fields to fetch concurrently and attach under
+            "expanded", e.g. ["url_devices", "url_sims"]
         :return: A Company object as dictionary or error response
         """
         validate_id(company_id)
         url = self._url(f"orgs/company/{company_id}/")
-        return self.make_get_request(url)
+        return self.expand_links(self.make_cached_get_request(url), expand)
 
     @handle_exceptions
     def get_folders(
@@ -31,7 +50,7 @@ class OrgsAPI(ResourceMixin):
         """
         validate_id(company_id)
         url = self._url(f"orgs/folders/company/{company_id}/")
-        return self.make_get_request(url, params=filters)
+        return self.make_cached_get_request(url, params=filters)
 
     @handle_exceptions
     def get_folder(
@@ -46,4 +65,54 @@ class OrgsAPI(ResourceMixin):
         """
         validate_id(folder_id)
         url = self._url(f"orgs/folder/{folder_id}/")
-        return self.make_get_request(url, params=filters)
+        return self.make_cached_get_request(url, params=filters)
+
+    def get_folder_tree(self, company_id: int, **filters) -> "FolderTree":
+        """
+        Build an in-memory index of a company's folder tree from one sweep of
+        get_folders. Call refresh() on the tree to apply later changes.
+
+        :param company_id: The ID of the company whose folders to index
+        :param filters: Optional filters to apply to the request
+        :return: FolderTree instance
+        """
+        validate_id(company_id)
+        from trinity_connect_client.folders import FolderTree
+
+        return FolderTree.from_api(self, company_id, **filters)
+
+    def iter_company_devices(
+        self,
+        company_id: int,
+        fields: Optional[Iterable[str]] = None,
+        lite: Optional[bool] = None,
+        max_workers: int = 8,
+        progress: Optional[Callable[["CrawlProgress"], None]] = None,
+        **filters: str,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Crawl every folder of a company concurrently and yield its devices as
+        they arrive, without duplicates.
+
+        :param company_id: The ID of the company to crawl
+        :param fields: Only include these fields in every device; the lightweight
+            listing is used when they are all available from it
+        :param lite: Force the lightweight (True) or full (False) listing
+        :param max_workers: Maximum number of concurrent folder listings
+        :param progress: Called with a CrawlProgress after every folder
+        :param filters: Filters passed to every folder listing
+        :return: Generator of devices as dictionaries
+        """
+        validate_id(company_id)
+        from trinity_connect_client.crawl import iter_company_devices
+
+        return iter_company_devices(
+            self,
+            self.client.devices,
+            company_id,
+            fields=fields,
+            lite=lite,
+            max_workers=max_workers,
+            progress=progress,
+            **filters,
+        )
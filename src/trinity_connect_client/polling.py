@@ -0,0 +1,431 @@
+"""
+Adaptive polling of latest device data.
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from trinity_connect_client.exceptions import ResourceNotFoundError
+
+
+class TokenBucket:
+    """
+    Request budget refilled at ``rate`` tokens per second, holding at most
+    ``burst`` tokens.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def take(self) -> bool:
+        """
+        Take a token if one is available.
+
+        :return: Whether a token was taken
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def wait_time(self) -> float:
+        """
+        Seconds until a token will be available.
+
+        :return: Zero when a token is available now
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+@dataclass
+class PollResult:
+    """Latest data of a device returned by a TelemetryPoller."""
+
+    uid: str
+    data: Any
+    polled_at: float
+    # False when the data equals the previous poll of the device
+    changed: bool
+
+
+def expected_report_time(device: Dict[str, Any]) -> Optional[float]:
+    """
+    Estimate when a device will next report, from its last communication
+    timestamp and contracted communication interval in seconds.
+
+    :param device: Device dictionary
+    :return: Unix timestamp, or None when the device lacks either field
+    """
+    timestamp = device.get("youngest_comm_timestamp")
+    interval = device.get("comm_interval_contract")
+    if not timestamp or not interval:
+        return None
+    try:
+        last = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if last.tzinfo is None:
+        last = last.replace(tzinfo=timezone.utc)
+    return last.timestamp() + interval
+
+
+class _DeviceState:
+    __slots__ = ("device", "due", "interval", "data", "polled")
+
+    def __init__(self, device: Dict[str, Any]):
+        self.device = device
+        self.due = 0.0
+        self.interval = 0.0
+        self.data: Any = None
+        self.polled = False
+
+
+class TelemetryPoller:
+    """
+    Polls the latest data of many devices, each when it is expected to have
+    reported.
+
+    Devices are kept in a priority queue keyed on their next poll time, which
+    starts at the expected report time (see expected_report_time) and is then
+    derived from the contracted interval, never shorter than ``min_interval``.
+    A device whose data did not change since its previous poll is considered
+    idle and its interval is multiplied by ``backoff_factor`` up to
+    ``max_interval``, as is one that failed to poll; devices whose
+    ``comm_state`` is in ``offline_comm_states`` are polled every
+    ``max_interval``. Devices that no longer exist are dropped.
+
+    At most ``rate`` polls are made per second, in bursts of ``burst``, with up
+    to ``max_workers`` in flight. Results are delivered through step(), results(),
+    run() or stream(). Poll counts are recorded in the client statistics as polls,
+    poll_changes, poll_errors and poll_not_found, and the delay between a
+    device becoming due and being polled as poll_lag.
+    """
+
+    def __init__(
+        self,
+        devices_api,
+        devices: Iterable[Dict[str, Any]] = (),
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        min_interval: float = 60.0,
+        max_interval: float = 3600.0,
+        backoff_factor: float = 2.0,
+        offline_comm_states: Iterable[int] = (),
+        grace: float = 5.0,
+        jitter: float = 0.1,
+        max_workers: int = 8,
+        fetch: Optional[Callable[[str], Any]] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Optional[Callable[[float], Any]] = None,
+        rand: Callable[[], float] = random.random,
+        **filters: str,
+    ):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Intervals must satisfy 0 < min_interval <= max_interval")
+        if backoff_factor < 1:
+            raise ValueError("Backoff factor must be at least 1")
+
+        self.devices_api = devices_api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.offline_comm_states = frozenset(offline_comm_states)
+        self.grace = grace
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.on_error = on_error
+        self.budget = TokenBucket(rate, burst, clock=clock)
+        self.filters = filters
+        self._fetch = fetch or (
+            lambda uid: devices_api.get_latest_data_by_uid(uid, **filters)
+        )
+        self._clock = clock
+        self._rand = rand
+        self._stopped = threading.Event()
+        self._sleep = sleep or self._stopped.wait
+        # Event loop and asyncio.Event of a running stream(), woken by stop()
+        self._wakeup: Optional[tuple] = None
+        self._lock = threading.Lock()
+        self._states: Dict[str, _DeviceState] = {}
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        for device in devices:
+            self.add(device)
+
+    def __len__(self):
+        return len(self._states)
+
+    def __contains__(self, uid):
+        return uid in self._states
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _stats(self):
+        return self.devices_api.client.stats
+
+    def _base_interval(self, device: Dict[str, Any]) -> float:
+        if device.get("comm_state") in self.offline_comm_states:
+            return self.max_interval
+        contract = device.get("comm_interval_contract") or 0
+        return min(self.max_interval, max(self.min_interval, contract))
+
+    def _schedule(self, uid: str, state: _DeviceState, due: float):
+        # Spread devices sharing an interval so they are not all due together
+        if self.jitter:
+            due += state.interval * self.jitter * self._rand()
+        state.due = due
+        heapq.heappush(self._heap, (due, next(self._counter), uid))
+
+    def add(self, device: Dict[str, Any]):
+        """
+        Start polling a device, or update the record of one already polled.
+
+        :param device: Device dictionary with at least a uid
+        """
+        uid = device["uid"]
+        now = self._clock()
+        with self._lock:
+            state = self._states.get(uid)
+            if state is not None:
+                state.device = device
+                return
+            state = self._states[uid] = _DeviceState(device)
+            state.interval = self._base_interval(device)
+            expected = expected_report_time(device)
+            if device.get("comm_state") in self.offline_comm_states:
+                due = now + state.interval
+            elif expected is not None and expected + self.grace > now:
+                due = expected + self.grace
+            else:
+                due = now
+            self._schedule(uid, state, due)
+
+    def remove(self, uid: str):
+        """
+        Stop polling a device.
+
+        :param uid: The UID of the device
+        """
+        with self._lock:
+            # Its queue entry is skipped when popped
+            self._states.pop(uid, None)
+
+    def time_until_next(self) -> Optional[float]:
+        """
+        Seconds until the next poll is allowed, by schedule and by budget.
+
+        :return: Zero when a poll is due now, None when no devices are polled
+        """
+        now = self._clock()
+        with self._lock:
+            while self._heap:
+                due, _, uid = self._heap[0]
+                state = self._states.get(uid)
+                if state is not None and state.due == due:
+                    break
+                heapq.heappop(self._heap)
+            else:
+                return None
+        if due > now:
+            return due - now
+        return self.budget.wait_time()
+
+    def _pop_due(self, now: float) -> List[tuple]:
+        batch = []
+        with self._lock:
+            while self._heap and len(batch) < self.max_workers * 4:
+                due, _, uid = self._heap[0]
+                state = self._states.get(uid)
+                if state is None or state.due != due:
+                    heapq.heappop(self._heap)
+                    continue
+                if due > now or not self.budget.take():
+                    break
+                heapq.heappop(self._heap)
+                batch.append((uid, due))
+        return batch
+
+    def _poll(self, uid: str):
+        try:
+            return self._fetch(uid), None
+        except Exception as e:
+            return None, e
+
+    def step(self) -> List[PollResult]:
+        """
+        Poll the devices that are due, as far as the budget allows.
+
+        :return: Results of the successful polls
+        """
+        now = self._clock()
+        batch = self._pop_due(now)
+        if not batch:
+            return []
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        outcomes = list(self._executor.map(self._poll, [uid for uid, _ in batch]))
+
+        stats = self._stats()
+        polled_at = self._clock()
+        results = []
+        errors = []
+        with self._lock:
+            for (uid, due), (data, error) in zip(batch, outcomes):
+                stats.increment("polls")
+                stats.observe("poll_lag", max(0.0, now - due))
+                state = self._states.get(uid)
+                if state is None:
+                    continue
+                base = self._base_interval(state.device)
+
+                if isinstance(error, ResourceNotFoundError):
+                    stats.increment("poll_not_found")
+                    del self._states[uid]
+                    continue
+                if error is not None:
+                    stats.increment("poll_errors")
+                    errors.append((uid, error))
+                    state.interval = min(
+                        self.max_interval,
+                        max(base, state.interval * self.backoff_factor),
+                    )
+                    self._schedule(uid, state, polled_at + state.interval)
+                    continue
+
+                changed = not state.polled or data != state.data
+                if changed:
+                    stats.increment("poll_changes")
+                    state.interval = base
+                elif state.polled:
+                    state.interval = min(
+                        self.max_interval, state.interval * self.backoff_factor
+                    )
+                state.data = data
+                state.polled = True
+                self._schedule(uid, state, polled_at + state.interval)
+                results.append(PollResult(uid, data, polled_at, changed))
+
+        if self.on_error is not None:
+            for uid, error in errors:
+                self.on_error(uid, error)
+        return results
+
+    def results(self) -> Iterator[PollResult]:
+        """
+        Poll until stop() is called or no devices remain, yielding every result.
+
+        :return: Generator of PollResult
+        """
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            yield from self.step()
+            delay = self.time_until_next()
+            if delay is None:
+                break
+            if delay > 0:
+                self._sleep(delay)
+
+    def run(self, callback: Callable[[PollResult], Any]):
+        """
+        Poll until stop() is called or no devices remain, passing every result
+        to callback.
+
+        :param callback: Called with each PollResult
+        """
+        for result in self.results():
+            callback(result)
+
+    async def stream(self) -> AsyncIterator[PollResult]:
+        """
+        Poll until stop() is called or no devices remain, yielding every result.
+
+        Polls run in a worker thread so the event loop is not blocked, and
+        waits between them end as soon as stop() is called.
+
+        :return: Async iterator of PollResult
+        """
+        wakeup = asyncio.Event()
+        self._wakeup = (asyncio.get_running_loop(), wakeup)
+        self._stopped.clear()
+        try:
+            while not self._stopped.is_set():
+                for result in await asyncio.to_thread(self.step):
+                    yield result
+                delay = self.time_until_next()
+                if delay is None:
+                    break
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), delay)
+                    except TimeoutError:
+                        pass
+        finally:
+            self._wakeup = None
+
+    def stop(self):
+        """Make run() and stream() return after the current step."""
+        self._stopped.set()
+        if self._wakeup is not None:
+            loop, wakeup = self._wakeup
+            try:
+                # stop() may be called from another thread than the loop's
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # The loop is closed
+                pass
+
+    def close(self):
+        """Stop polling and shut down the worker threads."""
+        self.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
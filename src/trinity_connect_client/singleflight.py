@@ -0,0 +1,94 @@
+"""
+Single-flight coalescing of identical concurrent requests.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "shared")
+
+    def __init__(self):
+        # Only created once a second caller has to wait
+        self.done: Optional[threading.Event] = None
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.shared = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+
+    The first caller for a key executes the function; callers arriving with the
+    same key while it is in flight wait for it and receive the same result, or
+    the same exception. Once the call completes the key is forgotten, so later
+    callers execute the function again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def in_flight(self, key: Hashable) -> int:
+        """
+        Number of callers waiting on an in-flight call, including its leader.
+
+        :param key: The call key
+        :return: Zero when no call is in flight for the key
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            return call.shared + 1 if call else 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Execute func, or wait for the in-flight call with the same key.
+
+        :param key: Identifies calls that may share a result
+        :param func: The function to execute
+        :return: The result of func
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.shared += 1
+                if call.done is None:
+                    call.done = threading.Event()
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                done = call.done
+            if done is not None:
+                done.set()
+
+
+def request_key(url: str, params: Optional[Dict[str, Any]] = None) -> Hashable:
+    """
+    Build a coalescing key from a request URL and its query parameters.
+
+    :param url: The request URL
+    :param params: The query parameters
+    :return: Hashable key that is independent of parameter order
+    """
+    if not params:
+        return url, ()
+    return url, tuple(sorted((str(k), repr(v)) for k, v in params.items()))
@@ -0,0 +1,65 @@
+"""
+Thread-safe client statistics.
+"""
+
+import threading
+from typing import Any, Dict
+
+
+class ClientStats:
+    """
+    Counters and timing observations collected by a ConnectClient.
+
+    Counters are plain integers; observations keep a count, total and maximum
+    so that averages can be derived. Use snapshot() for a consistent copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._observations: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            observation = self._observations.get(name)
+            if observation is None:
+                self._observations[name] = {"count": 1, "total": value, "max": value}
+            else:
+                observation["count"] += 1
+                observation["total"] += value
+                observation["max"] = max(observation["max"], value)
+
+    def get(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return a copy of all counters and observations.
+
+        Observations are returned as dictionaries with count, total, max and mean.
+
+        :return: Mapping of statistic name to value
+        """
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._counters)
+            for name, observation in self._observations.items():
+                snapshot[name] = {
+                    **observation,
+                    "mean": observation["total"] / observation["count"],
+                }
+        return snapshot
+
+    def _after_fork(self):
+        # Statistics are per process; the lock may have been held while forking
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._observations = {}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
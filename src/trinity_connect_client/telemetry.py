@@ -0,0 +1,210 @@
+"""
+Columnar telemetry batches built from latest device data.
+
+NumPy is an optional dependency, install it with the ``numpy`` extra:
+``pip install trinity-connect-client[numpy]``.
+"""
+
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from trinity_connect_client.exceptions import ResourceNotFoundError
+
+
+def _require_numpy(feature: str = "telemetry batches"):
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            f"NumPy is required for {feature}. "
+            "Install it with: pip install trinity-connect-client[numpy]"
+        ) from e
+    return numpy
+
+
+def flatten_metrics(data: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """
+    Flatten a (possibly nested) device data payload into numeric metrics.
+
+    Nested dictionaries are joined with dots, e.g. ``{"battery": {"v": 3.7}}``
+    becomes ``{"battery.v": 3.7}``. Non-numeric values are skipped and booleans
+    are converted to ``0.0``/``1.0``.
+
+    :param data: Device data dictionary
+    :param prefix: Prefix prepended to every metric name
+    :return: Dictionary of metric name to float value
+    """
+    metrics = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten_metrics(value, prefix=f"{name}."))
+        elif isinstance(value, (int, float)):
+            metrics[name] = float(value)
+    return metrics
+
+
+class TelemetryBatch:
+    """
+    A metric-by-device matrix of latest telemetry values.
+
+    ``values`` has shape ``(len(metrics), len(uids))`` and holds ``NaN`` wherever
+    a device did not report a metric; ``mask`` is ``True`` at those positions.
+    Aggregates are computed per metric over the devices that reported it and
+    are returned as arrays aligned with ``metrics``.
+    """
+
+    def __init__(
+        self, uids: List[str], metrics: List[str], values, mask, not_found=None
+    ):
+        self.uids = uids
+        self.metrics = metrics
+        self.values = values
+        self.mask = mask
+        self.not_found = not_found or []
+        self._metric_index = {name: i for i, name in enumerate(metrics)}
+
+    @classmethod
+    def from_payloads(
+        cls, payloads: Dict[str, Optional[Dict[str, Any]]]
+    ) -> "TelemetryBatch":
+        """
+        Build a batch from a mapping of device UID to latest data payload.
+
+        :param payloads: Mapping of UID to data dictionary, ``None`` for devices
+            that could not be found
+        :return: TelemetryBatch instance
+        """
+        np = _require_numpy()
+
+        uids = list(payloads)
+        metric_index: Dict[str, int] = {}
+        rows, cols, vals = [], [], []
+        not_found = []
+        for col, uid in enumerate(uids):
+            payload = payloads[uid]
+            if payload is None:
+                not_found.append(uid)
+                continue
+            for name, value in flatten_metrics(payload).items():
+                rows.append(metric_index.setdefault(name, len(metric_index)))
+                cols.append(col)
+                vals.append(value)
+
+        values = np.full((len(metric_index), len(uids)), np.nan, dtype=np.float64)
+        if vals:
+            values[rows, cols] = vals
+        mask = np.isnan(values)
+        return cls(uids, list(metric_index), values, mask, not_found=not_found)
+
+    def metric(self, name: str):
+        """
+        Return the values of a single metric as a masked array over devices.
+
+        :param name: Metric name
+        :return: ``numpy.ma.MaskedArray`` of shape ``(len(uids),)``
+        """
+        np = _require_numpy()
+        row = self._metric_index[name]
+        return np.ma.MaskedArray(self.values[row], mask=self.mask[row])
+
+    def count(self):
+        """Number of devices reporting each metric."""
+        return (~self.mask).sum(axis=1)
+
+    def min(self):
+        np = _require_numpy()
+        masked = np.where(self.mask, np.inf, self.values)
+        return self._reduce(masked.min(axis=1, initial=np.inf))
+
+    def max(self):
+        np = _require_numpy()
+        masked = np.where(self.mask, -np.inf, self.values)
+        return self._reduce(masked.max(axis=1, initial=-np.inf))
+
+    def sum(self):
+        np = _require_numpy()
+        return np.where(self.mask, 0.0, self.values).sum(axis=1)
+
+    def mean(self):
+        np = _require_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._reduce(self.sum() / self.count())
+
+    def std(self):
+        np = _require_numpy()
+        return self._nan_reduce(np.nanstd)
+
+    def percentile(self, q):
+        """
+        Per-metric percentile(s), ignoring missing values.
+
+        :param q: Percentile or sequence of percentiles in the range 0-100
+        :return: Array of shape ``(len(metrics),)`` or ``(len(q), len(metrics))``
+        """
+        np = _require_numpy()
+        return self._nan_reduce(np.nanpercentile, q)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarise every metric as a dictionary of aggregates.
+
+        :return: Mapping of metric name to count, min, max, mean, p50 and p95
+        """
+        count, minimum, maximum = self.count(), self.min(), self.max()
+        mean = self.mean()
+        p50, p95 = self.percentile([50, 95]) if self.metrics else ([], [])
+        return {
+            name: {
+                "count": int(count[i]),
+                "min": float(minimum[i]),
+                "max": float(maximum[i]),
+                "mean": float(mean[i]),
+                "p50": float(p50[i]),
+                "p95": float(p95[i]),
+            }
+            for i, name in enumerate(self.metrics)
+        }
+
+    def _reduce(self, result):
+        np = _require_numpy()
+        return np.where(self.count() == 0, np.nan, result)
+
+    def _nan_reduce(self, func, *args):
+        np = _require_numpy()
+        if not self.metrics:
+            return np.empty(0)
+        with warnings.catch_warnings():
+            # Metrics that no device reported produce "All-NaN slice" warnings
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            return func(self.values, *args, axis=1)
+
+
+def collect_latest_data(
+    devices_api, device_uids: Iterable[str], max_workers: int = 8, **filters: str
+) -> TelemetryBatch:
+    """
+    Fetch latest data for many devices concurrently and build a TelemetryBatch.
+
+    Devices that do not exist are recorded in ``TelemetryBatch.not_found`` and
+    appear as fully masked columns; any other error is raised.
+
+    :param devices_api: A DevicesAPI instance
+    :param device_uids: UIDs of the devices to fetch
+    :param max_workers: Maximum number of concurrent requests
+    :param filters: Filters passed to every latest data request
+    :return: TelemetryBatch instance
+    """
+    _require_numpy()
+    uids = list(dict.fromkeys(device_uids))
+
+    def fetch(uid):
+        try:
+            return devices_api.get_latest_data_by_uid(uid, **filters)
+        except ResourceNotFoundError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        payloads = dict(zip(uids, executor.map(fetch, uids)))
+    return TelemetryBatch.from_payloads(payloads)
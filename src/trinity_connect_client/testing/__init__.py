@@ -0,0 +1,7 @@
+"""
+Utilities for testing and benchmarking code that uses the Connect client.
+"""
+
+from .standin import StandInServer
+
+__all__ = ["StandInServer"]
@@ -0,0 +1,468 @@
+"""
+Local stand-in for the Connect API, for benchmarks and integration tests.
+"""
+
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from trinity_connect_client.compression import decode_json_body
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent load
+    request_queue_size = 128
+    connections_accepted = 0
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections_accepted += 1
+        return request
+
+
+class StandInServer:
+    """
+    Serves a synthetic fleet over HTTP on localhost using the Connect API
+    routes used by this client: devices by ID, UID and folder (including
+    latest data, events, commands and command sends) and companies and
+    folders.
+
+    ``devices`` devices are spread over ``folders`` folders of a single
+    company. Folder, event and command listings are paginated with
+    ``page_size`` records per page. Every response is delayed by ``latency``
+    seconds plus up to ``latency_jitter`` seconds, and a fraction
+    ``error_rate`` of requests fail with ``error_status``. Requests without
+    the expected bearer token are rejected with 401 when ``token`` is set.
+    With ``compress``, responses of at least 1 KiB are gzipped for clients
+    accepting gzip. Gzip and deflate request bodies are always accepted.
+    Keep-alive connections idle for ``idle_timeout`` seconds are closed.
+
+    Use it as a context manager, or call start() and stop()::
+
+        with StandInServer(devices=1000, latency=0.01) as server:
+            client = server.client()
+            client.devices.get_by_uid("dev-000001")
+    """
+
+    api_prefix = "/api/v4/"
+
+    def __init__(
+        self,
+        devices: int = 1000,
+        folders: int = 10,
+        events_per_device: int = 50,
+        page_size: int = 100,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        token: Optional[str] = "standin-token",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+        compress: bool = False,
+        idle_timeout: Optional[float] = None,
+    ):
+        if devices < 1 or folders < 1:
+            raise ValueError("Devices and folders must be positive integers")
+        if page_size < 1:
+            raise ValueError("Page size must be a positive integer")
+        if not 0 <= error_rate <= 1:
+            raise ValueError("Error rate must be between 0 and 1")
+
+        self.devices = devices
+        self.folders = folders
+        self.events_per_device = events_per_device
+        self.page_size = page_size
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.token = token
+        self.compress = compress
+        self.idle_timeout = idle_timeout
+        self.request_count = 0
+        self.commands_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = _HTTPServer((host, port), self._handler_class())
+        self.started_at = time.time()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        """URL to pass to ConnectClient as ``base_url``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def client(self, **config):
+        """
+        Create a ConnectClient for this server.
+
+        :param config: Further ConnectClient configuration
+        :return: ConnectClient instance
+        """
+        from trinity_connect_client import ConnectClient
+
+        config.setdefault("token", self.token or "standin-token")
+        return ConnectClient(base_url=self.base_url, api_version="v4", **config)
+
+    def start(self):
+        """Serve requests on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name="connect-standin", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def handle(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+    ) -> Tuple[int, Any]:
+        """
+        Answer a request in process, without HTTP. Use it as the handler of an
+        InMemoryTransport to benchmark the client without network overhead::
+
+            client = server.client(transport=InMemoryTransport(server.handle))
+
+        :param method: HTTP method
+        :param url: Request URL
+        :param headers: Request headers
+        :param params: Query parameters
+        :param json: JSON request body
+        :return: Status code and decoded response body
+        """
+        if params:
+            query = urlencode({k: v for k, v in params.items() if v is not None})
+            url = f"{url}{'&' if '?' in url else '?'}{query}"
+        return self._respond(method, url, headers or {}, json)
+
+    # Synthetic records
+
+    @property
+    def connections_accepted(self) -> int:
+        """Number of TCP connections accepted so far."""
+        return self._httpd.connections_accepted
+
+    def uid(self, device_id: int) -> str:
+        return f"dev-{device_id:06d}"
+
+    def _device_id_for_uid(self, uid: str) -> Optional[int]:
+        match = re.fullmatch(r"dev-(\d+)", uid)
+        if match and 1 <= int(match.group(1)) <= self.devices:
+            return int(match.group(1))
+        return None
+
+    def _folder_of(self, device_id: int) -> int:
+        return (device_id - 1) % self.folders + 1
+
+    def device(self, device_id: int) -> Dict[str, Any]:
+        base = f"{self.base_url}{self.api_prefix}"
+        uid = self.uid(device_id)
+        folder_id = self._folder_of(device_id)
+        device_url = f"{base}devices/uid/{uid}/"
+        return {
+            "id": device_id,
+            "url": f"{base}devices/{device_id}/",
+            "name": f"Device {device_id}",
+            "description": "",
+            "state": 52,
+            "t_type": 1,
+            "tpp_id": None,
+            "company": 1,
+            "folder": folder_id,
+            "state_display": "Active",
+            "t_type_display": "Sensor",
+            "company_name": "Stand-in Company",
+            "folder_name": f"Folder {folder_id}",
+            "company_url": f"{base}orgs/company/1/",
+            "folder_url": f"{base}orgs/folder/{folder_id}/",
+            "aux_values_url": f"{device_url}aux/",
+            "uid": uid,
+            "imei": f"35{device_id:013d}",
+            "imei2": "",
+            "serial_number": f"SN{device_id:08d}",
+            "comm_interval_contract": 300,
+            "comm_state": 1,
+            "comm_state_display": "Online",
+            "youngest_comm_timestamp": time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started_at)
+            ),
+            "command_model": 1,
+            "data_lens": 1,
+            "event_lens": None,
+            "profile": None,
+            "commands_url": f"{device_url}commands/",
+            "latest_data_url": f"{device_url}data/latest/",
+            "events_url": f"{device_url}events/",
+            "meta_url": f"{device_url}meta/",
+            "geo_url": f"{device_url}geo/",
+            "category_url": f"{device_url}category/",
+            "tags_url": f"{device_url}tags/",
+        }
+
+    def _device_lite(self, device_id: int) -> Dict[str, Any]:
+        device = self.device(device_id)
+        fields = ("id", "url", "name", "uid", "imei", "serial_number", "state")
+        return {**{k: device[k] for k in fields}, "folder": device["folder"]}
+
+    def _latest_data(self, device_id: int) -> Dict[str, Any]:
+        # Changes every five minutes, like a device reporting on its contract
+        tick = int(time.time() // 300)
+        return {
+            "timestamp": tick * 300,
+            "temp": 20 + (device_id + tick) % 10,
+            "battery": {"v": round(3.3 + (device_id % 10) / 20, 2)},
+            "rssi": -60 - device_id % 40,
+        }
+
+    def _events(self, device_id: int) -> List[Dict[str, Any]]:
+        start = int(self.started_at) - self.events_per_device * 60
+        return [
+            {
+                "id": device_id * 100000 + n,
+                "timestamp": start + n * 60,
+                "event": "heartbeat",
+            }
+            for n in range(self.events_per_device)
+        ]
+
+    def _commands(self, device_id: int) -> List[Dict[str, Any]]:
+        return [
+            {"id": device_id * 1000 + n, "rpc": "ping", "args": [], "status": 2}
+            for n in range(3)
+        ]
+
+    def _folder(self, folder_id: int) -> Dict[str, Any]:
+        base = f"{self.base_url}{self.api_prefix}"
+        return {
+            "id": folder_id,
+            "url": f"{base}orgs/folder/{folder_id}/",
+            "name": f"Folder {folder_id}",
+            "path": f"root.{folder_id}",
+            "human_path": f"Stand-in Company / Folder {folder_id}",
+            "parent": None,
+            "url_sims": f"{base}orgs/folder/{folder_id}/sims/",
+            "url_devices": f"{base}devices/folder/{folder_id}/",
+            "tree_id": 1,
+        }
+
+    def _company(self) -> Dict[str, Any]:
+        base = f"{self.base_url}{self.api_prefix}orgs/company/1/"
+        urls = (
+            "url_profile",
+            "folder_url",
+            "url_folder_tree",
+            "url_sims",
+            "url_devices",
+            "url_budgets",
+            "url_access",
+            "url_tags",
+            "url_contracts",
+            "url_adaptations",
+        )
+        return {
+            "id": 1,
+            "url": base,
+            "name": "Stand-in Company",
+            "state": 1,
+            "state_display": "Active",
+            "is_ee": False,
+            "apn_urls": [],
+            **{name: f"{base}{name.removeprefix('url_')}/" for name in urls},
+        }
+
+    # Request handling
+
+    def _paginate(self, path: str, query, records: List[Any]) -> Dict[str, Any]:
+        page = int(query.get("page", ["1"])[0])
+        page_size = int(query.get("page_size", [self.page_size])[0])
+        start = (page - 1) * page_size
+        next_url = None
+        if start + page_size < len(records):
+            params = {k: v[0] for k, v in query.items()}
+            params["page"] = page + 1
+            next_url = f"{self.base_url}{path}?{urlencode(params)}"
+        return {
+            "count": len(records),
+            "next": next_url,
+            "previous": None,
+            "results": records[start : start + page_size],
+        }
+
+    def _match_device(self, route: str, suffix: str) -> Tuple[bool, Optional[int]]:
+        match = re.fullmatch(rf"devices/(?:(\d+)|uid/([^/]+))/{suffix}", route)
+        if not match:
+            return False, None
+        if match.group(1):
+            device_id = int(match.group(1))
+            return True, device_id if 1 <= device_id <= self.devices else None
+        return True, self._device_id_for_uid(match.group(2))
+
+    def _route(self, method: str, path: str, query, body: Any) -> Tuple[int, Any]:
+        if not path.startswith(self.api_prefix):
+            return 404, {"detail": "Not found."}
+        route = path[len(self.api_prefix) :]
+
+        if method == "POST":
+            _, device_id = self._match_device(route, "command/send/")
+            if device_id is None:
+                return 404, {"detail": "Not found."}
+            with self._lock:
+                self.commands_sent += 1
+            return 200, {"status": "queued", "device": device_id}
+
+        matched, device_id = self._match_device(route, "")
+        if matched:
+            if device_id is None:
+                return 404, {"detail": "Not found."}
+            if method == "PATCH" and isinstance(body, dict):
+                return 200, {**self.device(device_id), **body}
+            return 200, self.device(device_id)
+        if method != "GET":
+            return 404, {"detail": "Not found."}
+
+        resources = "data/latest/|events/|commands/"
+        match = re.fullmatch(rf"devices/uid/([^/]+)/({resources})", route)
+        if match:
+            device_id = self._device_id_for_uid(match.group(1))
+            if device_id is None:
+                return 404, {"detail": "Not found."}
+            resource = match.group(2)
+            if resource == "data/latest/":
+                return 200, self._latest_data(device_id)
+            if resource == "commands/":
+                return 200, self._paginate(path, query, self._commands(device_id))
+            events = self._events(device_id)
+            if "start" in query or "end" in query:
+                start = _epoch(query.get("start", [None])[0], float("-inf"))
+                end = _epoch(query.get("end", [None])[0], float("inf"))
+                events = [e for e in events if start <= e["timestamp"] < end]
+            return 200, self._paginate(path, query, events)
+
+        match = re.fullmatch(r"devices/folder/(\d+)/(lite/)?", route)
+        if match:
+            folder_id = int(match.group(1))
+            if not 1 <= folder_id <= self.folders:
+                return 404, {"detail": "Not found."}
+            build = self._device_lite if match.group(2) else self.device
+            records = [
+                build(device_id)
+                for device_id in range(folder_id, self.devices + 1, self.folders)
+            ]
+            return 200, self._paginate(path, query, records)
+
+        if route == "orgs/company/1/":
+            return 200, self._company()
+        if route == "orgs/folders/company/1/":
+            folders = [self._folder(i) for i in range(1, self.folders + 1)]
+            return 200, self._paginate(path, query, folders)
+        match = re.fullmatch(r"orgs/folder/(\d+)/", route)
+        if match and 1 <= int(match.group(1)) <= self.folders:
+            return 200, self._folder(int(match.group(1)))
+        return 404, {"detail": "Not found."}
+
+    def _respond(
+        self, method: str, target: str, headers, body: Any = None
+    ) -> Tuple[int, Any]:
+        with self._lock:
+            self.request_count += 1
+            fail = self.error_rate and self._random.random() < self.error_rate
+            delay = self.latency + self.latency_jitter * self._random.random()
+        if delay:
+            time.sleep(delay)
+        if self.token and headers.get("Authorization") != f"Bearer {self.token}":
+            return 401, {"detail": "Invalid token."}
+        if fail:
+            return self.error_status, {"detail": "Stand-in error."}
+        parts = urlsplit(target)
+        return self._route(method, parts.path, parse_qs(parts.query), body)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            timeout = server.idle_timeout
+            # Headers and body are written separately; without TCP_NODELAY the
+            # body of a keep-alive response waits for the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def _handle(self, method, head=False):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = decode_json_body(
+                        self.rfile.read(length), self.headers.get("Content-Encoding")
+                    )
+                except (ValueError, OSError, zlib.error):
+                    request = None
+                status, body = server._respond(method, self.path, self.headers, request)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                accepted = self.headers.get("Accept-Encoding") or ""
+                if (
+                    server.compress
+                    and len(payload) >= 1024
+                    and "gzip" in accepted.lower()
+                ):
+                    payload = gzip.compress(payload, compresslevel=6, mtime=0)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if not head:
+                    self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_HEAD(self):
+                self._handle("GET", head=True)
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _epoch(value: Optional[str], default: float) -> float:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
@@ -0,0 +1,310 @@
+"""
+Fixed-capacity, array-backed store of polled telemetry history.
+
+NumPy is an optional dependency, install it with the ``numpy`` extra:
+``pip install trinity-connect-client[numpy]``.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from trinity_connect_client.telemetry import _require_numpy, flatten_metrics
+
+# Metrics kept per device unless configured otherwise
+DEFAULT_MAX_METRICS = 64
+
+
+class _Ring:
+    """
+    Circular buffer of timestamps with one value column per metric.
+
+    Columns are preallocated at full capacity when a metric first appears and
+    hold NaN for samples that did not report the metric.
+    """
+
+    def __init__(self, capacity: int):
+        np = _require_numpy()
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.columns: Dict[str, Any] = {}
+        self.head = 0
+        self.size = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + sum(c.nbytes for c in self.columns.values())
+
+    @property
+    def latest(self) -> Optional[float]:
+        if not self.size:
+            return None
+        return float(self.timestamps[(self.head - 1) % self.capacity])
+
+    def append(
+        self, timestamp: float, metrics: Dict[str, float], max_metrics: Optional[int]
+    ):
+        np = _require_numpy()
+        pos = self.head
+        self.timestamps[pos] = timestamp
+        for name, column in self.columns.items():
+            column[pos] = metrics.get(name, np.nan)
+        for name, value in metrics.items():
+            if name in self.columns:
+                continue
+            if max_metrics is not None and len(self.columns) >= max_metrics:
+                continue
+            column = self.columns[name] = np.full(self.capacity, np.nan)
+            column[pos] = value
+        self.head = (pos + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _ordered(self, array):
+        np = _require_numpy()
+        if self.size < self.capacity:
+            return array[: self.size]
+        return np.concatenate((array[self.head :], array[: self.head]))
+
+    def window(self, metric: str, start: Optional[float], end: Optional[float]):
+        np = _require_numpy()
+        column = self.columns.get(metric)
+        if column is None:
+            return np.empty(0), np.empty(0)
+        timestamps = self._ordered(self.timestamps)
+        values = self._ordered(column)
+        lo, hi = 0, len(timestamps)
+        if start is not None:
+            lo = np.searchsorted(timestamps, start, "left")
+        if end is not None:
+            hi = np.searchsorted(timestamps, end, "right")
+        timestamps, values = timestamps[lo:hi], values[lo:hi]
+        reported = ~np.isnan(values)
+        return timestamps[reported], values[reported]
+
+
+class _Rollup:
+    """Running sums of the samples in the current rollup bucket."""
+
+    def __init__(self, bucket: float):
+        self.bucket = bucket
+        self.sums: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, metrics: Dict[str, float]):
+        for name, value in metrics.items():
+            self.sums[name] = self.sums.get(name, 0.0) + value
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def means(self) -> Dict[str, float]:
+        return {name: total / self.counts[name] for name, total in self.sums.items()}
+
+
+class _Series:
+    __slots__ = ("samples", "rollups", "rollup")
+
+    def __init__(self, capacity: int, rollup_capacity: Optional[int]):
+        self.samples = _Ring(capacity)
+        self.rollups = _Ring(rollup_capacity) if rollup_capacity else None
+        self.rollup: Optional[_Rollup] = None
+
+
+class TelemetryStore:
+    """
+    Keeps the most recent ``capacity`` samples of every metric of every device.
+
+    Each device holds a timestamp array and one float64 array per metric, all
+    preallocated at ``capacity``; once full, the oldest samples are
+    overwritten. Memory use is therefore ``8 * capacity * (1 + metrics)``
+    bytes per device, and ``max_metrics``, 64 by default, bounds the number of
+    metrics kept per device; metrics first seen once a device has that many
+    are not stored. Pass None to keep every metric, with memory growing with
+    the number of distinct metrics reported. Nested payloads are flattened
+    with flatten_metrics.
+
+    With ``rollup_interval`` the mean of every metric over consecutive
+    intervals is also kept, in a second buffer of ``rollup_capacity`` entries,
+    so that a longer history is available at a lower resolution.
+
+    Samples of a device must be appended in timestamp order.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        max_metrics: Optional[int] = DEFAULT_MAX_METRICS,
+        rollup_interval: Optional[float] = None,
+        rollup_capacity: int = 1024,
+    ):
+        _require_numpy("the telemetry store")
+        if capacity < 1:
+            raise ValueError("Capacity must be a positive integer")
+        if max_metrics is not None and max_metrics < 1:
+            raise ValueError("Max metrics must be a positive integer")
+        if rollup_interval is not None and rollup_interval <= 0:
+            raise ValueError("Rollup interval must be positive")
+        self.capacity = capacity
+        self.max_metrics = max_metrics
+        self.rollup_interval = rollup_interval
+        self.rollup_capacity = rollup_capacity
+        self._lock = threading.Lock()
+        self._series: Dict[str, _Series] = {}
+
+    def __len__(self):
+        return len(self._series)
+
+    def __contains__(self, uid):
+        return uid in self._series
+
+    @property
+    def uids(self) -> List[str]:
+        return list(self._series)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the sample and rollup arrays of every device."""
+        with self._lock:
+            total = 0
+            for series in self._series.values():
+                total += series.samples.nbytes
+                if series.rollups is not None:
+                    total += series.rollups.nbytes
+            return total
+
+    def metrics(self, uid: str) -> List[str]:
+        """
+        Names of the metrics stored for a device.
+
+        :param uid: The UID of the device
+        :return: List of metric names
+        """
+        series = self._series.get(uid)
+        return list(series.samples.columns) if series else []
+
+    def append(self, uid: str, timestamp: float, data: Dict[str, Any]):
+        """
+        Store a sample of a device.
+
+        :param uid: The UID of the device
+        :param timestamp: Unix timestamp of the sample
+        :param data: Device data payload or flat mapping of metric to value
+        """
+        metrics = flatten_metrics(data)
+        with self._lock:
+            series = self._series.get(uid)
+            if series is None:
+                rollup_capacity = self.rollup_capacity if self.rollup_interval else None
+                series = self._series[uid] = _Series(self.capacity, rollup_capacity)
+
+            latest = series.samples.latest
+            if latest is not None and timestamp < latest:
+                raise ValueError("Samples must be appended in timestamp order")
+            series.samples.append(timestamp, metrics, self.max_metrics)
+
+            if series.rollups is not None:
+                bucket = timestamp // self.rollup_interval * self.rollup_interval
+                rollup = series.rollup
+                if rollup is not None and rollup.bucket != bucket:
+                    series.rollups.append(
+                        rollup.bucket, rollup.means(), self.max_metrics
+                    )
+                    rollup = None
+                if rollup is None:
+                    rollup = series.rollup = _Rollup(bucket)
+                rollup.add(metrics)
+
+    def add_result(self, result):
+        """
+        Store the data of a poll result, e.g. as a TelemetryPoller callback.
+
+        :param result: PollResult whose data is a device data payload
+        """
+        if isinstance(result.data, dict):
+            self.append(result.uid, result.polled_at, result.data)
+
+    def remove(self, uid: str):
+        with self._lock:
+            self._series.pop(uid, None)
+
+    def last(self, uid: str, metric: str) -> Optional[Tuple[float, float]]:
+        """
+        Most recent reported value of a metric.
+
+        :param uid: The UID of the device
+        :param metric: Metric name
+        :return: (timestamp, value), or None if the metric was never reported
+        """
+        timestamps, values = self.window(uid, metric)
+        if not len(values):
+            return None
+        return float(timestamps[-1]), float(values[-1])
+
+    def window(
+        self,
+        uid: str,
+        metric: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ):
+        """
+        Reported values of a metric between two timestamps, inclusive.
+
+        :param uid: The UID of the device
+        :param metric: Metric name
+        :param start: Earliest timestamp, defaults to the oldest sample
+        :param end: Latest timestamp, defaults to the newest sample
+        :return: (timestamps, values) arrays in chronological order
+        """
+        np = _require_numpy()
+        with self._lock:
+            series = self._series.get(uid)
+            if series is None:
+                return np.empty(0), np.empty(0)
+            return series.samples.window(metric, start, end)
+
+    def rate(
+        self,
+        uid: str,
+        metric: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> float:
+        """
+        Average rate of change of a metric per second over a window.
+
+        :param uid: The UID of the device
+        :param metric: Metric name
+        :param start: Earliest timestamp, defaults to the oldest sample
+        :param end: Latest timestamp, defaults to the newest sample
+        :return: Change per second, NaN with fewer than two samples
+        """
+        timestamps, values = self.window(uid, metric, start, end)
+        if len(values) < 2 or timestamps[-1] == timestamps[0]:
+            return float("nan")
+        return float((values[-1] - values[0]) / (timestamps[-1] - timestamps[0]))
+
+    def rollups(
+        self,
+        uid: str,
+        metric: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ):
+        """
+        Per-interval means of a metric between two timestamps, inclusive.
+
+        Only completed intervals are returned; the interval a device is
+        currently reporting in is added once a later sample arrives.
+
+        :param uid: The UID of the device
+        :param metric: Metric name
+        :param start: Earliest interval start, defaults to the oldest interval
+        :param end: Latest interval start, defaults to the newest interval
+        :return: (interval starts, means) arrays in chronological order
+        """
+        np = _require_numpy()
+        if self.rollup_interval is None:
+            raise ValueError("Rollups require a rollup_interval")
+        with self._lock:
+            series = self._series.get(uid)
+            if series is None:
+                return np.empty(0), np.empty(0)
+            return series.rollups.window(metric, start, end)
@@ -0,0 +1,83 @@
+"""
+Pluggable HTTP transports for the Connect client.
+
+A transport sends one request and returns a Response holding the status
+code, headers, body bytes and elapsed time. Pass one to ConnectClient as
+``transport``, or name one of TRANSPORTS; without one, a RequestsTransport
+over a pooled session is used. Async transports are used with
+AsyncConnectClient.
+
+Transport classes are imported on first use, so that importing this package
+does not import the HTTP libraries behind them.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+from .base import AsyncTransport, Response, Transport
+
+if TYPE_CHECKING:
+    from .httpx_transport import AsyncHTTPXTransport, HTTPXTransport
+    from .memory import AsyncInMemoryTransport, InMemoryTransport
+    from .sync import RequestsTransport, Urllib3Transport
+
+# Transport class name -> module defining it
+_LAZY = {
+    "AsyncHTTPXTransport": ".httpx_transport",
+    "AsyncInMemoryTransport": ".memory",
+    "HTTPXTransport": ".httpx_transport",
+    "InMemoryTransport": ".memory",
+    "RequestsTransport": ".sync",
+    "Urllib3Transport": ".sync",
+}
+
+# Transports that can be selected by name: class name and options
+TRANSPORTS = {
+    "requests": ("RequestsTransport", {}),
+    "urllib3": ("Urllib3Transport", {}),
+    "httpx": ("HTTPXTransport", {}),
+    "http2": ("HTTPXTransport", {"http2": True}),
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY])
+
+
+def create_transport(name: str) -> Transport:
+    """
+    Create one of the TRANSPORTS by name.
+
+    :param name: Transport name, e.g. "urllib3"
+    :return: Transport instance
+    """
+    if name not in TRANSPORTS:
+        raise ValueError(
+            f"Unknown transport {name!r}, choose from {', '.join(TRANSPORTS)}"
+        )
+    class_name, options = TRANSPORTS[name]
+    return __getattr__(class_name)(**options)
+
+
+__all__ = [
+    "AsyncHTTPXTransport",
+    "AsyncInMemoryTransport",
+    "AsyncTransport",
+    "HTTPXTransport",
+    "InMemoryTransport",
+    "RequestsTransport",
+    "Response",
+    "TRANSPORTS",
+    "Transport",
+    "Urllib3Transport",
+    "create_transport",
+]
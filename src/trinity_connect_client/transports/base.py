@@ -0,0 +1,160 @@
+"""
+Transport interface: one request in, one Response out.
+"""
+
+import json as jsonlib
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+_UNSET = object()
+
+
+class Response:
+    """
+    Response returned by transports: the status code, headers, body bytes and
+    ``elapsed`` seconds taken to receive it. ``wire_bytes`` is the size of the
+    body as received, before any decompression, when the transport knows it.
+    Replayed and in-memory responses may hold an already decoded body instead,
+    which is encoded to bytes only when ``content`` is read.
+    """
+
+    __slots__ = ("status_code", "headers", "elapsed", "wire_bytes", "_content", "_body")
+
+    def __init__(
+        self,
+        status_code: int,
+        body: Any = _UNSET,
+        headers: Optional[Mapping[str, str]] = None,
+        content: Optional[bytes] = None,
+        elapsed: float = 0.0,
+        wire_bytes: Optional[int] = None,
+    ):
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {}
+        self.elapsed = elapsed
+        self.wire_bytes = wire_bytes
+        self._content = content
+        self._body = body
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            if self._body is _UNSET:
+                self._content = b""
+            elif isinstance(self._body, str):
+                self._content = self._body.encode()
+            else:
+                self._content = jsonlib.dumps(self._body).encode()
+        return self._content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        if self._body is _UNSET:
+            return jsonlib.loads(self.content)
+        if isinstance(self._body, str):
+            return jsonlib.loads(self._body)
+        return self._body
+
+
+class Transport:
+    """Base class for transports."""
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+    ) -> Response:
+        """
+        Send a request.
+
+        :param method: HTTP method, e.g. "GET"
+        :param url: Full request URL
+        :param headers: Request headers
+        :param params: Query parameters
+        :param json: JSON request body
+        :param data: Encoded request body, sent instead of ``json`` with
+            headers describing its encoding
+        :return: Response
+        """
+        raise NotImplementedError("Subclasses must implement send")
+
+    def warmup(
+        self, url: str, connections: int = 1, probe: bool = False
+    ) -> Tuple[int, int]:
+        """
+        Open and verify pooled connections to the host of a URL ahead of
+        requests, replacing connections the server has closed. Transports
+        without a connection pool have nothing to warm.
+
+        :param url: URL on the host to connect to
+        :param connections: Number of connections to have ready
+        :param probe: Also send a HEAD request for the URL over connections
+            that were already open, resetting the server's idle timer
+        :return: Number of connections ready and number newly opened
+        """
+        return 0, 0
+
+    def after_fork(self):
+        """
+        Called in a forked child before the transport is used there, see
+        ConnectClient. Pooled connections inherited from the parent must not be
+        reused, as their sockets are shared with the parent, and locks may have
+        been held by the parent's other threads. Replace both; new connections
+        are opened on first use.
+
+        Inherited connections may be dropped or closed. Closing one in the child
+        only releases the child's file descriptor and sends nothing to the
+        server, so the parent's connection stays open; shutting its socket down
+        would not, and must be avoided.
+        """
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncTransport:
+    """Base class for transports used from asyncio, see AsyncConnectClient."""
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+    ) -> Response:
+        """
+        Send a request.
+
+        :param method: HTTP method, e.g. "GET"
+        :param url: Full request URL
+        :param headers: Request headers
+        :param params: Query parameters
+        :param json: JSON request body
+        :param data: Encoded request body, sent instead of ``json`` with
+            headers describing its encoding
+        :return: Response
+        """
+        raise NotImplementedError("Subclasses must implement send")
+
+    async def aclose(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
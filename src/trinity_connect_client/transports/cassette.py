@@ -0,0 +1,284 @@
+"""
+Recording and replay of Connect API traffic.
+
+Cassettes are gzip-compressed JSON Lines files: a header line followed by one
+line per request holding its start offset, duration, method, URL, query
+parameters, JSON body, response status and decoded response body. Bearer
+tokens and sensitive query parameters are scrubbed before anything is written.
+"""
+
+import gzip
+import json as jsonlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+from trinity_connect_client.compression import decode_json_body
+from trinity_connect_client.transports import RequestsTransport, Response, Transport
+
+CASSETTE_VERSION = 1
+SCRUBBED = "<scrubbed>"
+# Query parameters whose values are never recorded
+SENSITIVE_PARAMS = frozenset(
+    {"token", "access_token", "api_key", "apikey", "key", "password", "secret"}
+)
+
+
+class ReplayMissError(LookupError):
+    """Raised when a replayed request has no recorded response."""
+
+
+def _scrub_params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not params:
+        return params
+    return {
+        k: SCRUBBED if str(k).lower() in SENSITIVE_PARAMS else v
+        for k, v in params.items()
+    }
+
+
+def _request_key(
+    method: str, url: str, params: Optional[Dict[str, Any]], body: Any
+) -> Tuple:
+    # Scheme and host are ignored so cassettes replay against any base URL
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(str(k), str(v)) for k, v in (params or {}).items()]
+    query = [(k, SCRUBBED if k.lower() in SENSITIVE_PARAMS else v) for k, v in query]
+    if body is not None:
+        body = jsonlib.dumps(body, sort_keys=True, default=str)
+    return method.upper(), parts.path, tuple(sorted(query)), body
+
+
+def load_cassette(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Read a cassette file.
+
+    :param path: Cassette path
+    :return: The header and the list of recorded interactions in order
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        lines = [jsonlib.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("cassette") != CASSETTE_VERSION:
+        raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+    return lines[0], lines[1:]
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests through another transport, requests by default, and
+    records every request and response to a cassette file.
+
+    Call close(), or use the transport as a context manager, to finish the
+    file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        transport: Optional[Transport] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.path = path
+        self.transport = transport or RequestsTransport()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._started = clock()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write(
+            {
+                "cassette": CASSETTE_VERSION,
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, record: Dict[str, Any], secrets: Tuple[str, ...] = ()):
+        line = jsonlib.dumps(record, separators=(",", ":"), default=str)
+        for secret in secrets:
+            line = line.replace(secret, SCRUBBED)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def send(self, method, url, headers=None, params=None, json=None, data=None):
+        # Encoded bodies are recorded decoded, and sent on as they are
+        payload = {"json": json} if data is None else {"data": data}
+        if data is not None:
+            json = decode_json_body(data, (headers or {}).get("Content-Encoding"))
+        started = self._clock()
+        record = {
+            "t": round(started - self._started, 6),
+            "method": method,
+            "url": url,
+            "params": _scrub_params(params) or None,
+            "json": json,
+        }
+        try:
+            response = self.transport.send(
+                method, url, headers=headers, params=params, **payload
+            )
+        except Exception as e:
+            record["elapsed"] = round(self._clock() - started, 6)
+            record["error"] = type(e).__name__
+            self._write(record, _secrets(url, headers, params))
+            raise
+        record["elapsed"] = round(self._clock() - started, 6)
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = getattr(response, "text", None)
+        record["status"] = response.status_code
+        record["body"] = body
+        self._write(record, _secrets(url, headers, params))
+        return Response(response.status_code, body)
+
+    def warmup(self, url, connections=1, probe=False):
+        return self.transport.warmup(url, connections, probe)
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+        self.transport.after_fork()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.transport.close()
+
+
+def _secrets(
+    url: str, headers: Optional[Dict[str, str]], params: Optional[Dict[str, Any]]
+) -> Tuple[str, ...]:
+    # The bearer token and sensitive parameter values, which responses may echo
+    # back, e.g. in pagination links
+    secrets = []
+    authorization = (headers or {}).get("Authorization", "")
+    if authorization:
+        scheme, _, credentials = authorization.partition(" ")
+        secrets.append(credentials or scheme)
+    query = parse_qsl(urlsplit(url).query) + list((params or {}).items())
+    for key, value in query:
+        if str(key).lower() in SENSITIVE_PARAMS:
+            secrets.append(str(value))
+    # Very short values would scrub unrelated text
+    return tuple(secret for secret in secrets if len(secret) >= 4)
+
+
+class ReplayTransport(Transport):
+    """
+    Serves the responses recorded in a cassette instead of sending requests.
+
+    Requests are matched on method, URL path, query parameters and JSON body;
+    identical requests receive their recorded responses in order, the last one
+    being repeated once the others are used. With ``speed`` every response is
+    delayed by its recorded duration divided by ``speed``, so 1.0 replays at
+    the original speed and 2.0 twice as fast; by default there is no delay.
+    Requests without a recording raise ReplayMissError.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        speed: Optional[float] = None,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError("Speed must be positive")
+        self.path = path
+        self.speed = speed
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple, Deque[Dict[str, Any]]] = {}
+        _, interactions = load_cassette(path)
+        for interaction in interactions:
+            key = _request_key(
+                interaction["method"],
+                interaction["url"],
+                interaction.get("params"),
+                interaction.get("json"),
+            )
+            self._queues.setdefault(key, deque()).append(interaction)
+
+    def send(self, method, url, headers=None, params=None, json=None, data=None):
+        if data is not None:
+            json = decode_json_body(data, (headers or {}).get("Content-Encoding"))
+        key = _request_key(method, url, params, json)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise ReplayMissError(f"No recorded response for {method} {url}")
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+
+        if self.speed:
+            self._sleep(interaction.get("elapsed", 0) / self.speed)
+        if "error" in interaction:
+            raise ConnectionError(f"Recorded {interaction['error']}")
+        return Response(interaction["status"], interaction.get("body"))
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+
+def replay_workload(
+    path: str,
+    client,
+    speed: float = 1.0,
+    max_workers: int = 32,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> List[Dict[str, Any]]:
+    """
+    Re-issue the requests recorded in a cassette through a client, keeping
+    their original spacing divided by ``speed``, e.g. against a local
+    StandInServer. Recorded URLs are sent to the client's API host.
+
+    :param path: Cassette path
+    :param client: ConnectClient to send the requests with
+    :param speed: Replay speed factor, 2.0 replays twice as fast
+    :param max_workers: Maximum number of requests in flight
+    :param sleep: Function used to wait between requests
+    :return: Per request method, URL, status, elapsed seconds and error name
+    """
+    if speed <= 0:
+        raise ValueError("Speed must be positive")
+    _, interactions = load_cassette(path)
+    api = urlsplit(client.api_url)
+    sender = client.devices
+
+    def issue(interaction):
+        parts = urlsplit(interaction["url"])
+        url = urlunsplit((api.scheme, api.netloc, parts.path, parts.query, ""))
+        result = {"method": interaction["method"], "url": url, "status": None}
+        started = time.perf_counter()
+        try:
+            response = sender._send(
+                interaction["method"],
+                url,
+                sender._get_auth_headers(),
+                params=interaction.get("params"),
+                json=interaction.get("json"),
+            )
+            result["status"] = response.status_code
+        except Exception as e:
+            result["error"] = type(e).__name__
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    started = time.monotonic()
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for interaction in interactions:
+            delay = interaction["t"] / speed - (time.monotonic() - started)
+            if delay > 0:
+                sleep(delay)
+            futures.append(executor.submit(issue, interaction))
+    return [future.result() for future in futures]
@@ -0,0 +1,197 @@
+"""
+Transports over httpx, optionally multiplexing requests over HTTP/2.
+"""
+
+import threading
+import time
+import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .base import AsyncTransport, Response, Transport
+
+
+def _require_httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            "httpx is required for the HTTPX transports. "
+            "Install it with: pip install trinity-connect-client[httpx]"
+        ) from e
+    return httpx
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _HTTPXOptions:
+    """Options shared by the sync and async HTTPX transports."""
+
+    def _setup(self, http2: bool, max_streams: Optional[int]):
+        if max_streams is not None and max_streams < 1:
+            raise ValueError("Max streams must be a positive integer")
+        if http2 and not _h2_available():
+            warnings.warn(
+                "HTTP/2 needs the h2 package, falling back to HTTP/1.1. "
+                "Install it with: pip install trinity-connect-client[http2]",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+            http2 = False
+        self.http2 = http2
+        self.max_streams = max_streams
+        # Negotiated protocol of each response, e.g. {"HTTP/2": 95, "HTTP/1.1": 5}
+        self.http_versions = Counter()
+        self._versions_lock = threading.Lock()
+
+    def _client_options(self, httpx, timeout, max_connections, max_keepalive):
+        return {
+            "http2": self.http2,
+            "timeout": timeout,
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+            ),
+        }
+
+    def _response(self, response, started: float) -> Response:
+        version = getattr(response, "http_version", None)
+        if version:
+            with self._versions_lock:
+                self.http_versions[version] += 1
+        return Response(
+            response.status_code,
+            headers=response.headers,
+            content=response.content,
+            elapsed=time.perf_counter() - started,
+            wire_bytes=getattr(response, "num_bytes_downloaded", None),
+        )
+
+
+class HTTPXTransport(_HTTPXOptions, Transport):
+    """
+    Transport using an httpx Client, which may be shared between threads.
+
+    With ``http2`` requests are multiplexed as concurrent streams over a few
+    connections instead of needing one connection each. The protocol is
+    negotiated per connection, so servers without HTTP/2 are spoken to over
+    HTTP/1.1, as is everything when the h2 package is missing; the protocol
+    of each response is counted in ``http_versions``.
+
+    ``max_streams`` caps the requests in flight through the transport, making
+    callers wait for a free stream instead of piling streams onto connections
+    whose flow-control windows are already full; ``max_connections`` caps the
+    connections opened once the server's limit of concurrent streams per
+    connection is reached. Pass ``client`` to configure httpx yourself; a
+    given client is kept after a fork, so create the transport in the child.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        http2: bool = False,
+        timeout: Optional[float] = None,
+        max_streams: Optional[int] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+    ):
+        self._setup(http2, max_streams)
+        self._client_factory = None
+        if client is None:
+            httpx = _require_httpx()
+            options = self._client_options(
+                httpx, timeout, max_connections, max_keepalive_connections
+            )
+            self._client_factory = lambda: httpx.Client(**options)
+            client = self._client_factory()
+        self.client = client
+        self._streams = threading.BoundedSemaphore(max_streams) if max_streams else None
+
+    def send(self, method, url, headers=None, params=None, json=None, data=None):
+        if self._streams is not None:
+            self._streams.acquire()
+        try:
+            started = time.perf_counter()
+            response = self.client.request(
+                method, url, headers=headers, params=params, json=json, content=data
+            )
+            return self._response(response, started)
+        finally:
+            if self._streams is not None:
+                self._streams.release()
+
+    def warmup(self, url, connections=1, probe=False):
+        # httpx does not expose its pool, so connections are opened by
+        # concurrent HEAD requests; over HTTP/2 they share one connection
+        def head(_):
+            self.client.request("HEAD", url)
+            return 1
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            ready = sum(executor.map(head, range(connections)))
+        return ready, 0
+
+    def after_fork(self):
+        self._versions_lock = threading.Lock()
+        if self.max_streams:
+            self._streams = threading.BoundedSemaphore(self.max_streams)
+        if self._client_factory is not None:
+            self.client = self._client_factory()
+
+    def close(self):
+        self.client.close()
+
+
+class AsyncHTTPXTransport(_HTTPXOptions, AsyncTransport):
+    """
+    Async transport using an httpx AsyncClient, for AsyncConnectClient.
+
+    Options are as for HTTPXTransport.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        http2: bool = False,
+        timeout: Optional[float] = None,
+        max_streams: Optional[int] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+    ):
+        self._setup(http2, max_streams)
+        if client is None:
+            httpx = _require_httpx()
+            client = httpx.AsyncClient(
+                **self._client_options(
+                    httpx, timeout, max_connections, max_keepalive_connections
+                )
+            )
+        self.client = client
+        self._streams = None
+        if max_streams:
+            import asyncio
+
+            self._streams = asyncio.Semaphore(max_streams)
+
+    async def _send(self, method, url, headers, params, json, data):
+        started = time.perf_counter()
+        response = await self.client.request(
+            method, url, headers=headers, params=params, json=json, content=data
+        )
+        return self._response(response, started)
+
+    async def send(self, method, url, headers=None, params=None, json=None, data=None):
+        if self._streams is None:
+            return await self._send(method, url, headers, params, json, data)
+        async with self._streams:
+            return await self._send(method, url, headers, params, json, data)
+
+    async def aclose(self):
+        await self.client.aclose()
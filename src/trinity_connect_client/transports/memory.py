@@ -0,0 +1,71 @@
+"""
+In-memory transports, serving requests from a function in process.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Tuple, Union
+from urllib.parse import urlsplit
+
+from ..compression import decode_json_body
+from .base import AsyncTransport, Response, Transport
+
+Handler = Callable[..., Any]
+
+
+class InMemoryTransport(Transport):
+    """
+    Serves requests from a handler in process, without sockets or
+    serialisation, for tests and for benchmarking the client on its own.
+
+    ``handler`` is called as ``handler(method, url, headers, params, json)``
+    and returns a ``(status, body)`` tuple or a Response. Instead of a
+    function, a dictionary mapping ``(method, path)`` to such a result, or to
+    a handler, may be given; unknown routes get a 404. Decoded bodies are
+    passed to the client as they are, so handlers should return fresh objects.
+
+    StandInServer.handle can be used as a handler to serve its synthetic
+    fleet.
+    """
+
+    def __init__(self, handler: Union[Handler, Dict[Tuple[str, str], Any]]):
+        self.handler = handler
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    def _dispatch(self, method, url, headers, params, json):
+        handler = self.handler
+        if isinstance(handler, dict):
+            handler = handler.get((method, urlsplit(url).path), (404, None))
+        result = (
+            handler(method, url, headers, params, json)
+            if callable(handler)
+            else handler
+        )
+        if isinstance(result, Response):
+            return result
+        status, body = result
+        return Response(status, body, {"Content-Type": "application/json"})
+
+    def send(self, method, url, headers=None, params=None, json=None, data=None):
+        with self._lock:
+            self.request_count += 1
+        if data is not None:
+            json = decode_json_body(data, (headers or {}).get("Content-Encoding"))
+        return self._dispatch(method, url, headers, params, json)
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+
+class AsyncInMemoryTransport(AsyncTransport):
+    """InMemoryTransport for AsyncConnectClient."""
+
+    def __init__(self, handler: Union[Handler, Dict[Tuple[str, str], Any]]):
+        self._transport = InMemoryTransport(handler)
+
+    @property
+    def request_count(self) -> int:
+        return self._transport.request_count
+
+    async def send(self, method, url, headers=None, params=None, json=None, data=None):
+        return self._transport.send(method, url, headers, params, json, data)
@@ -0,0 +1,219 @@
+"""
+Transports over requests and over urllib3 directly.
+"""
+
+import json as jsonlib
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import requests
+import urllib3
+
+from ..compression import wire_bytes
+from .base import Response, Transport
+
+
+def _warm_pool(pool, url: str, connections: int, probe: bool) -> Tuple[int, int]:
+    """
+    Take up to ``connections`` connections out of a urllib3 pool, connect the
+    ones that are not connected, optionally probe the others, and put them
+    back. The pool closes connections the server dropped as they are taken.
+
+    urllib3 has no public API for this, so the pool's private _get_conn and
+    _put_conn are used, as its own urlopen does. A pool created with
+    ``block=True`` only gives out the connections it has idle, without waiting
+    for those in use.
+    """
+    path = urlsplit(url).path or "/"
+
+    def prepare(conn) -> int:
+        if conn.is_connected:
+            if not probe:
+                return 0
+            try:
+                conn.request("HEAD", path, headers={"Connection": "keep-alive"})
+                response = conn.getresponse()
+                response.read()
+                if response.headers.get("Connection", "").lower() != "close":
+                    return 0
+            except Exception:
+                pass
+            conn.close()
+        conn.connect()
+        return 1
+
+    taken = []
+    try:
+        for _ in range(min(connections, pool.pool.maxsize)):
+            try:
+                taken.append(pool._get_conn(timeout=0))
+            except urllib3.exceptions.EmptyPoolError:
+                break
+        if not taken:
+            return 0, 0
+        with ThreadPoolExecutor(max_workers=len(taken)) as executor:
+            opened = sum(executor.map(prepare, taken))
+        return len(taken), opened
+    finally:
+        for conn in taken:
+            pool._put_conn(conn)
+
+
+class RequestsTransport(Transport):
+    """
+    Transport using requests, through ``session`` when given so connections
+    are reused.
+
+    With ``per_thread`` each thread sends through a session of its own, so
+    that threads do not contend for one connection pool; sessions are
+    created on first use and released with their thread.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = None,
+        per_thread: bool = False,
+    ):
+        if per_thread and session is not None:
+            raise ValueError("Pass either a session or per_thread, not both")
+        self.session = session
+        self.timeout = timeout
+        self.per_thread = per_thread
+        self._local = threading.local()
+        self._sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+
+    def _session(self) -> Optional[requests.Session]:
+        if not self.per_thread:
+            return self.session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            self._sessions.add(session)
+        return session
+
+    def send(self, method, url, headers=None, params=None, json=None, data=None):
+        session = self._session()
+        sender = session if session is not None else requests
+        response = sender.request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            json=json,
+            data=data,
+            timeout=self.timeout,
+        )
+        # Read the body before asking urllib3 how many bytes it took
+        content = response.content
+        return Response(
+            response.status_code,
+            headers=response.headers,
+            content=content,
+            elapsed=response.elapsed.total_seconds(),
+            wire_bytes=wire_bytes(response.raw),
+        )
+
+    def warmup(self, url, connections=1, probe=False):
+        # Per-thread sessions are warmed for the calling thread
+        session = self._session()
+        if session is None:
+            # Without a session every request opens its own connection
+            return 0, 0
+        pool = session.get_adapter(url).poolmanager.connection_from_url(url)
+        return _warm_pool(pool, url, connections, probe)
+
+    def after_fork(self):
+        if self.per_thread:
+            # The sessions of the parent's threads are dropped, not closed
+            self._local = threading.local()
+            self._sessions = weakref.WeakSet()
+        elif self.session is not None:
+            # Fresh pools, as requests builds them when a session is unpickled
+            for adapter in self.session.adapters.values():
+                if isinstance(adapter, requests.adapters.HTTPAdapter):
+                    adapter.init_poolmanager(
+                        adapter._pool_connections,
+                        adapter._pool_maxsize,
+                        block=adapter._pool_block,
+                    )
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+        for session in list(self._sessions):
+            session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport using a urllib3 PoolManager directly, skipping the session,
+    adapter and hook layers of requests. Connections are kept alive and
+    pooled per host, up to ``maxsize`` idle connections each.
+
+    Requests are not retried and redirects are not followed.
+    """
+
+    def __init__(
+        self,
+        pool_manager: Optional[urllib3.PoolManager] = None,
+        timeout: Optional[float] = None,
+        maxsize: int = 10,
+    ):
+        # A pool manager created here is replaced after a fork, a given one
+        # is cleared, closing the child's copies of its connections
+        self._owns_pool_manager = pool_manager is None
+        if pool_manager is None:
+            pool_manager = urllib3.PoolManager(maxsize=maxsize, retries=False)
+        self.pool_manager = pool_manager
+        self.maxsize = maxsize
+        self.timeout = timeout
+
+    def send(self, method, url, headers=None, params=None, json=None, data=None):
+        if params:
+            query = urlencode(
+                [(k, v) for k, v in params.items() if v is not None], doseq=True
+            )
+            url = f"{url}{'&' if '?' in url else '?'}{query}"
+        body = data
+        if data is None and json is not None:
+            body = jsonlib.dumps(json).encode()
+            if not headers or "Content-Type" not in headers:
+                headers = {**(headers or {}), "Content-Type": "application/json"}
+
+        started = time.perf_counter()
+        response = self.pool_manager.request(
+            method,
+            url,
+            headers=headers,
+            body=body,
+            timeout=self.timeout,
+            retries=False,
+        )
+        return Response(
+            response.status,
+            headers=response.headers,
+            content=response.data,
+            elapsed=time.perf_counter() - started,
+            wire_bytes=wire_bytes(response),
+        )
+
+    def warmup(self, url, connections=1, probe=False):
+        pool = self.pool_manager.connection_from_url(url)
+        return _warm_pool(pool, url, connections, probe)
+
+    def after_fork(self):
+        if self._owns_pool_manager:
+            self.pool_manager = urllib3.PoolManager(maxsize=self.maxsize, retries=False)
+        else:
+            # The pool manager's configuration is not known, so it is kept and
+            # its pools closed; closing the inherited sockets in the child
+            # leaves the parent's connections open
+            self.pool_manager.clear()
+
+    def close(self):
+        self.pool_manager.clear()
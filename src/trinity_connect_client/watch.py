@@ -0,0 +1,141 @@
+"""
+Change feed over polled device data.
+"""
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+from trinity_connect_client.polling import PollResult, TelemetryPoller
+
+# Device fields compared by default
+DEFAULT_DEVICE_FIELDS = ("comm_state", "state")
+
+
+@dataclass
+class ChangeEvent:
+    """A single field of a device that changed between two polls."""
+
+    device: str
+    field: str
+    old: Any
+    new: Any
+    timestamp: float
+
+
+def flatten_fields(data: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Flatten a nested payload into dotted field names.
+
+    Unlike flatten_metrics every leaf value is kept; lists are compared as a
+    whole.
+
+    :param data: Payload dictionary
+    :param prefix: Prefix prepended to every field name
+    :return: Dictionary of field name to value
+    """
+    fields = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            fields.update(flatten_fields(value, prefix=f"{name}."))
+        else:
+            fields[name] = value
+    return fields
+
+
+class Watcher:
+    """
+    Yields a ChangeEvent for every field that changes between polls of a set
+    of devices, instead of their full payloads.
+
+    Latest data is polled by a TelemetryPoller and compared field by field
+    with the previous poll of the device; data fields are named ``data.`` plus
+    their dotted path. When ``device_fields`` is not empty every poll also
+    fetches the device record, bypassing the response cache, which keeps the
+    poller schedule up to date, and compares those fields, so each poll makes
+    two requests. Further ``options`` are passed to the TelemetryPoller, and
+    latest-data filters among them are applied to every poll. The first poll
+    of a device only establishes the baseline unless ``emit_initial`` is set.
+    """
+
+    def __init__(
+        self,
+        devices_api,
+        devices: Iterable[Dict[str, Any]],
+        fields: Optional[Iterable[str]] = None,
+        device_fields: Iterable[str] = DEFAULT_DEVICE_FIELDS,
+        emit_initial: bool = False,
+        **options: Any,
+    ):
+        self.devices_api = devices_api
+        self.fields = frozenset(fields) if fields is not None else None
+        self.device_fields = tuple(device_fields)
+        self.emit_initial = emit_initial
+        self._seen: Dict[str, Dict[str, Any]] = {}
+        self.poller = TelemetryPoller(
+            devices_api, devices, fetch=self._fetch, **options
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _fetch(self, uid: str) -> Dict[str, Any]:
+        snapshot = {}
+        if self.device_fields:
+            device = self.devices_api.get_by_uid(uid, cached=False)
+            self.poller.add(device)
+            for name in self.device_fields:
+                snapshot[name] = device.get(name)
+        data = self.devices_api.get_latest_data_by_uid(uid, **self.poller.filters)
+        if isinstance(data, dict):
+            snapshot.update(flatten_fields(data, prefix="data."))
+        else:
+            snapshot["data"] = data
+        return snapshot
+
+    def changes(self, result: PollResult) -> List[ChangeEvent]:
+        """
+        Compare a poll result with the previous one of the same device.
+
+        :param result: Poll result whose data is a field snapshot
+        :return: Events for the fields that changed
+        """
+        current = result.data
+        if self.fields is not None:
+            current = {k: v for k, v in current.items() if k in self.fields}
+
+        previous = self._seen.get(result.uid)
+        self._seen[result.uid] = current
+        if previous is None:
+            if not self.emit_initial:
+                return []
+            previous = {}
+
+        uid, timestamp = result.uid, result.polled_at
+        return [
+            ChangeEvent(uid, name, previous.get(name), current.get(name), timestamp)
+            for name in dict.fromkeys([*previous, *current])
+            if previous.get(name) != current.get(name)
+        ]
+
+    def __iter__(self) -> Iterator[ChangeEvent]:
+        for result in self.poller.results():
+            if result.changed:
+                yield from self.changes(result)
+
+    async def __aiter__(self) -> AsyncIterator[ChangeEvent]:
+        async for result in self.poller.stream():
+            if result.changed:
+                for event in self.changes(result):
+                    yield event
+
+    def stop(self):
+        """Stop iterating after the current poll."""
+        self.poller.stop()
+
+    def close(self):
+        """Stop polling and shut down the worker threads."""
+        self.poller.close()
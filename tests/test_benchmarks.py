@@ -0,0 +1,27 @@
+"""Smoke tests keeping the benchmark scripts runnable."""
+
+import importlib.util
+import os
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks")
+
+
+def _load(name):
+    """Import a benchmark script by path, benchmarks/ not being a package"""
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BENCHMARKS, f"{name}.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBenchOverhead:
+    def test_run(self):
+        """Test every call of the overhead benchmark completes"""
+        bench_overhead = _load("bench_overhead")
+
+        results = bench_overhead.run(number=1, repeat=1)
+
+        assert set(results) == set(bench_overhead.CALLS)
+        assert all(ns > 0 for ns in results.values())
@@ -0,0 +1,196 @@
+"""Tests for the response cache."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.cache import ResponseCache
+from trinity_connect_client.stats import ClientStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.001)
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache"""
+
+    def test_invalid_ttl(self):
+        """Test the TTL must be positive"""
+        with pytest.raises(ValueError, match="Cache TTL must be a positive number"):
+            ResponseCache(ttl=0)
+
+    def test_fresh_hit(self):
+        """Test fresh entries are served without fetching"""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=10, clock=clock)
+        fetch = MagicMock(return_value={"id": 1})
+
+        assert cache.get_or_fetch("k", fetch) == {"id": 1}
+        clock.now += 5
+        assert cache.get_or_fetch("k", fetch) == {"id": 1}
+
+        fetch.assert_called_once()
+        assert cache.stats.get("cache_hits") == 1
+        assert cache.stats.get("cache_misses") == 1
+
+    def test_expired_without_stale_ttl_fetches(self):
+        """Test expired entries are fetched synchronously without stale_ttl"""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=10, clock=clock)
+        fetch = MagicMock(side_effect=[1, 2])
+
+        cache.get_or_fetch("k", fetch)
+        clock.now += 11
+
+        assert cache.get_or_fetch("k", fetch) == 2
+
+    def test_stale_while_revalidate(self):
+        """Test stale entries are served while one refresh runs"""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=10, stale_ttl=60, clock=clock)
+        cache.get_or_fetch("k", lambda: "old")
+        clock.now += 20
+        release = threading.Event()
+        fetch = MagicMock(side_effect=lambda: release.wait() and "new")
+
+        assert cache.get_or_fetch("k", fetch) == "old"
+        assert cache.get_or_fetch("k", fetch) == "old"
+        release.set()
+        _wait_for(lambda: cache.stats.get("cache_refreshes") == 1)
+
+        assert cache.get_or_fetch("k", fetch) == "new"
+        fetch.assert_called_once()
+        snapshot = cache.stats.snapshot()
+        assert snapshot["cache_stale_serves"] == 2
+        assert snapshot["cache_refresh_latency"]["count"] == 1
+
+    def test_failed_refresh_keeps_stale_value(self):
+        """Test a failed background refresh keeps the stale entry"""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=10, stale_ttl=60, clock=clock)
+        cache.get_or_fetch("k", lambda: "old")
+        clock.now += 20
+
+        cache.get_or_fetch("k", MagicMock(side_effect=RuntimeError("down")))
+        _wait_for(lambda: cache.stats.get("cache_refresh_errors") == 1)
+
+        assert cache.get_or_fetch("k", lambda: "unused") == "old"
+
+    def test_probabilistic_early_expiry(self):
+        """Test fresh entries near expiry may be refreshed early"""
+        clock = FakeClock()
+
+        def fetch():
+            clock.now += 1
+            return "value"
+
+        # A random draw close to 1 makes early expiry certain
+        cache = ResponseCache(ttl=10, clock=clock, rand=lambda: 0.9999)
+        cache.get_or_fetch("k", fetch)
+        clock.now += 8
+
+        assert cache.get_or_fetch("k", fetch) == "value"
+        _wait_for(lambda: cache.stats.get("cache_refreshes") == 1)
+        assert cache.stats.get("cache_early_refreshes") == 1
+
+    def test_no_early_expiry_far_from_expiry(self):
+        """Test early expiry is unlikely far from expiry"""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=100, clock=clock, rand=lambda: 0.5)
+        cache._fetch("k", lambda: "value")
+        cache.backend.get("k").delta = 0.1
+
+        cache.get_or_fetch("k", lambda: "other")
+
+        assert cache.stats.get("cache_early_refreshes") == 0
+
+    def test_max_entries(self):
+        """Test least recently used entries are evicted"""
+        cache = ResponseCache(ttl=10, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.get_or_fetch(key, lambda: key)
+
+        assert len(cache) == 2
+        assert "a" not in cache.backend
+
+
+class TestClientStats:
+    """Test suite for ClientStats"""
+
+    def test_snapshot(self):
+        """Test counters and observations"""
+        stats = ClientStats()
+        stats.increment("hits")
+        stats.increment("hits", 2)
+        stats.observe("latency", 1.0)
+        stats.observe("latency", 3.0)
+
+        snapshot = stats.snapshot()
+
+        assert snapshot["hits"] == 3
+        assert snapshot["latency"] == {
+            "count": 2,
+            "total": 4.0,
+            "max": 3.0,
+            "mean": 2.0,
+        }
+        stats.reset()
+        assert stats.snapshot() == {}
+
+
+class TestClientCache:
+    """Test suite for the client response cache"""
+
+    def test_disabled_by_default(self, mock_client):
+        """Test clients are created without a cache"""
+        assert mock_client.cache is None
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_cached_lookups(self, mock_request):
+        """Test device and folder lookups are served from the cache"""
+        client = ConnectClient(
+            base_url="https://api.example.com", token="token", cache_ttl=30
+        )
+        mock_request.return_value = {"id": 1}
+
+        client.devices.get(1)
+        client.devices.get(1)
+        client.orgs.get_folders(1)
+        client.orgs.get_folders(1)
+        client.devices.get_latest_data_by_uid("uid-1")
+        client.devices.get_latest_data_by_uid("uid-1")
+
+        assert mock_request.call_count == 4
+        assert client.stats.get("cache_hits") == 2
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_expand_does_not_mutate_cached_response(self, mock_request):
+        """Test expanded copies leave the cached response untouched"""
+        client = ConnectClient(
+            base_url="https://api.example.com", token="token", cache_ttl=30
+        )
+        mock_request.side_effect = lambda url, params=None: (
+            {"id": 1, "meta_url": "meta/"} if "devices" in url else {"m": 1}
+        )
+
+        expanded = client.devices.get(1, expand=["meta_url"])
+        plain = client.devices.get(1)
+
+        assert expanded["expanded"] == {"meta_url": {"m": 1}}
+        assert "expanded" not in plain
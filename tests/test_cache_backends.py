@@ -0,0 +1,203 @@
+"""Tests for response cache backends."""
+
+import marshal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.cache import (
+    CacheEntry,
+    KeyValueBackend,
+    MemoryBackend,
+    ResponseCache,
+    SQLiteBackend,
+)
+from trinity_connect_client.cache.backends import decode_entry, encode_entry
+
+
+def _entry(value, ttl=60):
+    now = time.time()
+    return CacheEntry(value=value, expires=now + ttl, stale_until=now + ttl, delta=0.1)
+
+
+class FakeKeyValueStore:
+    """Minimal stand-in for a redis-py client"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiries = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expiries[key] = ex
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        return [k for k in list(self.data) if k.startswith(match.rstrip("*"))]
+
+
+class TestEncoding:
+    """Test suite for the binary entry encoding"""
+
+    def test_roundtrip(self):
+        """Test entries survive encoding"""
+        entry = _entry({"id": 1, "tags": ["a", None], "ok": True, "v": 1.5})
+
+        assert decode_entry(encode_entry(entry)) == entry
+
+    def test_large_values_are_compressed(self):
+        """Test large values are compressed"""
+        value = [{"id": i, "name": "Device"} for i in range(200)]
+
+        encoded = encode_entry(_entry(value))
+
+        assert len(encoded) < len(repr(value)) / 4
+        assert decode_entry(encoded).value == value
+
+    def test_invalid_data_decodes_as_miss(self):
+        """Test corrupt or foreign data is treated as a miss"""
+        assert decode_entry(b"") is None
+        assert decode_entry(b"\x09" + encode_entry(_entry(1))[1:]) is None
+
+    def test_untrusted_payload_decodes_as_miss(self):
+        """Test payloads that are not JSON are not deserialised"""
+        header = encode_entry(_entry(None))[: -len(b"null")]
+
+        assert decode_entry(header + marshal.dumps({"id": 1})) is None
+        assert decode_entry(header + b"\xff\xfe") is None
+        assert decode_entry(header + b"[" * 100_000) is None
+
+
+class TestMemoryBackend:
+    """Test suite for MemoryBackend"""
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted"""
+        backend = MemoryBackend(max_entries=2)
+        backend.set("a", _entry(1))
+        backend.set("b", _entry(2))
+        backend.get("a")
+        backend.set("c", _entry(3))
+
+        assert "a" in backend
+        assert "b" not in backend
+
+
+class TestSQLiteBackend:
+    """Test suite for SQLiteBackend"""
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test entries written by one instance are read by another"""
+        path = str(tmp_path / "cache.db")
+        writer, reader = SQLiteBackend(path), SQLiteBackend(path)
+
+        writer.set("k", _entry({"id": 1}))
+
+        assert reader.get("k").value == {"id": 1}
+        assert len(reader) == 1
+        reader.delete("k")
+        assert writer.get("k") is None
+
+    def test_purges_stale_entries(self, tmp_path):
+        """Test entries past their stale time are purged"""
+        backend = SQLiteBackend(str(tmp_path / "cache.db"), purge_interval=2)
+        backend.set("old", _entry(1, ttl=-10))
+        backend.set("new", _entry(2))
+
+        assert backend.get("old") is None
+        assert backend.get("new").value == 2
+
+    def test_concurrent_writes_counted(self, tmp_path):
+        """Test writes from several threads are all counted"""
+        backend = SQLiteBackend(str(tmp_path / "cache.db"), purge_interval=10**6)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(lambda i: backend.set(f"k{i % 10}", _entry(i)), range(400))
+            )
+
+        assert backend._writes == 400
+
+
+class TestKeyValueBackend:
+    """Test suite for KeyValueBackend"""
+
+    def test_prefixed_entries_with_expiry(self):
+        """Test entries are stored encoded under a prefix with an expiry"""
+        store = FakeKeyValueStore()
+        backend = KeyValueBackend(store, prefix="test:")
+
+        backend.set("k", _entry({"id": 1}, ttl=30))
+
+        assert isinstance(store.data["test:k"], bytes)
+        assert 30 <= store.expiries["test:k"] <= 31
+        assert backend.get("k").value == {"id": 1}
+        backend.clear()
+        assert store.data == {}
+
+    def test_len(self):
+        """Test entries under the prefix are counted, or 0 without scan_iter"""
+
+        class PlainStore:
+            get = set = delete = None
+
+        store = FakeKeyValueStore()
+        store.set("other:k", b"")
+        cache = ResponseCache(ttl=60, backend=KeyValueBackend(store, prefix="test:"))
+        cache.get_or_fetch("a", lambda: 1)
+        cache.get_or_fetch("b", lambda: 2)
+
+        assert len(cache) == 2
+        assert len(ResponseCache(ttl=60, backend=KeyValueBackend(PlainStore()))) == 0
+
+
+class TestSharedClientCache:
+    """Test suite for clients sharing a cache backend"""
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_workers_share_entries(self, mock_request, tmp_path):
+        """Test a company fetched by one client is served to another"""
+        path = str(tmp_path / "cache.db")
+        workers = [
+            ConnectClient(
+                base_url="https://api.example.com",
+                token="token",
+                cache=SQLiteBackend(path),
+            )
+            for _ in range(2)
+        ]
+        mock_request.return_value = {"id": 1, "name": "Company"}
+
+        assert workers[0].orgs.get(1) == {"id": 1, "name": "Company"}
+        assert workers[1].orgs.get(1) == {"id": 1, "name": "Company"}
+
+        mock_request.assert_called_once()
+        assert workers[1].cache.ttl == 60
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_tokens_do_not_share_entries(self, mock_request, tmp_path):
+        """Test a company fetched with one token is not served to another"""
+        path = str(tmp_path / "cache.db")
+        store = FakeKeyValueStore()
+        clients = [
+            ConnectClient(
+                base_url="https://api.example.com", token=token, cache=backend
+            )
+            for token in ("token-a", "token-b")
+            for backend in (SQLiteBackend(path), KeyValueBackend(store))
+        ]
+        mock_request.side_effect = lambda url, params=None: {
+            "id": 1,
+            "calls": len(mock_request.call_args_list),
+        }
+
+        responses = [client.orgs.get(1) for client in clients + clients]
+
+        assert [r["calls"] for r in responses] == [1, 2, 3, 4, 1, 2, 3, 4]
+        assert not any("token-a" in key for key in store.data)
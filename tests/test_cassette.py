@@ -0,0 +1,87 @@
+"""Tests for recording and replaying traffic cassettes."""
+
+import gzip
+
+import pytest
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.exceptions import ConnectAPIError, ResourceNotFoundError
+from trinity_connect_client.testing import StandInServer
+from trinity_connect_client.transports.cassette import (
+    RecordingTransport,
+    ReplayTransport,
+    load_cassette,
+    replay_workload,
+)
+
+COMMAND = {"rpc": "ping", "args": [], "pid": 1, "ttl": 60, "qos": 0}
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    """A cassette recorded against the stand-in server"""
+    path = str(tmp_path / "traffic.jsonl.gz")
+    with StandInServer(devices=10, folders=2, page_size=3) as server:
+        with RecordingTransport(path) as transport:
+            client = server.client(transport=transport, coalesce_requests=False)
+            response = client.devices.list_by_folder(1, api_key="hunter2")
+            list(client.devices.iter_pages(response))
+            client.devices.get_events_by_uid("dev-000002")
+            client.devices.issue_command(3, COMMAND)
+            with pytest.raises(ResourceNotFoundError):
+                client.devices.get(99)
+    return path
+
+
+def _replay_client(transport):
+    return ConnectClient(
+        base_url="https://replay.invalid", token="other-token", transport=transport
+    )
+
+
+class TestCassettes:
+    """Test suite for the recording and replay transports"""
+
+    def test_recording_is_scrubbed(self, cassette):
+        """Test tokens and sensitive parameters are not recorded"""
+        with gzip.open(cassette, "rt") as f:
+            content = f.read()
+        assert "standin-token" not in content
+        assert "hunter2" not in content
+
+        header, interactions = load_cassette(cassette)
+        assert header["cassette"] == 1
+        assert [i["method"] for i in interactions] == ["GET"] * 3 + ["POST", "GET"]
+        assert interactions[0]["params"] == {"api_key": "<scrubbed>"}
+        assert interactions[-1]["status"] == 404
+        assert all(i["elapsed"] >= 0 for i in interactions)
+
+    def test_replay_serves_recorded_responses(self, cassette):
+        """Test a client on a replay transport sees the recorded responses"""
+        client = _replay_client(ReplayTransport(cassette))
+
+        response = client.devices.list_by_folder(1, api_key="anything")
+        devices = [d for page in client.devices.iter_pages(response) for d in page]
+        assert [d["id"] for d in devices] == [1, 3, 5, 7, 9]
+        assert client.devices.issue_command(3, COMMAND)[0] == 200
+        with pytest.raises(ResourceNotFoundError):
+            client.devices.get(99)
+        with pytest.raises(ConnectAPIError):
+            client.devices.get(1)
+
+    def test_replay_speed(self, cassette):
+        """Test recorded durations are scaled by the replay speed"""
+        delays = []
+        client = _replay_client(
+            ReplayTransport(cassette, speed=2.0, sleep=delays.append)
+        )
+        client.devices.get_events_by_uid("dev-000002")
+        _, interactions = load_cassette(cassette)
+        assert delays == [interactions[2]["elapsed"] / 2]
+
+    def test_replay_workload(self, cassette):
+        """Test recorded requests are re-issued against another server"""
+        with StandInServer(devices=10, folders=2, page_size=3) as server:
+            results = replay_workload(cassette, server.client(), speed=100)
+            assert [r["status"] for r in results] == [200] * 4 + [404]
+            assert server.commands_sent == 1
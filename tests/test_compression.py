@@ -0,0 +1,191 @@
+"""Tests for response compression negotiation and request body compression."""
+
+import zlib
+from unittest.mock import MagicMock
+
+import pytest
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.compression import (
+    accept_encoding,
+    available_encodings,
+    compress_json,
+    decode_json_body,
+)
+from trinity_connect_client.stats import ClientStats
+from trinity_connect_client.testing import StandInServer
+from trinity_connect_client.transports import (
+    InMemoryTransport,
+    RequestsTransport,
+    Transport,
+    Urllib3Transport,
+)
+from trinity_connect_client.transports.cassette import (
+    RecordingTransport,
+    load_cassette,
+)
+
+COMMAND = {"rpc": "configure", "args": ["x" * 2000], "pid": 1, "ttl": 60, "qos": 0}
+PING = {"rpc": "ping", "args": [], "pid": 1, "ttl": 60, "qos": 0}
+
+
+@pytest.fixture(scope="module")
+def server():
+    """A running stand-in server compressing its responses"""
+    with StandInServer(devices=40, folders=1, page_size=40, compress=True) as server:
+        yield server
+
+
+class TestAcceptEncoding:
+    def test_default_advertises_available_encodings(self):
+        """Test every decodable coding is advertised by default"""
+        assert accept_encoding() == ", ".join(available_encodings())
+        assert "gzip" in available_encodings()
+
+    def test_explicit_encodings(self):
+        """Test explicit codings, q-values and identity"""
+        assert accept_encoding("gzip") == "gzip"
+        assert accept_encoding(["gzip;q=1.0", "identity;q=0.5"]) == (
+            "gzip;q=1.0, identity;q=0.5"
+        )
+        assert accept_encoding("") == "identity"
+
+    def test_undecodable_encoding(self):
+        """Test codings that cannot be decoded are rejected"""
+        with pytest.raises(ValueError, match="cannot be decoded"):
+            accept_encoding("gzip, compress")
+
+    def test_client_header(self):
+        """Test the configured header is sent with authenticated requests"""
+        client = ConnectClient(
+            base_url="https://x.invalid", token="t", accept_encoding="gzip"
+        )
+
+        assert client.devices._get_auth_headers()["Accept-Encoding"] == "gzip"
+
+
+class TestRequestCompression:
+    def test_compress_json(self):
+        """Test only bodies of at least the minimum size are compressed"""
+        stats = ClientStats()
+
+        assert compress_json({"a": 1}, min_size=1024, stats=stats) is None
+        data = compress_json(COMMAND, min_size=1024, stats=stats)
+
+        assert decode_json_body(data, "gzip") == COMMAND
+        assert stats.get("compressed_requests") == 1
+        assert stats.get("request_compression_bytes_saved") > 1900
+
+    def test_decode_json_body(self):
+        """Test deflate and plain bodies are decoded"""
+        assert decode_json_body(zlib.compress(b'{"a": 1}'), "deflate") == {"a": 1}
+        assert decode_json_body(b'{"a": 1}') == {"a": 1}
+        assert decode_json_body(b"") is None
+
+    def test_in_memory_handler_receives_decoded_body(self):
+        """Test compressed bodies reach an in-memory handler decoded"""
+        received = []
+
+        def handler(method, url, headers, params, json):
+            received.append((headers.get("Content-Encoding"), json))
+            return 200, {"status": "queued"}
+
+        client = ConnectClient(
+            base_url="https://x.invalid",
+            token="t",
+            transport=InMemoryTransport(handler),
+            compress_requests=True,
+        )
+        client.devices.issue_command(1, COMMAND)
+        client.devices.issue_command(1, PING)
+
+        assert received == [("gzip", COMMAND), (None, PING)]
+
+    @pytest.mark.parametrize("transport_class", [None, Urllib3Transport])
+    def test_standin_accepts_compressed_commands(self, server, transport_class):
+        """Test compressed command bodies are accepted over HTTP"""
+        transport = transport_class() if transport_class else None
+        client = server.client(
+            transport=transport, compress_requests=True, compress_requests_min_size=64
+        )
+        sent = server.commands_sent
+
+        assert client.devices.issue_command(1, COMMAND) == (
+            200,
+            {"status": "queued", "device": 1},
+        )
+        assert server.commands_sent == sent + 1
+        assert client.stats.get("compressed_requests") == 1
+
+    def test_recorded_decoded(self, server, tmp_path):
+        """Test cassettes record compressed bodies decoded"""
+        path = str(tmp_path / "traffic.jsonl.gz")
+        with RecordingTransport(path) as transport:
+            client = server.client(transport=transport, compress_requests=True)
+            client.devices.issue_command(2, COMMAND)
+
+        _, interactions = load_cassette(path)
+        assert interactions[0]["json"] == COMMAND
+        assert interactions[0]["status"] == 200
+
+
+class TestResponseCompression:
+    @pytest.mark.parametrize(
+        "transport_class", [None, RequestsTransport, Urllib3Transport]
+    )
+    def test_bytes_saved(self, server, transport_class):
+        """Test compressed responses are decoded and the bytes saved counted"""
+        transport = transport_class() if transport_class else None
+        client = server.client(transport=transport, coalesce_requests=False)
+
+        response = client.devices.list_by_folder(1)
+
+        assert len(response["results"]) == 40
+        assert client.stats.get("compressed_responses") == 1
+        assert client.stats.get("compression_bytes_saved") > 10_000
+
+    def test_identity(self, server):
+        """Test nothing is compressed when only identity is accepted"""
+        client = server.client(transport=Urllib3Transport(), accept_encoding="")
+
+        client.devices.list_by_folder(1)
+
+        assert client.stats.get("compressed_responses") == 0
+
+    def test_unknown_responses(self, mock_client):
+        """Test responses without a known size or encoding record nothing"""
+
+        class Bare:
+            status_code = 200
+
+            def json(self):
+                return {"id": 1}
+
+        class Given(Transport):
+            def send(self, *args, **kwargs):
+                return response
+
+        mock_client.transport = Given()
+        for response in (MagicMock(status_code=200), Bare()):
+            mock_client.devices.get(1)
+
+        assert mock_client.stats.snapshot().get("compressed_responses") is None
+
+    def test_standin_compression(self, server):
+        """Test the stand-in gzips large responses for clients accepting gzip"""
+        status, body = server.handle(
+            "GET",
+            f"{server.base_url}/api/v4/devices/folder/1/",
+            {"Authorization": f"Bearer {server.token}"},
+        )
+        transport = Urllib3Transport()
+        response = transport.send(
+            "GET",
+            f"{server.base_url}/api/v4/devices/folder/1/",
+            {"Authorization": f"Bearer {server.token}", "Accept-Encoding": "gzip"},
+        )
+
+        assert status == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.json() == body
+        assert response.wire_bytes < len(response.content)
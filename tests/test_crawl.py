@@ -0,0 +1,76 @@
+"""Tests for the concurrent company device crawl."""
+
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client.modules.orgs import OrgsAPI
+
+FOLDERS = [{"id": 1}, {"id": 2}, {"id": 3}]
+DEVICES = {
+    1: [{"id": 10, "uid": "a", "name": "A", "description": "x"}],
+    2: [{"id": 11, "uid": "b", "name": "B", "description": "y"}],
+    # Device 10 is also listed under folder 3
+    3: [
+        {"id": 10, "uid": "a", "name": "A", "description": "x"},
+        {"id": 12, "uid": "c", "name": "C", "description": "z"},
+    ],
+}
+
+
+def _respond(url, params=None):
+    if "orgs/folders/company" in url:
+        return FOLDERS
+    folder_id = int(url.split("devices/folder/")[1].split("/")[0])
+    return DEVICES[folder_id]
+
+
+class TestIterCompanyDevices:
+    """Test suite for OrgsAPI.iter_company_devices"""
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_yields_unique_devices(self, mock_request, mock_client):
+        """Test every device is yielded once with progress per folder"""
+        mock_request.side_effect = _respond
+        reports = []
+
+        devices = list(
+            mock_client.orgs.iter_company_devices(
+                1, max_workers=2, progress=reports.append
+            )
+        )
+
+        assert sorted(d["id"] for d in devices) == [10, 11, 12]
+        assert sorted(r.folder_id for r in reports) == [1, 2, 3]
+        assert reports[-1].completed == reports[-1].total == 3
+        urls = [c[0][0] for c in mock_request.call_args_list]
+        assert not any(url.endswith("/lite/") for url in urls)
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_lite_fields_use_lite_listing(self, mock_request, mock_client):
+        """Test the lite listing is used when only lite fields are requested"""
+        mock_request.side_effect = _respond
+
+        devices = list(mock_client.orgs.iter_company_devices(1, fields=["id", "uid"]))
+
+        assert {"id": 12, "uid": "c"} in devices
+        urls = [c[0][0] for c in mock_request.call_args_list]
+        assert sum(url.endswith("/lite/") for url in urls) == 3
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_non_lite_fields_use_full_listing(self, mock_request, mock_client):
+        """Test the full listing is used for fields outside the lite listing"""
+        mock_request.side_effect = _respond
+
+        devices = list(
+            mock_client.orgs.iter_company_devices(1, fields=["uid", "description"])
+        )
+
+        assert len(devices) == 3
+        urls = [c[0][0] for c in mock_request.call_args_list]
+        assert not any(url.endswith("/lite/") for url in urls)
+
+    def test_invalid_company_id(self, mock_client):
+        """Test iter_company_devices with an invalid company ID"""
+        with pytest.raises(ValueError, match="ID must be a positive integer"):
+            OrgsAPI(mock_client).iter_company_devices(-1)
@@ -0,0 +1,86 @@
+"""Tests for linked-resource expansion."""
+
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client.exceptions import ResourceNotFoundError
+from trinity_connect_client.modules.devices import DevicesAPI
+from trinity_connect_client.modules.orgs import OrgsAPI
+
+BASE = "https://api.example.com/api/v4"
+
+
+class TestExpandLinks:
+    """Test suite for expand options"""
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_device_get_expand(self, mock_request, mock_client):
+        """Test linked resources are attached to a device"""
+        responses = {
+            f"{BASE}/devices/1/": {
+                "id": 1,
+                "uid": "a",
+                "meta_url": f"{BASE}/devices/1/meta/",
+                "geo_url": f"{BASE}/devices/1/geo/",
+            },
+            f"{BASE}/devices/1/meta/": {"meta": True},
+        }
+
+        def respond(url, params=None):
+            if url not in responses:
+                raise ResourceNotFoundError("Requested resource not found")
+            return responses[url]
+
+        mock_request.side_effect = respond
+        devices_api = DevicesAPI(mock_client)
+
+        device = devices_api.get(1, expand=["meta_url", "geo_url"])
+
+        assert device["expanded"] == {"meta_url": {"meta": True}, "geo_url": None}
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_shared_urls_fetched_once(self, mock_request, mock_client):
+        """Test a URL shared by many devices is only requested once"""
+        folder_url = f"{BASE}/orgs/folder/5/"
+        devices = [{"id": i, "uid": str(i), "folder_url": folder_url} for i in (1, 2)]
+        mock_request.side_effect = lambda url, params=None: (
+            devices if "devices/folder" in url else {"id": 5}
+        )
+        devices_api = DevicesAPI(mock_client)
+
+        result = devices_api.list_by_folder(5, expand=["folder_url"], state="52")
+
+        assert [d["expanded"]["folder_url"] for d in result] == [{"id": 5}, {"id": 5}]
+        assert mock_request.call_count == 2
+        assert mock_request.call_args_list[0][1]["params"] == {"state": "52"}
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_company_get_expand(self, mock_request, mock_client):
+        """Test linked resources are attached to a company"""
+        mock_request.side_effect = lambda url, params=None: (
+            [{"id": 9}] if url.endswith("sims/") else {"id": 1, "url_sims": "sims/"}
+        )
+        orgs_api = OrgsAPI(mock_client)
+
+        company = orgs_api.get(1, expand=["url_sims"])
+
+        assert company["expanded"]["url_sims"] == [{"id": 9}]
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_without_expand(self, mock_request, mock_client):
+        """Test responses are untouched without expand"""
+        mock_request.return_value = {"id": 1, "url_sims": "sims/"}
+        orgs_api = OrgsAPI(mock_client)
+
+        assert "expanded" not in orgs_api.get(1)
+        mock_request.assert_called_once()
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_invalid_expand(self, mock_request, mock_client):
+        """Test expand must be a list of names"""
+        mock_request.return_value = {"id": 1}
+        orgs_api = OrgsAPI(mock_client)
+
+        with pytest.raises(ValueError, match="Expand must be a list"):
+            orgs_api.get(1, expand="url_sims")
@@ -0,0 +1,114 @@
+"""Tests for streaming Arrow exports."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client.export import (
+    ArrowExporter,
+    export_devices,
+    export_events,
+    iter_record_batches,
+    schema_for_model,
+)
+from trinity_connect_client.models import Device, DeviceCommand
+from trinity_connect_client.modules.devices import DevicesAPI
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+class TestSchemaForModel:
+    """Test suite for schema_for_model"""
+
+    def test_device_schema(self):
+        """Test typed model fields map to columns"""
+        schema = schema_for_model(Device)
+
+        assert schema.field("id").type == pa.int64()
+        assert schema.field("uid").type == pa.string()
+        assert schema.field("tpp_id").nullable
+        assert len(schema) == len(Device.__dataclass_fields__)
+
+    def test_record_list_schema(self):
+        """Test list-wrapping models map to a JSON record column"""
+        schema = schema_for_model(DeviceCommand)
+
+        assert schema.names == ["device_uid", "record"]
+
+
+class TestIterRecordBatches:
+    """Test suite for iter_record_batches"""
+
+    def test_fixed_batch_size(self):
+        """Test records are grouped into batches of at most batch_size rows"""
+        schema = schema_for_model(DeviceCommand)
+        records = ({"device_uid": "a", "record": {"n": i}} for i in range(5))
+
+        batches = list(iter_record_batches(records, schema, batch_size=2))
+
+        assert [b.num_rows for b in batches] == [2, 2, 1]
+        assert batches[0].column("record")[1].as_py() == '{"n":1}'
+
+
+class TestArrowExporter:
+    """Test suite for ArrowExporter"""
+
+    def test_invalid_format(self):
+        """Test unsupported formats are rejected"""
+        with pytest.raises(ValueError, match="Format must be one of"):
+            ArrowExporter("out.csv", schema_for_model(Device), format="csv")
+
+    def test_feather_roundtrip(self, tmp_path):
+        """Test records written incrementally to a Feather file"""
+        schema = schema_for_model(DeviceCommand)
+        path = tmp_path / "commands.feather"
+
+        with ArrowExporter(path, schema, format="feather", batch_size=2) as exporter:
+            exporter.write({"device_uid": "a", "record": {"n": i}} for i in range(3))
+            exporter.write([{"device_uid": "b", "record": {"n": 3}}])
+
+        table = pa.ipc.open_file(path).read_all()
+        assert table.num_rows == 4
+        assert exporter.rows_written == 4
+
+
+class TestExports:
+    """Test suite for export helpers"""
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_export_events_follows_pages(self, mock_request, mock_client, tmp_path):
+        """Test paginated event history is streamed to Parquet"""
+        next_url = "https://api.example.com/api/v4/devices/uid/a/events/?page=2"
+        mock_request.side_effect = [
+            {"next": next_url, "results": [{"id": 1}, {"id": 2}]},
+            {"next": None, "results": [{"id": 3}]},
+        ]
+        devices_api = DevicesAPI(mock_client)
+        path = tmp_path / "events.parquet"
+
+        rows = export_events(devices_api, ["a"], path, batch_size=2)
+
+        assert rows == 3
+        table = pq.read_table(path)
+        assert [json.loads(r)["id"] for r in table.column("record").to_pylist()] == [
+            1,
+            2,
+            3,
+        ]
+        assert mock_request.call_args_list[1][0][0] == next_url
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_export_devices(self, mock_request, mock_client, tmp_path):
+        """Test a fleet snapshot is exported with the Device schema"""
+        mock_request.return_value = [{"id": 1, "uid": "a", "name": "Device A"}]
+        devices_api = DevicesAPI(mock_client)
+        path = tmp_path / "devices.parquet"
+
+        rows = export_devices(devices_api, [5, 6], path)
+
+        table = pq.read_table(path)
+        assert rows == 2
+        assert table.column("uid").to_pylist() == ["a", "a"]
+        assert table.column("folder").to_pylist() == [None, None]
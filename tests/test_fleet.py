@@ -0,0 +1,114 @@
+"""Tests for the fleet snapshot."""
+
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client.fleet import FleetSnapshot, diff_devices
+
+
+def _device(device_id, state=52, folder=5, seen="2024-01-01T00:00:00Z"):
+    return {
+        "id": device_id,
+        "uid": f"uid-{device_id}",
+        "state": state,
+        "folder": folder,
+        "youngest_comm_timestamp": seen,
+    }
+
+
+class FakeAPI:
+    """Serves list_by_folder responses from a mutable fleet"""
+
+    def __init__(self, fleet):
+        self.fleet = fleet
+        self.calls = []
+
+    def __call__(self, url, params=None):
+        self.calls.append((url, params))
+        if "/devices/folder/" in url:
+            return list(self.fleet.values())
+        device_id = int(url.rstrip("/").split("/")[-1])
+        return self.fleet[device_id]
+
+
+class TestDiffDevices:
+    """Test suite for diff_devices"""
+
+    def test_field_level_diff(self):
+        """Test only changed fields are reported"""
+        assert diff_devices(_device(1), _device(1, state=53)) == {"state": (52, 53)}
+        assert diff_devices(_device(1), _device(1, state=53), fields=["folder"]) == {}
+
+
+class TestFleetSnapshot:
+    """Test suite for FleetSnapshot"""
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_full_refresh_delta(self, mock_request, mock_client):
+        """Test added, removed and changed devices are reported"""
+        api = FakeAPI({1: _device(1), 2: _device(2)})
+        mock_request.side_effect = api
+        snapshot = FleetSnapshot(mock_client.devices, [5])
+
+        first = snapshot.refresh()
+        assert sorted(d["id"] for d in first.added) == [1, 2]
+
+        api.fleet = {1: _device(1, folder=6), 3: _device(3)}
+        delta = snapshot.refresh()
+
+        assert [d["id"] for d in delta.added] == [3]
+        assert [d["id"] for d in delta.removed] == [2]
+        assert [(c.device_id, c.fields) for c in delta.changed] == [
+            (1, {"folder": (5, 6)})
+        ]
+        assert not snapshot.refresh()
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_incremental_refresh_uses_filter(self, mock_request, mock_client):
+        """Test later refreshes only download changed devices"""
+        api = FakeAPI({1: _device(1), 2: _device(2)})
+        mock_request.side_effect = api
+        snapshot = FleetSnapshot(
+            mock_client.devices, [5], changed_since_filter="changed_since"
+        )
+        snapshot.refresh()
+        api.calls.clear()
+
+        # The filtered listing returns only device 2, lite listing adds device 3
+        def respond(url, params=None):
+            api.calls.append((url, params))
+            if url.endswith("/lite/"):
+                return [{"id": i, "uid": f"uid-{i}"} for i in (1, 2, 3)]
+            if "/devices/folder/" in url:
+                assert params["changed_since"] == snapshot.synced_at
+                return [_device(2, state=53)]
+            return _device(3)
+
+        mock_request.side_effect = respond
+        delta = snapshot.refresh()
+
+        assert [d["id"] for d in delta.added] == [3]
+        assert [c.fields for c in delta.changed] == [{"state": (52, 53)}]
+        assert delta.removed == []
+        assert snapshot.devices[1] == _device(1)
+        assert len(api.calls) == 3
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_persisted_between_runs(self, mock_request, mock_client, tmp_path):
+        """Test a saved snapshot is restored and only deltas are reported"""
+        path = str(tmp_path / "fleet.json")
+        mock_request.side_effect = FakeAPI({1: _device(1)})
+        FleetSnapshot(mock_client.devices, [5], path=path).refresh()
+
+        restored = FleetSnapshot(mock_client.devices, [5], path=path)
+        assert len(restored) == 1
+        assert not restored.refresh()
+
+        other_folders = FleetSnapshot(mock_client.devices, [7], path=path)
+        assert len(other_folders) == 0
+
+    def test_save_without_path(self, mock_client):
+        """Test saving requires a path"""
+        with pytest.raises(ValueError, match="A path is required"):
+            FleetSnapshot(mock_client.devices, [5]).save()
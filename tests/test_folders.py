@@ -0,0 +1,99 @@
+"""Tests for the folder tree index."""
+
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client.folders import FolderTree
+from trinity_connect_client.modules.orgs import OrgsAPI
+
+
+def _folder(folder_id, parent, human_path):
+    return {
+        "id": folder_id,
+        "name": human_path.split("/")[-1],
+        "parent": parent,
+        "path": f"{folder_id:04d}",
+        "human_path": human_path,
+        "tree_id": 1,
+    }
+
+
+FOLDERS = [
+    _folder(1, None, "Region"),
+    _folder(2, 1, "Region/Site A"),
+    _folder(3, 1, "Region/Site B"),
+    _folder(4, 2, "Region/Site A/Rack"),
+]
+
+
+class TestFolderTree:
+    """Test suite for FolderTree"""
+
+    def test_lookups(self):
+        """Test lookups by ID and path"""
+        tree = FolderTree(FOLDERS)
+
+        assert tree.get(4)["name"] == "Rack"
+        assert tree.by_path("Region/Site A/Rack")["id"] == 4
+        assert tree.by_path("/Region / Site A/ Rack/")["id"] == 4
+        assert tree.by_path("0003")["id"] == 3
+        assert tree.by_path("Nowhere") is None
+
+    def test_tree_queries(self):
+        """Test children, subtree and ancestor queries"""
+        tree = FolderTree(FOLDERS)
+
+        assert [f["id"] for f in tree.roots()] == [1]
+        assert [f["id"] for f in tree.children(1)] == [2, 3]
+        assert [f["id"] for f in tree.descendants(1)] == [2, 3, 4]
+        assert [f["id"] for f in tree.descendants(2, include_self=True)] == [2, 4]
+        assert [f["id"] for f in tree.ancestors(4)] == [2, 1]
+
+    def test_update_moves_folder(self):
+        """Test an updated folder is re-indexed under its new parent"""
+        tree = FolderTree(FOLDERS)
+
+        changes = tree.update([_folder(4, 3, "Region/Site B/Rack")])
+
+        assert changes.changed == {4}
+        assert [f["id"] for f in tree.children(2)] == []
+        assert [f["id"] for f in tree.children(3)] == [4]
+        assert tree.by_path("Region/Site A/Rack") is None
+
+    def test_refresh_requires_api(self):
+        """Test trees built from plain folders cannot be refreshed"""
+        with pytest.raises(ValueError, match="Only trees built with from_api"):
+            FolderTree(FOLDERS).refresh()
+
+
+class TestGetFolderTree:
+    """Test suite for OrgsAPI.get_folder_tree"""
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_build_and_refresh(self, mock_request, mock_client):
+        """Test the tree is built from one sweep and refreshed incrementally"""
+        mock_request.return_value = FOLDERS
+        orgs_api = OrgsAPI(mock_client)
+
+        tree = orgs_api.get_folder_tree(1)
+
+        assert len(tree) == 4
+        mock_request.assert_called_once()
+
+        mock_request.return_value = [
+            *FOLDERS[:2],
+            _folder(3, 1, "Region/Site C"),
+            _folder(5, 3, "Region/Site C/Rack"),
+        ]
+        changes = tree.refresh()
+
+        assert changes.added == {5}
+        assert changes.removed == {4}
+        assert changes.changed == {3}
+        assert tree.by_path("Region/Site C/Rack")["id"] == 5
+
+    def test_invalid_company_id(self, mock_client):
+        """Test get_folder_tree with an invalid company ID"""
+        with pytest.raises(ValueError, match="ID must be a positive integer"):
+            OrgsAPI(mock_client).get_folder_tree(0)
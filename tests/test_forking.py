@@ -0,0 +1,241 @@
+"""Tests for sharing a client between threads and forked processes."""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+import urllib3
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.singleflight import SingleFlight
+from trinity_connect_client.testing import StandInServer
+from trinity_connect_client.transports import (
+    InMemoryTransport,
+    RequestsTransport,
+    Urllib3Transport,
+)
+
+requires_fork = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+
+def _in_child(check, timeout=10.0):
+    """Run check in a forked child and return its exit status, 0 if it passed"""
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            status = 0 if check() else 1
+        finally:
+            os._exit(status)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            return os.waitstatus_to_exitcode(status)
+        time.sleep(0.01)
+    os.kill(pid, 9)
+    os.waitpid(pid, 0)
+    return "timed out"
+
+
+@pytest.fixture
+def server():
+    with StandInServer(devices=20, folders=2) as server:
+        yield server
+
+
+@requires_fork
+@pytest.mark.filterwarnings("ignore:This process.*multi-threaded")
+class TestFork:
+    def test_child_opens_own_connections(self, server):
+        """Test a forked child does not reuse the parent's pooled connection"""
+        client = server.client(transport="urllib3", cache_ttl=60)
+        client.devices.get(1)
+        pool_manager = client.transport.pool_manager
+        single_flight = client.single_flight
+
+        def check():
+            return (
+                client.transport.pool_manager is not pool_manager
+                and client.single_flight is not single_flight
+                and client.stats.snapshot() == {}
+                and client.devices.get(2)["id"] == 2
+            )
+
+        assert _in_child(check) == 0
+        assert server.connections_accepted == 2
+
+        # The parent's connection was left open
+        client.devices.get(3)
+        assert server.connections_accepted == 2
+        assert client.stats.get("cache_misses") == 2
+
+    def test_child_closes_given_pool_manager(self, server):
+        """Test closing inherited connections in a child leaves the parent's open"""
+        client = server.client(transport=Urllib3Transport(urllib3.PoolManager()))
+        client.devices.get(1)
+
+        assert _in_child(lambda: client.devices.get(2)["id"] == 2) == 0
+        assert server.connections_accepted == 2
+
+        client.devices.get(3)
+        assert server.connections_accepted == 2
+
+    def test_locks_held_while_forking(self, mock_client):
+        """Test locks held by another thread at fork time are replaced"""
+        mock_client.transport = InMemoryTransport(lambda *args: (200, {"id": 1}))
+
+        def check():
+            mock_client.stats.increment("calls")
+            return mock_client.devices.get(1)["id"] == 1
+
+        with mock_client.stats._lock, mock_client.identity._lock:
+            assert _in_child(check) == 0
+
+    def test_fork_without_hooks(self, server):
+        """Test forks not running the at-fork hooks are caught by PID"""
+        client = server.client(transport="urllib3")
+        client.devices.get(1)
+        pool_manager = client.transport.pool_manager
+        client._pid = -1
+
+        client.devices.get(2)
+
+        assert client.transport.pool_manager is not pool_manager
+        assert client._pid == os.getpid()
+        assert server.connections_accepted == 2
+
+    def test_fork_without_hooks_holding_locks(self, server):
+        """Test state is rebuilt before the cache and coalescing locks are taken"""
+        client = server.client(transport="urllib3", cache_ttl=60)
+        cache_lock = client.cache._lock
+        single_flight = client.single_flight
+        client._pid = -1
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # As left by parent threads that were mid-call while forking
+            with cache_lock, single_flight._lock:
+                cached = executor.submit(client.orgs.get, 1)
+                uncached = executor.submit(client.devices.get, 1)
+                assert cached.result(timeout=5)["id"] == 1
+                assert uncached.result(timeout=5)["id"] == 1
+
+        assert client.cache._lock is not cache_lock
+        assert client.single_flight is not single_flight
+
+
+class TestTransportsAfterFork:
+    def test_urllib3_pool_manager(self):
+        """Test a given pool manager is cleared, an owned one replaced"""
+        transport = Urllib3Transport()
+        pool_manager = transport.pool_manager
+        transport.after_fork()
+        assert transport.pool_manager is not pool_manager
+
+        transport = Urllib3Transport(pool_manager)
+        pool_manager.connection_from_url("http://127.0.0.1:1/")
+        transport.after_fork()
+        assert transport.pool_manager is pool_manager
+        assert len(pool_manager.pools) == 0
+
+    def test_requests_session(self):
+        """Test a session's adapters get new pools"""
+        session = requests.Session()
+        pool_managers = [a.poolmanager for a in session.adapters.values()]
+
+        RequestsTransport(session).after_fork()
+
+        for adapter, pool_manager in zip(session.adapters.values(), pool_managers):
+            assert adapter.poolmanager is not pool_manager
+            assert adapter.poolmanager.connection_pool_kw["maxsize"] == 10
+
+
+class TestPerThreadSessions:
+    def test_session_per_thread(self, server):
+        """Test each thread sends through a session of its own"""
+        transport = RequestsTransport(per_thread=True)
+        client = server.client(transport=transport, coalesce_requests=False)
+        sessions = {}
+
+        def call(device_id):
+            client.devices.get(device_id)
+            sessions.setdefault(threading.get_ident(), set()).add(
+                id(transport._session())
+            )
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(call, range(1, 21)))
+
+        assert all(len(ids) == 1 for ids in sessions.values())
+        assert len({i for ids in sessions.values() for i in ids}) == len(sessions)
+        assert transport._session() is transport._session()
+
+        transport.after_fork()
+        assert len(transport._sessions) == 0
+        transport.close()
+
+    def test_session_and_per_thread(self):
+        """Test a session cannot be combined with per-thread sessions"""
+        with pytest.raises(ValueError, match="per_thread"):
+            RequestsTransport(requests.Session(), per_thread=True)
+
+
+class TestThreadSafety:
+    def test_shared_client(self):
+        """Test counters, caches and coalescing stay consistent under threads"""
+        tokens = ("token-a", "token-b")
+        seen = []
+
+        def handler(method, url, headers, params, json):
+            seen.append(headers["Authorization"])
+            time.sleep(0.001)
+            return 200, {"id": int(url.rstrip("/").rsplit("/", 1)[1])}
+
+        client = ConnectClient(
+            base_url="https://x.invalid",
+            token=tokens[0],
+            transport=InMemoryTransport(handler),
+            cache_ttl=60,
+            cache_beta=0,
+        )
+
+        def call(i):
+            if i % 50 == 0:
+                client.token = tokens[(i // 50) % 2]
+            client.stats.increment("calls")
+            return client.orgs.get(i % 10 + 1)["id"] == i % 10 + 1
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            assert all(executor.map(call, range(2000)))
+
+        stats = client.stats.snapshot()
+        assert stats["calls"] == 2000
+        assert stats["cache_hits"] + stats["cache_misses"] == 2000
+        # Concurrent misses for a company share one request
+        assert 10 <= len(seen) <= stats["cache_misses"]
+        assert set(seen) <= {f"Bearer {token}" for token in tokens}
+
+    def test_single_flight(self):
+        """Test concurrent identical calls share one execution"""
+        single_flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait()
+            return "value"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(single_flight.do, "key", fetch) for _ in range(8)
+            ]
+            while single_flight.in_flight("key") < 8:
+                time.sleep(0.001)
+            release.set()
+
+        assert [f.result() for f in futures] == ["value"] * 8
+        assert len(calls) == 1
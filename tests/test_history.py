@@ -0,0 +1,109 @@
+"""Tests for time-windowed event history retrieval."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client.history import merge_events, split_range
+from trinity_connect_client.modules.devices import DevicesAPI
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _event(event_id, hours):
+    return {"id": event_id, "timestamp": (START + timedelta(hours=hours)).isoformat()}
+
+
+class TestSplitRange:
+    """Test suite for split_range"""
+
+    def test_split_into_windows(self):
+        """Test the range is covered by consecutive windows"""
+        windows = split_range(START, START + timedelta(days=10), timedelta(days=4))
+
+        assert [(b - a).days for a, b in windows] == [4, 4, 2]
+        assert windows[0][1] == windows[1][0]
+
+    def test_invalid_range(self):
+        """Test an empty range is rejected"""
+        with pytest.raises(ValueError, match="End must be after start"):
+            split_range(START, START, timedelta(days=1))
+
+
+class TestMergeEvents:
+    """Test suite for merge_events"""
+
+    def test_sorted_and_deduplicated(self):
+        """Test boundary duplicates are removed and events sorted"""
+        merged = merge_events(
+            [[_event(3, 30), _event(2, 24)], [_event(2, 24), _event(1, 1)]]
+        )
+
+        assert [e["id"] for e in merged] == [1, 2, 3]
+
+    def test_deduplicated_by_content_without_id(self):
+        """Test events without an ID are deduplicated by content"""
+        event = {"timestamp": START.isoformat(), "type": "alert"}
+
+        assert merge_events([[event], [dict(event)]]) == [event]
+
+
+class TestGetEventsByUidWindowed:
+    """Test suite for DevicesAPI.get_events_by_uid_windowed"""
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_fetches_every_window(self, mock_request, mock_client):
+        """Test every window is requested with the time filters"""
+        mock_request.side_effect = lambda url, params=None: [
+            {"id": params["start"], "timestamp": params["start"]}
+        ]
+        devices_api = DevicesAPI(mock_client)
+
+        events = devices_api.get_events_by_uid_windowed(
+            "test-uid-123", START, START + timedelta(days=3), window=timedelta(days=1)
+        )
+
+        assert mock_request.call_count == 3
+        assert [e["timestamp"] for e in events] == [
+            (START + timedelta(days=d)).isoformat() for d in range(3)
+        ]
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_adaptive_split(self, mock_request, mock_client):
+        """Test dense windows are split in half"""
+        timeline = [_event(i, i) for i in range(48)]
+
+        def respond(url, params=None):
+            lower = datetime.fromisoformat(params["start"])
+            upper = datetime.fromisoformat(params["end"])
+            return [
+                e
+                for e in timeline
+                if lower <= datetime.fromisoformat(e["timestamp"]) <= upper
+            ]
+
+        mock_request.side_effect = respond
+        devices_api = DevicesAPI(mock_client)
+
+        events = devices_api.get_events_by_uid_windowed(
+            "test-uid-123",
+            START,
+            START + timedelta(hours=48),
+            window=timedelta(hours=48),
+            max_events_per_window=16,
+            min_window=timedelta(hours=1),
+            limit="100",
+        )
+
+        assert [e["id"] for e in events] == list(range(48))
+        assert mock_request.call_count > 1
+        calls = mock_request.call_args_list
+        assert all(c[1]["params"]["limit"] == "100" for c in calls)
+
+    def test_invalid_uid(self, mock_client):
+        """Test windowed retrieval with an invalid UID"""
+        devices_api = DevicesAPI(mock_client)
+
+        with pytest.raises(ValueError, match="UID must be a non-empty string"):
+            devices_api.get_events_by_uid_windowed("", START, START + timedelta(1))
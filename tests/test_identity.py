@@ -0,0 +1,155 @@
+"""Tests for the device identity index."""
+
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.identity import IdentityIndex
+from trinity_connect_client.modules.devices import DevicesAPI
+
+
+def _device(device_id, uid, imei=None, serial_number=None):
+    return {
+        "id": device_id,
+        "uid": uid,
+        "imei": imei,
+        "serial_number": serial_number,
+    }
+
+
+class TestIdentityIndex:
+    """Test suite for IdentityIndex"""
+
+    def test_learn_and_lookup(self):
+        """Test identities are indexed in both directions"""
+        index = IdentityIndex()
+
+        learned = index.learn([_device(1, "uid-1", "imei-1", "sn-1"), {"id": 2}])
+
+        assert learned == 1
+        assert index.id_for_uid("uid-1") == 1
+        assert index.uid_for_id(1) == "uid-1"
+        assert index.id_for("imei", "imei-1") == 1
+        assert index.id_for("serial_number", "sn-1") == 1
+        assert index.identities(1)["serial_number"] == "sn-1"
+        assert 2 not in index
+
+    def test_learn_paginated_page(self):
+        """Test devices are learned from a paginated response"""
+        index = IdentityIndex()
+
+        index.learn({"next": None, "results": [_device(1, "uid-1")]})
+
+        assert index.id_for_uid("uid-1") == 1
+
+    def test_changed_identity_replaces_old_mapping(self):
+        """Test a re-learned device drops its previous identities"""
+        index = IdentityIndex()
+        index.learn(_device(1, "uid-old"))
+
+        index.learn(_device(1, "uid-new"))
+
+        assert index.id_for_uid("uid-old") is None
+        assert index.id_for_uid("uid-new") == 1
+
+    def test_forget(self):
+        """Test devices can be removed"""
+        index = IdentityIndex()
+        index.learn(_device(1, "uid-1"))
+
+        index.forget(1)
+
+        assert len(index) == 0
+        assert index.id_for_uid("uid-1") is None
+
+    def test_invalid_key(self):
+        """Test lookups by an unknown identity key"""
+        with pytest.raises(ValueError, match="Identity key must be one of"):
+            IdentityIndex().id_for("name", "x")
+
+    def test_save_and_load(self, tmp_path):
+        """Test the index round-trips through a file"""
+        path = str(tmp_path / "identity.json")
+        index = IdentityIndex(path=path)
+        index.learn([_device(1, "uid-1", "imei-1"), _device(2, "uid-2")])
+
+        index.save()
+        restored = IdentityIndex(path=path)
+
+        assert len(restored) == 2
+        assert restored.id_for("imei", "imei-1") == 1
+
+    def test_save_without_path(self):
+        """Test saving requires a path"""
+        with pytest.raises(ValueError, match="A path is required"):
+            IdentityIndex().save()
+
+
+class TestDevicesIdentity:
+    """Test suite for identity handling in DevicesAPI"""
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_responses_fill_index(self, mock_request, mock_client):
+        """Test device responses are learned as a side effect"""
+        mock_request.return_value = _device(7, "uid-7")
+        devices_api = DevicesAPI(mock_client)
+
+        devices_api.get(7)
+
+        assert mock_client.identity.id_for_uid("uid-7") == 7
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_resolve_uses_index(self, mock_request, mock_client):
+        """Test resolution only hits the API for unknown devices"""
+        mock_request.return_value = _device(7, "uid-7")
+        devices_api = DevicesAPI(mock_client)
+
+        assert devices_api.resolve_id("uid-7") == 7
+        assert devices_api.resolve_id("uid-7") == 7
+        assert devices_api.resolve_uid(7) == "uid-7"
+        mock_request.assert_called_once()
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_index_folder(self, mock_request, mock_client):
+        """Test bulk loading from a paginated lite listing"""
+        mock_request.side_effect = [
+            {"next": "https://api.example.com/page-2", "results": [_device(1, "a")]},
+            {"next": None, "results": [_device(2, "b"), _device(3, "c")]},
+        ]
+        devices_api = DevicesAPI(mock_client)
+        learned = []
+        mock_client.identity.subscribe(learned.append)
+
+        assert devices_api.index_folder(5) == 3
+        assert len(mock_client.identity) == 3
+        assert learned == ["a", "b", "c"]
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_following_pages_are_learned(self, mock_request, mock_client):
+        """Test pages and linked devices fetched by URL reach the index"""
+        mock_request.side_effect = [
+            {"next": "https://api.example.com/page-2", "results": [_device(1, "a")]},
+            {"next": None, "results": [_device(2, "b")]},
+            _device(3, "c"),
+        ]
+        devices_api = DevicesAPI(mock_client)
+
+        pages = list(devices_api.iter_pages(devices_api.list_by_folder(5)))
+        devices_api.get_linked_resource("https://api.example.com/devices/3/")
+
+        assert [len(page) for page in pages] == [1, 1]
+        assert [mock_client.identity.id_for_uid(u) for u in "abc"] == [1, 2, 3]
+
+    def test_client_loads_persisted_index(self, tmp_path):
+        """Test ConnectClient loads the index from identity_index_path"""
+        path = str(tmp_path / "identity.json")
+        index = IdentityIndex(path=path)
+        index.learn(_device(1, "uid-1"))
+        index.save()
+
+        client = ConnectClient(
+            base_url="https://api.example.com", token="token", identity_index_path=path
+        )
+
+        assert client.identity.id_for_uid("uid-1") == 1
@@ -0,0 +1,71 @@
+"""Tests for the lazy imports of the package."""
+
+import subprocess
+import sys
+
+import pytest
+
+import trinity_connect_client
+from trinity_connect_client import transports
+
+HEAVY_MODULES = (
+    "asyncio",
+    "concurrent.futures",
+    "numpy",
+    "pyarrow",
+    "requests",
+    "sqlite3",
+    "urllib3",
+)
+
+
+def _loaded_after(code):
+    """Names of the heavy modules loaded by running code in a fresh interpreter"""
+    probe = (
+        f"{code}\nimport sys\nprint(sorted(set({HEAVY_MODULES!r}) & set(sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    ).stdout
+    return eval(output)
+
+
+class TestLazyImports:
+    def test_bare_import_is_light(self):
+        """Test importing and creating a client loads no heavy modules"""
+        loaded = _loaded_after(
+            "from trinity_connect_client import ConnectClient\n"
+            "client = ConnectClient(base_url='https://x.invalid', token='t')"
+        )
+
+        assert loaded == []
+
+    def test_modules_loaded_on_first_use(self):
+        """Test HTTP and asyncio modules are imported when first needed"""
+        loaded = _loaded_after(
+            "from trinity_connect_client import AsyncConnectClient\n"
+            "from trinity_connect_client.transports import Urllib3Transport"
+        )
+
+        assert "asyncio" in loaded
+        assert "urllib3" in loaded
+
+    def test_lazy_attributes(self):
+        """Test lazily imported names resolve and are listed"""
+        from trinity_connect_client.models import Device
+
+        assert trinity_connect_client.Device is Device
+        assert "ConnectClient" in dir(trinity_connect_client)
+        assert "Urllib3Transport" in dir(transports)
+        with pytest.raises(AttributeError):
+            trinity_connect_client.Missing
+        with pytest.raises(AttributeError):
+            transports.Missing
+
+    def test_create_transport(self):
+        """Test transports are created by name"""
+        assert isinstance(
+            transports.create_transport("requests"), transports.RequestsTransport
+        )
+        with pytest.raises(ValueError, match="Unknown transport"):
+            transports.create_transport("curl")
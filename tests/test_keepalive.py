@@ -0,0 +1,165 @@
+"""Tests for connection warm-up and keep-alive probing."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+import urllib3
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.exceptions import ConnectAPIError
+from trinity_connect_client.keepalive import KeepAliveProber
+from trinity_connect_client.testing import StandInServer
+from trinity_connect_client.transports import (
+    InMemoryTransport,
+    RequestsTransport,
+    Transport,
+    Urllib3Transport,
+)
+
+
+def _wait_for(condition, timeout=2.0):
+    """Wait for the server thread to catch up, e.g. to accept connections"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def server():
+    """A stand-in server closing connections idle for 0.2 seconds"""
+    with StandInServer(devices=20, folders=2, idle_timeout=0.2) as server:
+        yield server
+
+
+class TestWarmup:
+    def test_connections_are_reused(self, server):
+        """Test warmed connections serve the following concurrent calls"""
+        client = server.client(transport="urllib3", coalesce_requests=False)
+
+        assert client.warmup(4) == 4
+        assert _wait_for(lambda: server.connections_accepted == 4)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(client.devices.get, [1, 2, 3, 4] * 5))
+
+        assert server.connections_accepted == 4
+        assert client.stats.get("connections_warmed") == 4
+
+    def test_probe_keeps_open_connections(self, server):
+        """Test probing open connections opens no new ones"""
+        client = server.client(transport="urllib3")
+        client.warmup(2)
+        requests_before = server.request_count
+
+        assert client.warmup(2, probe=True) == 2
+        assert client.stats.get("connections_warmed") == 2
+        assert server.request_count == requests_before + 2
+
+    def test_requests_session(self, server):
+        """Test a requests session pool is warmed, a bare transport is not"""
+        client = server.client(transport=RequestsTransport(requests.Session()))
+        assert client.warmup(3) == 3
+
+        client = server.client(transport=RequestsTransport())
+        assert client.warmup(3) == 0
+
+    def test_blocking_pool_in_use(self, server):
+        """Test a blocking pool does not wait for connections in use"""
+        transport = Urllib3Transport(urllib3.PoolManager(maxsize=2, block=True))
+        client = server.client(transport=transport)
+        pool = transport.pool_manager.connection_from_url(f"{client.api_url}/")
+        held = [pool._get_conn(), pool._get_conn()]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(client.warmup, 2).result(timeout=5) == 0
+        for conn in held:
+            pool._put_conn(conn)
+        assert client.warmup(2) == 2
+
+    def test_default_transport(self, server):
+        """Test the default transport's pooled session is warmed"""
+        client = server.client()
+
+        assert client.warmup(2) == 2
+        assert isinstance(client.transport, RequestsTransport)
+        assert _wait_for(lambda: server.connections_accepted == 2)
+
+    def test_without_pool(self):
+        """Test transports without a pool have no connections to warm"""
+        client = ConnectClient(base_url="https://x.invalid", token="t")
+        client.transport = InMemoryTransport({})
+        assert client.warmup(2) == 0
+        with pytest.raises(ValueError, match="positive"):
+            client.warmup(0)
+
+    def test_connection_failure(self):
+        """Test failing to connect raises ConnectAPIError"""
+        server = StandInServer()
+        base_url = server.base_url
+        server.stop()
+        client = ConnectClient(base_url=base_url, token="t", transport="urllib3")
+
+        with pytest.raises(ConnectAPIError):
+            client.warmup()
+
+
+class TestKeepAliveProber:
+    def test_replaces_closed_connections(self, server):
+        """Test connections closed by the server are replaced"""
+        client = server.client(transport="urllib3")
+        client.warmup(3)
+        prober = KeepAliveProber(client, connections=3)
+
+        time.sleep(0.4)
+        assert prober.run_once() == 3
+        assert prober.run_once() == 0
+        assert _wait_for(lambda: server.connections_accepted == 6)
+        assert client.stats.get("keepalive_connections_opened") == 3
+
+        client.devices.get(1)
+        assert server.connections_accepted == 6
+
+    def test_background_probing(self, server):
+        """Test probing keeps connections alive past the idle timeout"""
+        client = server.client(transport="urllib3")
+        client.warmup(2)
+
+        with client.keep_alive(interval=0.05, connections=2) as prober:
+            assert prober.running
+            time.sleep(0.5)
+        client.devices.get(1)
+
+        assert not prober.running
+        assert client.stats.get("keepalive_rounds") >= 3
+        assert client.stats.get("keepalive_connections_opened") == 0
+        assert _wait_for(lambda: server.connections_accepted == 2)
+
+    def test_errors(self):
+        """Test failed rounds are counted and reported"""
+
+        class Broken(Transport):
+            def warmup(self, url, connections=1, probe=False):
+                raise ConnectionError("unreachable")
+
+        client = ConnectClient(base_url="https://x.invalid", token="t")
+        client.transport = Broken()
+        errors = []
+        prober = KeepAliveProber(client, interval=0.01, on_error=errors.append)
+
+        prober.start()
+        assert _wait_for(lambda: len(errors) >= 2)
+        prober.stop()
+
+        assert isinstance(errors[0], ConnectionError)
+        assert client.stats.get("keepalive_errors") >= 2
+
+    def test_validation(self, mock_client):
+        """Test prober options are validated"""
+        with pytest.raises(ValueError):
+            KeepAliveProber(mock_client, interval=0)
+        with pytest.raises(ValueError):
+            KeepAliveProber(mock_client, connections=0)
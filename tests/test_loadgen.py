@@ -0,0 +1,87 @@
+"""Tests for the load generator and the bench command."""
+
+import json
+
+import pytest
+
+from trinity_connect_client.cli import main
+from trinity_connect_client.loadgen import LoadGenerator, LoadStep, Targets, parse_mix
+from trinity_connect_client.testing import StandInServer
+
+
+class TestLoadGenerator:
+    """Test suite for LoadGenerator"""
+
+    def test_parse_mix(self):
+        """Test operation weights are parsed and validated"""
+        assert parse_mix("get_latest_data_by_uid=9,issue_command") == {
+            "get_latest_data_by_uid": 9.0,
+            "issue_command": 1.0,
+        }
+        with pytest.raises(ValueError, match="Unknown operation"):
+            parse_mix("delete_everything")
+        with pytest.raises(ValueError, match="positive"):
+            parse_mix("get=0")
+
+    def test_targets_required(self, mock_client):
+        """Test operations without targets are rejected up front"""
+        with pytest.raises(ValueError, match="device_ids"):
+            LoadGenerator(mock_client, {"issue_command": 1}, Targets(uids=["a"]))
+
+    def test_summary(self):
+        """Test step summaries"""
+        step = LoadStep("rate", 10, 2.0, latencies=[0.01, 0.02, 0.03, 0.04])
+        step.errors["HTTP 500"] += 1
+        summary = step.summary()
+        assert summary["throughput"] == 2.0
+        assert summary["p50_ms"] == 20.0
+        assert summary["p99_ms"] == 40.0
+        assert summary["error_rate"] == 0.25
+
+    def test_steps_against_standin(self):
+        """Test closed and open loop steps with an error breakdown"""
+        with StandInServer(devices=5, error_rate=0.5, seed=1) as server:
+            generator = LoadGenerator(
+                server.client(coalesce_requests=False),
+                {"get_latest_data_by_uid": 1, "issue_command": 1},
+                Targets(uids=["dev-000001"], device_ids=[1]),
+                seed=1,
+            )
+            step = generator.run_concurrency(2, 0.2)
+            assert step.requests > 0
+            assert set(step.errors) <= {"ConnectAPIError", "HTTP 500"}
+            assert 0 < step.error_rate < 1
+
+            step = generator.run_rate(50, 0.2)
+            assert step.requests == 10
+
+
+class TestBenchCommand:
+    """Test suite for connect-client bench"""
+
+    def test_bench_standin_json(self, capsys):
+        """Test a rate curve is reported as JSON"""
+        code = main(
+            [
+                "bench",
+                "--standin",
+                "--mix",
+                "get_latest_data_by_uid=3,issue_command_by_uid=1",
+                "--rate",
+                "20,40",
+                "--duration",
+                "0.25",
+                "--json",
+            ]
+        )
+        assert code == 0
+        summaries = json.loads(capsys.readouterr().out)
+        assert [s["target"] for s in summaries] == [20, 40]
+        assert [s["requests"] for s in summaries] == [5, 10]
+
+    def test_bench_requires_target(self, capsys, monkeypatch):
+        """Test a base URL and token are required without the stand-in"""
+        monkeypatch.delenv("CONNECT_API_BASE_URL", raising=False)
+        monkeypatch.delenv("CONNECT_API_TOKEN", raising=False)
+        assert main(["bench"]) == 2
+        assert "base URL and token are required" in capsys.readouterr().err
@@ -0,0 +1,115 @@
+"""Tests for negative caching of by-UID lookups."""
+
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.cache import NegativeCache
+from trinity_connect_client.exceptions import ResourceNotFoundError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _not_found(url, params=None):
+    raise ResourceNotFoundError("Requested resource not found")
+
+
+@pytest.fixture
+def client():
+    return ConnectClient(
+        base_url="https://api.example.com", token="token", not_found_ttl=30
+    )
+
+
+class TestNegativeCache:
+    """Test suite for NegativeCache"""
+
+    def test_entries_expire(self):
+        """Test recorded misses expire after the TTL"""
+        clock = FakeClock()
+        cache = NegativeCache(ttl=10, clock=clock)
+        cache.add("device", "uid-1")
+
+        assert cache.contains("device", "uid-1")
+        assert not cache.contains("latest_data", "uid-1")
+        clock.now += 11
+        assert not cache.contains("device", "uid-1")
+        assert len(cache) == 0
+
+    def test_discard_forgets_all_kinds(self):
+        """Test discarding a key forgets every kind of lookup"""
+        cache = NegativeCache()
+        cache.add("device", "uid-1")
+        cache.add("latest_data", "uid-1")
+
+        cache.discard("uid-1")
+
+        assert not cache.contains("device", "uid-1")
+        assert not cache.contains("latest_data", "uid-1")
+
+    def test_bounded(self):
+        """Test the oldest keys are evicted beyond max_entries"""
+        cache = NegativeCache(max_entries=2)
+        for uid in ("a", "b", "c"):
+            cache.add("device", uid)
+
+        assert len(cache) == 2
+        assert not cache.contains("device", "a")
+
+    def test_invalid_ttl(self):
+        """Test the TTL must be positive"""
+        with pytest.raises(ValueError, match="Negative cache TTL"):
+            NegativeCache(ttl=0)
+
+
+class TestDevicesNegativeCache:
+    """Test suite for negative caching in DevicesAPI"""
+
+    def test_disabled_by_default(self, mock_client):
+        """Test clients are created without a negative cache"""
+        assert mock_client.not_found_cache is None
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_repeated_misses_answered_locally(self, mock_request, client):
+        """Test a repeated 404 does not reach the API"""
+        mock_request.side_effect = _not_found
+
+        for _ in range(3):
+            with pytest.raises(ResourceNotFoundError):
+                client.devices.get_by_uid("uid-1")
+
+        mock_request.assert_called_once()
+        assert client.stats.get("not_found_cache_hits") == 2
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_kinds_are_independent(self, mock_request, client):
+        """Test missing latest data does not mark the device as missing"""
+        mock_request.side_effect = _not_found
+        with pytest.raises(ResourceNotFoundError):
+            client.devices.get_latest_data_by_uid("uid-1")
+
+        mock_request.side_effect = None
+        mock_request.return_value = {"id": 1, "uid": "uid-1"}
+
+        assert client.devices.get_by_uid("uid-1")["id"] == 1
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_learned_uid_invalidates_miss(self, mock_request, client):
+        """Test a miss is forgotten once the identity index learns the UID"""
+        mock_request.side_effect = _not_found
+        with pytest.raises(ResourceNotFoundError):
+            client.devices.get_latest_data_by_uid("uid-1")
+
+        mock_request.side_effect = None
+        mock_request.return_value = [{"id": 1, "uid": "uid-1"}]
+        client.devices.list_by_folder_lite(5)
+        mock_request.return_value = {"temp": 20}
+
+        assert client.devices.get_latest_data_by_uid("uid-1") == {"temp": 20}
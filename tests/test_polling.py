@@ -0,0 +1,206 @@
+"""Tests for the adaptive telemetry poller."""
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client.exceptions import ResourceNotFoundError
+from trinity_connect_client.polling import (
+    TelemetryPoller,
+    TokenBucket,
+    expected_report_time,
+)
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+class FakeClock:
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _device(uid, interval=600, seen_ago=0, comm_state=1):
+    seen = datetime.fromtimestamp(START - seen_ago, tz=timezone.utc)
+    return {
+        "uid": uid,
+        "comm_interval_contract": interval,
+        "comm_state": comm_state,
+        "youngest_comm_timestamp": seen.isoformat(),
+    }
+
+
+def _poller(mock_client, devices, clock, **options):
+    options.setdefault("jitter", 0)
+    options.setdefault("grace", 0)
+    options.setdefault("rate", 1000)
+    return TelemetryPoller(
+        mock_client.devices, devices, clock=clock, sleep=clock.sleep, **options
+    )
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket"""
+
+    def test_budget_refills_over_time(self):
+        """Test tokens are limited to the burst and refill at the rate"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+        assert bucket.take() and bucket.take()
+        assert not bucket.take()
+        assert bucket.wait_time() == pytest.approx(0.5)
+
+        clock.sleep(0.5)
+        assert bucket.take()
+
+
+class TestTelemetryPoller:
+    """Test suite for TelemetryPoller"""
+
+    def test_expected_report_time(self):
+        """Test the next report is the last report plus the contract"""
+        assert expected_report_time(_device("a", seen_ago=100)) == START + 500
+        assert expected_report_time({"uid": "a"}) is None
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_devices_polled_when_expected(self, mock_request, mock_client):
+        """Test devices are polled in order of their expected report"""
+        mock_request.return_value = {"temp": 1}
+        clock = FakeClock()
+        poller = _poller(
+            mock_client,
+            [_device("late", seen_ago=60), _device("soon", seen_ago=500)],
+            clock,
+        )
+
+        assert poller.time_until_next() == 100
+        assert poller.step() == []
+
+        clock.sleep(100)
+        assert [r.uid for r in poller.step()] == ["soon"]
+        assert poller.time_until_next() == 440
+
+        clock.sleep(440)
+        assert [r.uid for r in poller.step()] == ["late"]
+        assert mock_client.stats.get("polls") == 2
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_idle_devices_back_off(self, mock_request, mock_client):
+        """Test unchanged data doubles the interval and new data resets it"""
+        mock_request.return_value = {"temp": 1}
+        clock = FakeClock()
+        poller = _poller(mock_client, [_device("a", seen_ago=600)], clock)
+
+        intervals = []
+        for _ in range(4):
+            result = poller.step()[0]
+            intervals.append(poller.time_until_next())
+            clock.sleep(intervals[-1])
+        assert result.changed is False
+        assert intervals == [600, 1200, 2400, 3600]
+
+        mock_request.return_value = {"temp": 2}
+        assert poller.step()[0].changed
+        assert poller.time_until_next() == 600
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_offline_devices_polled_rarely(self, mock_request, mock_client):
+        """Test devices in an offline comm state use the maximum interval"""
+        clock = FakeClock()
+        poller = _poller(
+            mock_client,
+            [_device("a", comm_state=3)],
+            clock,
+            offline_comm_states=[3],
+        )
+        assert poller.time_until_next() == 3600
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_budget_limits_polls(self, mock_request, mock_client):
+        """Test no more polls are made than the budget allows"""
+        mock_request.return_value = {}
+        clock = FakeClock()
+        devices = [_device(f"d{i}", seen_ago=600) for i in range(5)]
+        poller = _poller(mock_client, devices, clock, rate=1, burst=2)
+
+        assert len(poller.step()) == 2
+        assert poller.time_until_next() == pytest.approx(1.0)
+        clock.sleep(1)
+        assert len(poller.step()) == 1
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_errors_and_missing_devices(self, mock_request, mock_client):
+        """Test failed polls are retried later and deleted devices dropped"""
+
+        def respond(url, params=None):
+            if "gone" in url:
+                raise ResourceNotFoundError("Requested resource not found")
+            raise ConnectionError("down")
+
+        mock_request.side_effect = respond
+        errors = []
+        clock = FakeClock()
+        poller = _poller(
+            mock_client,
+            [_device("gone", seen_ago=600), _device("flaky", seen_ago=600)],
+            clock,
+            on_error=lambda uid, e: errors.append(uid),
+        )
+
+        assert poller.step() == []
+        assert "gone" not in poller and "flaky" in poller
+        assert errors == ["flaky"]
+        assert poller.time_until_next() == 1200
+        assert mock_client.stats.get("poll_not_found") == 1
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_run_and_stream(self, mock_request, mock_client):
+        """Test results are delivered to a callback and an async iterator"""
+        mock_request.return_value = {"temp": 1}
+        clock = FakeClock()
+        poller = _poller(mock_client, [_device("a", seen_ago=600)], clock)
+
+        results = []
+
+        def callback(result):
+            results.append(result)
+            if len(results) == 3:
+                poller.stop()
+
+        poller.run(callback)
+        assert [r.polled_at - START for r in results] == [0, 600, 1800]
+
+        async def consume():
+            async for result in _poller(
+                mock_client, [_device("b", seen_ago=600)], clock
+            ).stream():
+                return result
+
+        assert asyncio.run(consume()).uid == "b"
+        poller.close()
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_stop_ends_stream_wait(self, mock_request, mock_client):
+        """Test stop() ends a stream waiting for the next poll"""
+        mock_request.return_value = {"temp": 1}
+        poller = TelemetryPoller(mock_client.devices, [_device("a")], jitter=0)
+
+        async def consume():
+            results = []
+            async for result in poller.stream():
+                results.append(result)
+                threading.Timer(0.05, poller.stop).start()
+            return results
+
+        results = asyncio.run(asyncio.wait_for(consume(), 5))
+        assert [r.uid for r in results] == ["a"]
+        poller.close()
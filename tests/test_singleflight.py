@@ -0,0 +1,133 @@
+"""Tests for single-flight request coalescing."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.exceptions import ResourceNotFoundError
+from trinity_connect_client.singleflight import SingleFlight, request_key
+from trinity_connect_client.transports import InMemoryTransport
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.001)
+
+
+def _run_concurrently(single_flight, key, func, callers):
+    results = [None] * callers
+    errors = [None] * callers
+
+    def call(i):
+        try:
+            results[i] = single_flight.do(key, func)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight"""
+
+    def test_concurrent_calls_share_result(self):
+        """Test callers of an in-flight key share one execution"""
+        single_flight = SingleFlight()
+        release = threading.Event()
+        func = MagicMock(side_effect=lambda: release.wait() and {"id": 1})
+
+        threads, results, _ = _run_concurrently(single_flight, "k", func, 5)
+        _wait_for(lambda: single_flight.in_flight("k") == 5)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        func.assert_called_once()
+        assert all(result is results[0] for result in results)
+        assert single_flight.in_flight("k") == 0
+
+    def test_concurrent_calls_share_error(self):
+        """Test waiting callers receive the leader's exception"""
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def fail():
+            release.wait()
+            raise ResourceNotFoundError("Requested resource not found")
+
+        threads, _, errors = _run_concurrently(single_flight, "k", fail, 3)
+        _wait_for(lambda: single_flight.in_flight("k") == 3)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(e, ResourceNotFoundError) for e in errors)
+
+    def test_sequential_calls_execute_again(self):
+        """Test completed calls are not cached"""
+        single_flight = SingleFlight()
+        func = MagicMock(return_value=1)
+
+        single_flight.do("k", func)
+        single_flight.do("k", func)
+
+        assert func.call_count == 2
+
+    def test_request_key_ignores_param_order(self):
+        """Test keys do not depend on parameter order"""
+        assert request_key("u", {"a": 1, "b": 2}) == request_key("u", {"b": 2, "a": 1})
+        assert request_key("u", {"a": 1}) != request_key("u", {"a": "1"})
+        assert request_key("u") == request_key("u", {})
+
+
+class TestCoalescedGetRequests:
+    """Test suite for coalescing in make_get_request"""
+
+    @pytest.mark.parametrize("coalesce, expected_calls", [(True, 1), (False, 4)])
+    def test_identical_gets(self, coalesce, expected_calls):
+        """Test identical concurrent GETs share a request when enabled"""
+        arrived = threading.Semaphore(0)
+        release = threading.Event()
+
+        def respond(method, url, headers, params, json):
+            arrived.release()
+            release.wait()
+            return 200, {"id": 1}
+
+        transport = InMemoryTransport(respond)
+        client = ConnectClient(
+            base_url="https://api.example.com",
+            token="token",
+            coalesce_requests=coalesce,
+            transport=transport,
+        )
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.orgs.get(1)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+
+        arrived.acquire(timeout=5)
+        if coalesce:
+            key = request_key("https://api.example.com/api/v4/orgs/company/1/")
+            _wait_for(lambda: client.single_flight.in_flight(key) == 4)
+        else:
+            for _ in range(3):
+                arrived.acquire(timeout=5)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert transport.request_count == expected_calls
+        assert results == [{"id": 1}] * 4
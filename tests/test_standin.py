@@ -0,0 +1,103 @@
+"""Tests for the local Connect API stand-in server."""
+
+import time
+
+import pytest
+
+from trinity_connect_client.exceptions import (
+    ConnectAPIError,
+    ResourceNotFoundError,
+    UnauthorisedError,
+)
+from trinity_connect_client.models import Company, Device, Folder
+from trinity_connect_client.testing import StandInServer
+
+COMMAND = {"rpc": "ping", "args": [], "pid": 1, "ttl": 60, "qos": 0}
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StandInServer(devices=25, folders=3, page_size=4, events_per_device=10) as s:
+        yield s
+
+
+class TestStandInServer:
+    """Test suite for StandInServer"""
+
+    def test_device_routes(self, server):
+        """Test devices are served by ID and UID and parse as models"""
+        client = server.client()
+        device = Device.from_dict(client.devices.get_by_uid("dev-000005"))
+        assert device.id == 5
+        assert client.devices.get(5)["uid"] == "dev-000005"
+        assert "temp" in client.devices.get_latest_data_by_uid("dev-000005")
+
+        with pytest.raises(ResourceNotFoundError):
+            client.devices.get(26)
+        with pytest.raises(ResourceNotFoundError):
+            client.devices.get_by_uid("unknown")
+
+    def test_paginated_listings(self, server):
+        """Test folder and event listings are followed across pages"""
+        client = server.client()
+        response = client.devices.list_by_folder(1)
+        assert response["count"] == 9
+        devices = [d for page in client.devices.iter_pages(response) for d in page]
+        assert [d["id"] for d in devices] == list(range(1, 26, 3))
+
+        lite = client.devices.list_by_folder_lite(2)["results"]
+        assert set(lite[0]) == {
+            "id",
+            "url",
+            "name",
+            "uid",
+            "imei",
+            "serial_number",
+            "state",
+            "folder",
+        }
+
+        events = client.devices.get_events_by_uid("dev-000001")
+        assert len(events["results"]) == 4 and events["next"]
+
+    def test_orgs_routes(self, server):
+        """Test company and folder routes"""
+        client = server.client()
+        Company.from_dict(client.orgs.get(1))
+        Folder.from_dict(client.orgs.get_folder(2))
+        assert len(client.orgs.get_folder_tree(1).roots()) == 3
+
+    def test_writes(self, server):
+        """Test command sends and device updates"""
+        client = server.client()
+        sent = server.commands_sent
+        assert client.devices.issue_command_by_uid("dev-000002", COMMAND)[0] == 200
+        assert server.commands_sent == sent + 1
+        status, device = client.devices.set_lifecycle(2, 53)
+        assert (status, device["state"]) == (200, 53)
+
+    def test_keep_alive_responses_are_prompt(self, server):
+        """Test responses on a reused connection do not wait for delayed ACKs"""
+        client = server.client(coalesce_requests=False)
+        client.devices.get(1)
+
+        started = time.perf_counter()
+        for _ in range(20):
+            client.devices.get(1)
+
+        # About 40ms each when the body waits for the ACK of the headers
+        assert time.perf_counter() - started < 0.4
+
+    def test_auth_and_errors(self):
+        """Test token checks and injected errors"""
+        with StandInServer(devices=1, error_rate=1.0) as s:
+            with pytest.raises(UnauthorisedError):
+                s.client(token="wrong").devices.get(1)
+            with pytest.raises(ConnectAPIError):
+                s.client().devices.get(1)
+            assert s.request_count == 2
+
+    def test_invalid_settings(self):
+        """Test invalid settings are rejected"""
+        with pytest.raises(ValueError, match="Error rate"):
+            StandInServer(error_rate=2)
@@ -0,0 +1,102 @@
+"""Tests for NumPy-backed telemetry batches."""
+
+from unittest.mock import patch
+
+import pytest
+
+from trinity_connect_client.exceptions import ResourceNotFoundError
+from trinity_connect_client.modules.devices import DevicesAPI
+from trinity_connect_client.telemetry import TelemetryBatch, flatten_metrics
+
+np = pytest.importorskip("numpy")
+
+
+class TestFlattenMetrics:
+    """Test suite for flatten_metrics"""
+
+    def test_flattens_nested_numeric_values(self):
+        """Test nested dictionaries are joined with dots"""
+        data = {"temp": 21, "battery": {"v": 3.7, "ok": True}, "label": "a"}
+
+        assert flatten_metrics(data) == {
+            "temp": 21.0,
+            "battery.v": 3.7,
+            "battery.ok": 1.0,
+        }
+
+
+class TestTelemetryBatch:
+    """Test suite for TelemetryBatch"""
+
+    def test_from_payloads_builds_matrix_and_mask(self):
+        """Test metric-by-device matrix construction"""
+        batch = TelemetryBatch.from_payloads(
+            {"a": {"temp": 10, "hum": 50}, "b": {"temp": 20}, "c": None}
+        )
+
+        assert batch.uids == ["a", "b", "c"]
+        assert batch.metrics == ["temp", "hum"]
+        assert batch.values.shape == (2, 3)
+        assert batch.mask.tolist() == [[False, False, True], [False, True, True]]
+        assert batch.not_found == ["c"]
+
+    def test_aggregates_ignore_missing_values(self):
+        """Test aggregates are computed over reporting devices only"""
+        batch = TelemetryBatch.from_payloads(
+            {"a": {"temp": 10, "hum": 50}, "b": {"temp": 20}, "c": {"temp": 30}}
+        )
+
+        assert batch.count().tolist() == [3, 1]
+        assert batch.min().tolist() == [10.0, 50.0]
+        assert batch.max().tolist() == [30.0, 50.0]
+        assert batch.mean().tolist() == [20.0, 50.0]
+        assert batch.percentile(50).tolist() == [20.0, 50.0]
+        assert batch.metric("hum").count() == 1
+
+    def test_aggregates_for_unreported_metric_are_nan(self):
+        """Test metrics without any values aggregate to NaN"""
+        batch = TelemetryBatch.from_payloads({"a": {"temp": 10}, "b": None})
+        batch.mask[0, 0] = True
+
+        assert np.isnan(batch.min()[0])
+        assert np.isnan(batch.mean()[0])
+
+    def test_summary(self):
+        """Test per-metric summary"""
+        batch = TelemetryBatch.from_payloads({"a": {"temp": 10}, "b": {"temp": 20}})
+
+        summary = batch.summary()
+
+        assert summary["temp"]["count"] == 2
+        assert summary["temp"]["mean"] == 15.0
+        assert summary["temp"]["p50"] == 15.0
+
+    def test_empty_batch(self):
+        """Test a batch without devices"""
+        batch = TelemetryBatch.from_payloads({})
+
+        assert batch.summary() == {}
+        assert batch.min().shape == (0,)
+
+
+class TestCollectLatestData:
+    """Test suite for DevicesAPI.collect_latest_data"""
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_collects_all_uids(self, mock_request, mock_client):
+        """Test latest data is fetched for every unique UID"""
+
+        def respond(url, params=None):
+            if "missing" in url:
+                raise ResourceNotFoundError("Requested resource not found")
+            return {"temp": 1 if "uid-1" in url else 2}
+
+        mock_request.side_effect = respond
+        devices_api = DevicesAPI(mock_client)
+
+        batch = devices_api.collect_latest_data(["uid-1", "uid-2", "uid-1", "missing"])
+
+        assert batch.uids == ["uid-1", "uid-2", "missing"]
+        assert batch.not_found == ["missing"]
+        assert batch.sum().tolist() == [3.0]
+        assert mock_request.call_count == 3
@@ -0,0 +1,85 @@
+"""Tests for the array-backed telemetry store."""
+
+import math
+
+import numpy as np
+import pytest
+
+from trinity_connect_client.polling import PollResult
+from trinity_connect_client.timeseries import DEFAULT_MAX_METRICS, TelemetryStore
+
+
+class TestTelemetryStore:
+    """Test suite for TelemetryStore"""
+
+    def test_window_and_last(self):
+        """Test window queries return reported values in order"""
+        store = TelemetryStore(capacity=8)
+        for t in range(5):
+            store.append("a", float(t), {"temp": t * 10, "battery": {"v": 3.7}})
+        store.append("a", 5.0, {"battery": {"v": 3.6}})
+
+        timestamps, values = store.window("a", "temp", start=1, end=3)
+        assert timestamps.tolist() == [1, 2, 3]
+        assert values.tolist() == [10, 20, 30]
+        assert store.last("a", "temp") == (4.0, 40.0)
+        assert store.last("a", "battery.v") == (5.0, 3.6)
+        assert store.last("a", "missing") is None
+        assert store.last("b", "temp") is None
+
+    def test_capacity_overwrites_oldest(self):
+        """Test memory stays fixed and the oldest samples are dropped"""
+        store = TelemetryStore(capacity=4)
+        store.append("a", 0.0, {"temp": 0})
+        nbytes = store.nbytes
+        assert nbytes == 2 * 4 * 8
+
+        for t in range(1, 10):
+            store.append("a", float(t), {"temp": t})
+
+        timestamps, values = store.window("a", "temp")
+        assert timestamps.tolist() == [6, 7, 8, 9]
+        assert values.tolist() == [6, 7, 8, 9]
+        assert store.nbytes == nbytes
+
+    def test_max_metrics(self):
+        """Test metrics beyond the limit are not stored"""
+        store = TelemetryStore(capacity=4, max_metrics=1)
+        store.append("a", 0.0, {"temp": 1, "rssi": -70})
+        assert store.metrics("a") == ["temp"]
+
+        store = TelemetryStore(capacity=4)
+        store.append("a", 0.0, {f"m{i}": i for i in range(100)})
+        assert len(store.metrics("a")) == DEFAULT_MAX_METRICS
+        with pytest.raises(ValueError):
+            TelemetryStore(max_metrics=0)
+
+    def test_rate(self):
+        """Test the average rate of change over a window"""
+        store = TelemetryStore()
+        for t, v in [(0, 100), (60, 130), (120, 160)]:
+            store.append("a", float(t), {"energy": v})
+        assert store.rate("a", "energy") == pytest.approx(0.5)
+        assert math.isnan(store.rate("a", "energy", start=100))
+
+    def test_rollups(self):
+        """Test completed intervals are kept as means"""
+        store = TelemetryStore(capacity=2, rollup_interval=60)
+        for t, v in [(0, 1), (30, 3), (60, 10), (90, 20), (120, 5)]:
+            store.append("a", float(t), {"temp": v})
+
+        starts, means = store.rollups("a", "temp")
+        assert starts.tolist() == [0, 60]
+        assert means.tolist() == [2, 15]
+
+        with pytest.raises(ValueError, match="rollup_interval"):
+            TelemetryStore().rollups("a", "temp")
+
+    def test_out_of_order_and_poll_results(self):
+        """Test older samples are rejected and poll results are stored"""
+        store = TelemetryStore()
+        store.add_result(PollResult("a", {"temp": 1}, 10.0, True))
+        with pytest.raises(ValueError, match="timestamp order"):
+            store.append("a", 5.0, {"temp": 2})
+        assert isinstance(store.window("a", "temp")[1], np.ndarray)
+        assert store.uids == ["a"]
@@ -0,0 +1,347 @@
+"""Tests for the pluggable transports and the asyncio client."""
+
+import asyncio
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from trinity_connect_client import AsyncConnectClient, ConnectClient
+from trinity_connect_client.exceptions import ResourceNotFoundError
+from trinity_connect_client.testing import StandInServer
+from trinity_connect_client.transports import (
+    AsyncHTTPXTransport,
+    AsyncInMemoryTransport,
+    HTTPXTransport,
+    InMemoryTransport,
+    RequestsTransport,
+    Response,
+    Urllib3Transport,
+)
+
+COMMAND = {"rpc": "ping", "args": [], "pid": 1, "ttl": 60, "qos": 0}
+
+
+@pytest.fixture(scope="module")
+def server():
+    """A running stand-in server"""
+    with StandInServer(devices=20, folders=2, page_size=4) as server:
+        yield server
+
+
+class TestResponse:
+    def test_decoded_body_is_encoded_on_demand(self):
+        """Test a decoded body is returned as is and encoded for content"""
+        body = {"id": 1}
+        response = Response(200, body)
+
+        assert response.json() is body
+        assert response.content == b'{"id": 1}'
+        assert response.text == '{"id": 1}'
+
+    def test_content_is_decoded(self):
+        """Test a body held as bytes is decoded by json()"""
+        response = Response(
+            200, headers={"Content-Type": "application/json"}, content=b'{"id": 1}'
+        )
+
+        assert response.json() == {"id": 1}
+        assert response.headers["Content-Type"] == "application/json"
+
+    def test_invalid_content_raises_value_error(self):
+        """Test undecodable content raises ValueError like requests"""
+        with pytest.raises(ValueError):
+            Response(502, content=b"<html>Bad gateway</html>").json()
+
+
+class TestInMemoryTransport:
+    def test_routes(self):
+        """Test requests are served from a route dictionary"""
+        transport = InMemoryTransport({("GET", "/api/v4/devices/1/"): (200, {"id": 1})})
+        client = ConnectClient(
+            base_url="https://memory.invalid", token="t", transport=transport
+        )
+
+        assert client.devices.get(1) == {"id": 1}
+        with pytest.raises(ResourceNotFoundError):
+            client.devices.get(2)
+        assert transport.request_count == 2
+
+    def test_handler(self):
+        """Test the handler receives the request and may return a Response"""
+        calls = []
+
+        def handler(method, url, headers, params, json):
+            calls.append((method, url, json))
+            return Response(200, {"sent": json})
+
+        client = ConnectClient(
+            base_url="https://memory.invalid",
+            token="t",
+            transport=InMemoryTransport(handler),
+        )
+
+        assert client.devices.issue_command(1, COMMAND) == (200, {"sent": COMMAND})
+        assert calls == [
+            ("POST", "https://memory.invalid/api/v4/devices/1/command/send/", COMMAND)
+        ]
+
+    def test_standin_handler(self):
+        """Test the stand-in server answers in process without being started"""
+        server = StandInServer(devices=10, folders=2, page_size=2)
+        try:
+            client = server.client(transport=InMemoryTransport(server.handle))
+
+            assert client.devices.get_by_uid("dev-000003")["id"] == 3
+            response = client.devices.list_by_folder(1)
+            pages = list(client.devices.iter_pages(response))
+            assert [len(page) for page in pages] == [2, 2, 1]
+        finally:
+            server.stop()
+
+
+class TestHTTPTransports:
+    @pytest.mark.parametrize("transport_class", [RequestsTransport, Urllib3Transport])
+    def test_round_trip(self, server, transport_class):
+        """Test GET with parameters and POST against the stand-in server"""
+        with transport_class() as transport:
+            client = server.client(transport=transport, coalesce_requests=False)
+
+            assert client.devices.get_by_uid("dev-000005")["id"] == 5
+            response = client.devices.list_by_folder(2, page_size=3)
+            assert len(response["results"]) == 3
+            assert client.devices.issue_command(1, COMMAND)[0] == 200
+
+            direct = transport.send(
+                "GET",
+                f"{client.api_url}/devices/1/",
+                client.devices._get_auth_headers(),
+            )
+            assert direct.status_code == 200
+            assert direct.headers["content-type"] == "application/json"
+            assert direct.json()["id"] == 1
+            assert direct.elapsed > 0
+
+    def test_requests_session(self, server):
+        """Test a given session is used and closed"""
+        session = requests.Session()
+        transport = RequestsTransport(session=session, timeout=5)
+        client = server.client(transport=transport)
+
+        assert client.devices.get(2)["id"] == 2
+        client.close()
+
+    def test_transport_by_name(self):
+        """Test transports can be selected by name"""
+        client = ConnectClient(
+            base_url="https://x.invalid", token="t", transport="urllib3"
+        )
+
+        assert isinstance(client.transport, Urllib3Transport)
+        with pytest.raises(ValueError, match="Unknown transport"):
+            ConnectClient(base_url="https://x.invalid", token="t", transport="curl")
+
+
+class _FakeHTTPXResponse:
+    status_code = 200
+    headers = {"content-type": "application/json"}
+    content = b'{"id": 1}'
+
+    def __init__(self, http_version):
+        self.http_version = http_version
+
+
+def _fake_httpx(clients, delay=0.0, http_version="HTTP/2"):
+    """A stand-in httpx module recording the options clients are created with"""
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    class Client:
+        def __init__(self, **options):
+            self.options = options
+            clients.append(self)
+
+        def request(self, method, url, **kwargs):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(delay)
+            with lock:
+                in_flight["now"] -= 1
+            return _FakeHTTPXResponse(http_version)
+
+        def close(self):
+            pass
+
+    class AsyncClient(Client):
+        async def request(self, method, url, **kwargs):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(delay)
+            in_flight["now"] -= 1
+            return _FakeHTTPXResponse(http_version)
+
+        async def aclose(self):
+            pass
+
+    return (
+        types.SimpleNamespace(
+            Client=Client, AsyncClient=AsyncClient, Limits=lambda **kw: kw
+        ),
+        in_flight,
+    )
+
+
+class TestHTTPXTransport:
+    @pytest.mark.parametrize("transport_class", [HTTPXTransport, AsyncHTTPXTransport])
+    def test_missing_httpx(self, monkeypatch, transport_class):
+        """Test a helpful error is raised without httpx installed"""
+        monkeypatch.setitem(sys.modules, "httpx", None)
+
+        with pytest.raises(ImportError, match=r"trinity-connect-client\[httpx\]"):
+            transport_class()
+
+    def test_http2_options(self, monkeypatch):
+        """Test HTTP/2 and pool limits are passed to httpx"""
+        clients = []
+        monkeypatch.setitem(sys.modules, "httpx", _fake_httpx(clients)[0])
+        monkeypatch.setitem(sys.modules, "h2", types.ModuleType("h2"))
+
+        transport = HTTPXTransport(http2=True, max_connections=4, timeout=5)
+
+        assert transport.http2 is True
+        assert clients[0].options == {
+            "http2": True,
+            "timeout": 5,
+            "limits": {"max_connections": 4, "max_keepalive_connections": 20},
+        }
+
+    def test_falls_back_without_h2(self, monkeypatch):
+        """Test HTTP/1.1 is used, with a warning, when h2 is missing"""
+        clients = []
+        monkeypatch.setitem(sys.modules, "httpx", _fake_httpx(clients)[0])
+        monkeypatch.setitem(sys.modules, "h2", None)
+
+        with pytest.warns(RuntimeWarning, match="falling back to HTTP/1.1"):
+            transport = AsyncHTTPXTransport(http2=True)
+
+        assert transport.http2 is False
+        assert clients[0].options["http2"] is False
+
+    def test_max_streams(self, monkeypatch):
+        """Test requests in flight are capped and protocols counted"""
+        fake, in_flight = _fake_httpx([], delay=0.01)
+        monkeypatch.setitem(sys.modules, "httpx", fake)
+        transport = HTTPXTransport(max_streams=3)
+        client = ConnectClient(
+            base_url="https://x.invalid",
+            token="t",
+            transport=transport,
+            coalesce_requests=False,
+        )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(client.devices.get, range(1, 17)))
+
+        assert results == [{"id": 1}] * 16
+        assert in_flight["max"] == 3
+        assert transport.http_versions == {"HTTP/2": 16}
+
+    def test_async_max_streams(self, monkeypatch):
+        """Test the async transport caps streams in flight on the loop"""
+        fake, in_flight = _fake_httpx([], delay=0.01, http_version="HTTP/1.1")
+        monkeypatch.setitem(sys.modules, "httpx", fake)
+        transport = AsyncHTTPXTransport(max_streams=2)
+
+        async def main():
+            async with AsyncConnectClient(
+                base_url="https://x.invalid",
+                token="t",
+                transport=transport,
+                coalesce_requests=False,
+            ) as client:
+                return await asyncio.gather(
+                    *(client.devices.get(i) for i in range(1, 9))
+                )
+
+        assert len(asyncio.run(main())) == 8
+        assert in_flight["max"] == 2
+        assert transport.http_versions == {"HTTP/1.1": 8}
+
+    def test_round_trip(self, server):
+        """Test httpx against the stand-in server, which only speaks HTTP/1.1"""
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+
+        async def main():
+            async with AsyncConnectClient(
+                base_url=server.base_url,
+                token=server.token,
+                transport=AsyncHTTPXTransport(http2=True),
+            ) as client:
+                devices = await asyncio.gather(
+                    *(client.devices.get(i) for i in range(1, 6))
+                )
+                return [device["id"] for device in devices], client.transport
+
+        ids, transport = asyncio.run(main())
+
+        assert ids == [1, 2, 3, 4, 5]
+        assert transport.http_versions == {"HTTP/1.1": 5}
+
+
+class TestAsyncConnectClient:
+    def test_async_transport(self):
+        """Test requests are sent through an async transport on the loop"""
+        server = StandInServer(devices=10, folders=2)
+        transport = AsyncInMemoryTransport(server.handle)
+
+        async def main():
+            async with AsyncConnectClient(
+                base_url=server.base_url, token=server.token, transport=transport
+            ) as client:
+                devices = await asyncio.gather(
+                    *(client.devices.get_by_uid(server.uid(i)) for i in range(1, 11))
+                )
+                with pytest.raises(ResourceNotFoundError):
+                    await client.devices.get(99)
+                return devices
+
+        try:
+            devices = asyncio.run(main())
+        finally:
+            server.stop()
+
+        assert [device["id"] for device in devices] == list(range(1, 11))
+        assert transport.request_count == 11
+
+    def test_blocking_transport_and_run(self, server):
+        """Test a blocking transport and run() with the sync client"""
+
+        async def main():
+            async with AsyncConnectClient(
+                base_url=server.base_url, token=server.token, transport="urllib3"
+            ) as client:
+                folder = await client.orgs.get_folder(1)
+                response = await client.devices.list_by_folder(1)
+                pages = await client.run(
+                    lambda: list(client.sync_client.devices.iter_pages(response))
+                )
+                return folder, [record for page in pages for record in page]
+
+        folder, records = asyncio.run(main())
+
+        assert folder["id"] == 1
+        assert len(records) == 10
+
+    def test_methods_keep_their_names(self):
+        """Test coroutine methods are wrapped with the API method metadata"""
+        client = AsyncConnectClient(base_url="https://x.invalid", token="t")
+
+        assert client.devices.get_by_uid.__name__ == "get_by_uid"
+        assert asyncio.iscoroutinefunction(client.devices.get_by_uid)
+        assert client.stats is client.sync_client.stats
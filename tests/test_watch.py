@@ -0,0 +1,151 @@
+"""Tests for the device change feed."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from trinity_connect_client import ConnectClient
+from trinity_connect_client.polling import PollResult
+from trinity_connect_client.watch import ChangeEvent, Watcher, flatten_fields
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = START
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeAPI:
+    """Serves a device record and latest data that change between polls"""
+
+    def __init__(self, states):
+        self.states = iter(states)
+        self.current = None
+
+    def __call__(self, url, params=None):
+        if url.endswith("/data/latest/"):
+            return self.current[1]
+        self.current = next(self.states)
+        return self.current[0]
+
+
+def _device(comm_state=1, state=52):
+    return {
+        "uid": "a",
+        "comm_interval_contract": 600,
+        "comm_state": comm_state,
+        "state": state,
+        "youngest_comm_timestamp": "2023-12-31T23:50:00+00:00",
+    }
+
+
+def _watcher(mock_client, clock, **options):
+    return Watcher(
+        mock_client.devices,
+        [_device()],
+        clock=clock,
+        sleep=clock.sleep,
+        jitter=0,
+        grace=0,
+        **options,
+    )
+
+
+class TestWatcher:
+    """Test suite for Watcher"""
+
+    def test_flatten_fields(self):
+        """Test nested payloads are flattened keeping every leaf"""
+        assert flatten_fields({"a": {"b": 1, "c": "x"}, "d": [1]}) == {
+            "a.b": 1,
+            "a.c": "x",
+            "d": [1],
+        }
+
+    def test_changes_against_previous_poll(self, mock_client):
+        """Test only changed, added and removed fields produce events"""
+        watcher = Watcher(mock_client.devices, [])
+        first = PollResult("a", {"state": 52, "data.temp": 20}, 1.0, True)
+        second = PollResult("a", {"state": 53, "data.rssi": -70}, 2.0, True)
+
+        assert watcher.changes(first) == []
+        assert watcher.changes(second) == [
+            ChangeEvent("a", "state", 52, 53, 2.0),
+            ChangeEvent("a", "data.temp", 20, None, 2.0),
+            ChangeEvent("a", "data.rssi", None, -70, 2.0),
+        ]
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_iterating_yields_only_changes(self, mock_request, mock_client):
+        """Test identical polls are skipped and changes reported per field"""
+        mock_request.side_effect = FakeAPI(
+            [
+                (_device(), {"temp": 20, "gps": {"lat": 1}}),
+                (_device(), {"temp": 20, "gps": {"lat": 1}}),
+                (_device(comm_state=2), {"temp": 21, "gps": {"lat": 1}}),
+            ]
+        )
+        clock = FakeClock()
+        watcher = _watcher(mock_client, clock)
+
+        events = []
+        for event in watcher:
+            events.append((event.field, event.old, event.new))
+            if len(events) == 2:
+                watcher.stop()
+
+        assert events == [("comm_state", 1, 2), ("data.temp", 20, 21)]
+        watcher.close()
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_async_iteration_with_field_filter(self, mock_request, mock_client):
+        """Test async iteration with initial events for selected fields"""
+        mock_request.side_effect = FakeAPI([(_device(), {"temp": 20, "rssi": -70})])
+        watcher = _watcher(
+            mock_client, FakeClock(), fields=["data.temp"], emit_initial=True
+        )
+
+        async def first():
+            async for event in watcher:
+                return event
+
+        assert asyncio.run(first()) == ChangeEvent("a", "data.temp", None, 20, START)
+        watcher.close()
+
+    @patch("trinity_connect_client.mixins.ResourceMixin.make_get_request")
+    def test_filters_and_uncached_devices(self, mock_request):
+        """Test filters reach latest data and device changes bypass the cache"""
+        api = FakeAPI(
+            [
+                (_device(), {"temp": 20}),
+                (_device(state=53), {"temp": 20}),
+            ]
+        )
+        requested = []
+
+        def serve(url, params=None):
+            requested.append(params)
+            return api(url)
+
+        mock_request.side_effect = serve
+        client = ConnectClient(
+            base_url="https://api.example.com", token="t", cache_ttl=60
+        )
+        clock = FakeClock()
+        watcher = _watcher(client, clock, fields=["state"], metrics="temp")
+
+        events = []
+        for event in watcher:
+            events.append((event.field, event.old, event.new))
+            watcher.stop()
+
+        assert events == [("state", 52, 53)]
+        assert {"metrics": "temp"} in requested
+        watcher.close()